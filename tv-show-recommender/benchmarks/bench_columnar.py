@@ -0,0 +1,101 @@
+"""Benchmark for the columnar ShowRecommender backend.
+
+This script builds a synthetic collection with the same size as the TMDB dataset
+(about 150K shows), loads it into a list backed and a column backed recommender,
+and times the filter, recommendation and statistic methods on both.
+
+Example:
+    python -m benchmarks.bench_columnar --shows 150000 --repeat 5
+"""
+
+import argparse
+import random
+import time
+
+from src.show_recommender import ShowRecommender
+from src.tv_show import TVShow
+
+GENRES = [
+    "Drama", "Comedy", "Crime", "Documentary", "Animation", "Reality",
+    "Sci-Fi & Fantasy", "Action & Adventure", "Mystery", "Family", "Kids",
+]
+LANGUAGES = ["en", "ja", "es", "de", "fr", "ko", "zh", "it", "pt", "ru"]
+
+
+def make_shows(count, seed=551):
+    """Build a list of random TVShow objects.
+
+    Args:
+        count (int): Number of shows to build.
+        seed (int): Random seed so runs are repeatable.
+
+    Returns:
+        List[TVShow]: The generated shows.
+    """
+    rng = random.Random(seed)
+    shows = []
+    for index in range(count):
+        shows.append(
+            TVShow(
+                title=f"Show {index}",
+                genre=rng.sample(GENRES, rng.randint(1, 3)),
+                num_episodes=rng.randint(0, 500),
+                avg_rating=round(rng.uniform(0, 10), 1),
+                language=rng.choice(LANGUAGES),
+                year=rng.choice([None] + list(range(1950, 2025))),
+            )
+        )
+    return shows
+
+
+def time_call(func, repeat):
+    """Return the best wall-clock time of func() over repeat runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> int:
+    """Run the benchmark and print a table of timings.
+
+    Returns:
+        int: Process exit code (0 for success).
+    """
+    parser = argparse.ArgumentParser(description="Compare list and columnar recommender backends.")
+    parser.add_argument("--shows", type=int, default=150_000, help="Number of synthetic shows.")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per measurement (best is kept).")
+    args = parser.parse_args()
+
+    shows = make_shows(args.shows)
+    backends = {}
+    for name, columnar in (("list", False), ("columnar", True)):
+        recommender = ShowRecommender(columnar=columnar, cache_size=0)
+        recommender.add_shows_from_list(shows)
+        backends[name] = recommender
+
+    queries = {
+        "filter_by_genre('drama')": lambda r: r.filter_by_genre("drama"),
+        "filter_by_rating(8.0)": lambda r: r.filter_by_rating(8.0),
+        "filter_by_episodes(10, 50)": lambda r: r.filter_by_episodes(10, 50),
+        "filter_by_language('de')": lambda r: r.filter_by_language("de"),
+        "get_recommendations(...)": lambda r: r.get_recommendations(
+            genre="crime", min_rating=7.0, min_episodes=5, max_episodes=100, language="en"
+        ),
+        "get_statistic()": lambda r: r.get_statistic(),
+    }
+
+    print(f"{args.shows} shows, best of {args.repeat} runs")
+    print(f"{'query':<30} {'list ms':>10} {'columnar ms':>12} {'speedup':>9}")
+    for label, query in queries.items():
+        list_ms = time_call(lambda: query(backends["list"]), args.repeat)
+        columnar_ms = time_call(lambda: query(backends["columnar"]), args.repeat)
+        print(f"{label:<30} {list_ms:>10.2f} {columnar_ms:>12.2f} {list_ms / columnar_ms:>8.1f}x")
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
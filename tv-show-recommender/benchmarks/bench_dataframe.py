@@ -0,0 +1,106 @@
+"""Benchmark for building a ShowRecommender from a pandas DataFrame.
+
+This script reads a TMDB CSV with pandas and prepares the columns the same way as the
+notebook, then times the notebook's df.iterrows() loop (one TVShow and one check per
+row) against ShowRecommender.add_shows_from_dataframe(). If no --csv is given, a
+synthetic TMDB-shaped CSV with --shows rows is written to a temporary folder first.
+
+Example:
+    python -m benchmarks.bench_dataframe --shows 150000
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.synthetic_tmdb import generate_tmdb_csv
+from src.show_recommender import ShowRecommender
+from src.tv_show import TVShow
+
+
+def read_dataframe(csv_path):
+    """Read the CSV and clean it like the notebook does."""
+    usecols = ["name", "genres", "number_of_episodes", "original_language", "vote_average", "first_air_date"]
+    df = pd.read_csv(csv_path, usecols=usecols)
+    df["genres"] = df["genres"].apply(
+        lambda g: [] if pd.isna(g) else [x.strip() for x in g.split(",") if x.strip()]
+    )
+    df["year"] = pd.to_datetime(df["first_air_date"], errors="coerce").dt.year
+    df["number_of_episodes"] = pd.to_numeric(df["number_of_episodes"], errors="coerce")
+    df["vote_average"] = pd.to_numeric(df["vote_average"], errors="coerce")
+    df = df.dropna(subset=["number_of_episodes", "vote_average"]).copy()
+    df["number_of_episodes"] = df["number_of_episodes"].astype(int)
+    df["name"] = df["name"].fillna("").str.strip()
+    df["original_language"] = df["original_language"].fillna("").str.strip()
+    return df
+
+
+def iterrows_load(df):
+    """Build the recommender one row at a time, like the original notebook cell."""
+    recommender = ShowRecommender()
+    shows = []
+    skipped = 0
+    for _, row in df.iterrows():
+        try:
+            shows.append(TVShow(
+                title=row["name"],
+                genre=row["genres"],
+                num_episodes=row["number_of_episodes"],
+                avg_rating=row["vote_average"],
+                language=row["original_language"],
+                year=None if pd.isna(row["year"]) else int(row["year"]),
+            ))
+        except Exception:
+            skipped += 1
+    recommender.add_shows_from_list(shows)
+    return recommender, skipped
+
+
+def main() -> int:
+    """Run the benchmark and print both load times.
+
+    Returns:
+        int: Process exit code (0 for success).
+    """
+    parser = argparse.ArgumentParser(description="Compare iterrows() loading with bulk DataFrame loading.")
+    parser.add_argument("--csv", help="TMDB CSV to use instead of a synthetic one.")
+    parser.add_argument("--shows", type=int, default=150_000, help="Rows in the synthetic CSV.")
+    args = parser.parse_args()
+
+    temp_dir = None
+    csv_path = args.csv
+    if csv_path is None:
+        temp_dir = tempfile.mkdtemp()
+        csv_path = os.path.join(temp_dir, "tmdb.csv")
+        generate_tmdb_csv(csv_path, args.shows)
+
+    try:
+        df = read_dataframe(csv_path)
+
+        start = time.perf_counter()
+        loop_recommender, loop_skipped = iterrows_load(df)
+        loop_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        bulk_recommender = ShowRecommender()
+        bulk_skipped = bulk_recommender.add_shows_from_dataframe(df)
+        bulk_seconds = time.perf_counter() - start
+
+        assert bulk_skipped == loop_skipped
+        assert bulk_recommender.get_total_shows() == loop_recommender.get_total_shows()
+        print(f"{bulk_recommender.get_total_shows()} shows ({bulk_skipped} skipped)")
+        print(f"iterrows loop: {loop_seconds:.3f} s")
+        print(f"bulk ingest:   {bulk_seconds:.3f} s ({loop_seconds / bulk_seconds:.1f}x faster)")
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
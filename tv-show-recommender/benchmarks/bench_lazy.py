@@ -0,0 +1,97 @@
+"""Benchmark for the lazy, snapshot-backed ShowRecommender.
+
+This script builds a snapshot of a TMDB CSV once, then compares two ways of starting
+a columnar recommender from it: loading every TVShow (load_snapshot() plus
+add_shows_from_list()) and ShowRecommender.from_snapshot(), which memory-maps the
+columns and only builds the shows that queries return. For both it prints the
+startup time, the memory held afterwards (tracemalloc, measured in a second run)
+and the time of a first get_recommendations() call. If no --csv is given, a
+synthetic TMDB-shaped CSV with --shows rows is written to a temporary folder first.
+
+Example:
+    python -m benchmarks.bench_lazy --shows 150000
+"""
+
+import argparse
+import gc
+import os
+import shutil
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic_tmdb import generate_tmdb_csv
+from src.data_processor import build_tmdb_snapshot
+from src.dataset_snapshot import load_snapshot
+from src.show_recommender import ShowRecommender
+
+
+def eager_start(snapshot_path):
+    """Build every TVShow from the snapshot and add them to a columnar recommender."""
+    recommender = ShowRecommender(columnar=True)
+    recommender.add_shows_from_list(load_snapshot(snapshot_path))
+    return recommender
+
+
+def lazy_start(snapshot_path):
+    """Open the snapshot lazily."""
+    return ShowRecommender.from_snapshot(snapshot_path)
+
+
+def measure(start, snapshot_path):
+    """Return (seconds to start, seconds for a first query, retained bytes, recommender)."""
+    gc.collect()
+    began = time.perf_counter()
+    recommender = start(snapshot_path)
+    startup = time.perf_counter() - began
+
+    began = time.perf_counter()
+    recommender.get_recommendations(genre="drama", min_rating=7.0, language="en", limit=10)
+    query = time.perf_counter() - began
+    del recommender
+
+    gc.collect()
+    tracemalloc.start()
+    recommender = start(snapshot_path)
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return startup, query, retained, recommender
+
+
+def main() -> int:
+    """Run the benchmark and print startup time and memory for both modes.
+
+    Returns:
+        int: Process exit code (0 for success).
+    """
+    parser = argparse.ArgumentParser(description="Compare eager and lazy snapshot loading.")
+    parser.add_argument("--csv", help="TMDB CSV to use instead of a synthetic one.")
+    parser.add_argument("--shows", type=int, default=150_000, help="Rows in the synthetic CSV.")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    csv_path = args.csv
+    if csv_path is None:
+        csv_path = os.path.join(temp_dir, "tmdb.csv")
+        generate_tmdb_csv(csv_path, args.shows)
+    snapshot_path = build_tmdb_snapshot(
+        csv_path, limit=None, snapshot_path=os.path.join(temp_dir, "bench.snapshot")
+    )
+
+    try:
+        mib = 1024 * 1024
+        for name, start in (("eager", eager_start), ("lazy", lazy_start)):
+            startup, query, retained, recommender = measure(start, snapshot_path)
+            print(
+                f"{name:<6} start {startup:.3f} s | first query {query * 1000:.1f} ms | "
+                f"retained {retained / mib:.1f} MiB ({recommender.get_total_shows()} shows)"
+            )
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
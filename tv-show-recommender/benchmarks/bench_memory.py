@@ -0,0 +1,61 @@
+"""Memory benchmark for loading the TMDB dataset.
+
+This script uses tracemalloc to measure how much memory the list of TVShow objects
+returned by load_tv_shows_from_tmdb_csv() holds once loading has finished, and the
+peak while loading. If no --csv is given, a synthetic TMDB-shaped CSV with --shows
+rows is written to a temporary folder first.
+
+Example:
+    python -m benchmarks.bench_memory --shows 150000
+    python -m benchmarks.bench_memory --csv "C:\\path\\to\\TMDB_tv_dataset_v3.csv"
+"""
+
+import argparse
+import gc
+import os
+import shutil
+import tempfile
+import tracemalloc
+
+from benchmarks.synthetic_tmdb import generate_tmdb_csv
+from src.data_processor import load_tv_shows_from_tmdb_csv
+
+
+def main() -> int:
+    """Load the dataset under tracemalloc and print the memory used.
+
+    Returns:
+        int: Process exit code (0 for success).
+    """
+    parser = argparse.ArgumentParser(description="Measure memory used by loaded TVShow objects.")
+    parser.add_argument("--csv", help="TMDB CSV to use instead of a synthetic one.")
+    parser.add_argument("--shows", type=int, default=150_000, help="Rows in the synthetic CSV.")
+    args = parser.parse_args()
+
+    temp_dir = None
+    csv_path = args.csv
+    if csv_path is None:
+        temp_dir = tempfile.mkdtemp()
+        csv_path = os.path.join(temp_dir, "tmdb.csv")
+        generate_tmdb_csv(csv_path, args.shows)
+
+    try:
+        gc.collect()
+        tracemalloc.start()
+        shows = load_tv_shows_from_tmdb_csv(csv_path, limit=None)
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    finally:
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    mib = 1024 * 1024
+    print(f"{len(shows)} shows")
+    print(f"retained: {current / mib:.1f} MiB ({current / max(1, len(shows)):.0f} bytes per show)")
+    print(f"peak:     {peak / mib:.1f} MiB")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
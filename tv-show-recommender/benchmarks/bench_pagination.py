@@ -0,0 +1,95 @@
+"""Benchmark for paged and iterator queries of ShowRecommender.
+
+This script loads a TMDB CSV into the list, columnar, lazy and SQLite backends and prints, for a
+few broad queries, the median time of the full list-returning method, of the first page of 10
+with get_page() (in collection and in rating order), of the page after it (with the cursor) and
+of taking the first 10 shows from the iterator. If no --csv is given, a synthetic TMDB-shaped CSV
+with --shows rows is written to a temporary folder first.
+
+Example:
+    python -m benchmarks.bench_pagination --shows 150000
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+from itertools import islice
+
+from benchmarks.synthetic_tmdb import generate_tmdb_csv
+from src.data_processor import build_tmdb_snapshot, load_tv_shows_from_tmdb_csv, load_tv_shows_into_sqlite
+from src.show_recommender import ShowRecommender
+
+# (get_page() query, arguments, list-returning method) of the timed queries
+QUERIES = [
+    ("genre", ("drama",), "filter_by_genre"),
+    ("rating", (5.0,), "filter_by_rating"),
+    ("language", ("en",), "filter_by_language"),
+    ("title", ("dark",), "search_by_title"),
+]
+
+
+def median_ms(function, repeats):
+    """Return the median time of function() in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        began = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - began)
+    return statistics.median(times) * 1000
+
+
+def main() -> int:
+    """Run the benchmark and print the results.
+
+    Returns:
+        int: Process exit code (0 for success).
+    """
+    parser = argparse.ArgumentParser(description="Compare paged queries with full result lists.")
+    parser.add_argument("--csv", help="TMDB CSV to use instead of a synthetic one.")
+    parser.add_argument("--shows", type=int, default=150_000, help="Rows in the synthetic CSV.")
+    parser.add_argument("--repeats", type=int, default=10, help="Runs of each query.")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        csv_path = args.csv
+        if csv_path is None:
+            csv_path = os.path.join(temp_dir, "tmdb.csv")
+            generate_tmdb_csv(csv_path, args.shows)
+        shows = load_tv_shows_from_tmdb_csv(csv_path, limit=None)
+        database_path = os.path.join(temp_dir, "shows.db")
+        load_tv_shows_into_sqlite(csv_path, database_path)
+
+        backends = {}
+        for name, columnar in (("list", False), ("columnar", True)):
+            backends[name] = ShowRecommender(columnar=columnar, cache_size=0)
+            backends[name].add_shows_from_list(shows)
+        backends["lazy"] = ShowRecommender.from_snapshot(build_tmdb_snapshot(csv_path, limit=None), cache_size=0)
+        backends["sqlite"] = ShowRecommender(database=database_path, cache_size=0)
+
+        print(f"{len(shows)} shows, times in ms")
+        print(f"{'backend':10}{'query':22}{'full':>10}{'page':>10}{'rating':>10}{'next':>10}{'iter 10':>10}")
+        for name, recommender in backends.items():
+            # build the title index before timing
+            recommender.search_by_title("dark")
+            for query, arguments, method in QUERIES:
+                full = median_ms(lambda: getattr(recommender, method)(*arguments), args.repeats)
+                page = median_ms(lambda: recommender.get_page(query, *arguments), args.repeats)
+                rating = median_ms(lambda: recommender.get_page(query, *arguments, order="rating"), args.repeats)
+                cursor = recommender.get_page(query, *arguments).next_cursor
+                following = median_ms(lambda: recommender.get_page(query, *arguments, cursor=cursor), args.repeats)
+                iterate = getattr(recommender, "iter_" + method)
+                taken = median_ms(lambda: list(islice(iterate(*arguments), 10)), args.repeats)
+                label = f"{query}{arguments}"
+                print(f"{name:10}{label:22}{full:>10.2f}{page:>10.3f}{rating:>10.3f}{following:>10.3f}{taken:>10.3f}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
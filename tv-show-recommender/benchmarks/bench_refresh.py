@@ -0,0 +1,97 @@
+"""Benchmark for refreshing a loaded ShowRecommender from a newer TMDB export.
+
+This script parses a synthetic TMDB-shaped CSV, builds a recommender from it and then makes a
+"newer export" in which a given fraction of the shows changed (updated ratings, deleted shows and
+new shows, in equal parts). It times building a new recommender from that export against
+refresh() on the loaded one, for the list and the columnar backend. Both times leave out parsing
+the CSV, which a refresh and a full load both need.
+
+Example:
+    python -m benchmarks.bench_refresh --shows 150000 --changed 0.01
+"""
+
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic_tmdb import generate_tmdb_csv
+from src.data_processor import load_tv_shows_from_tmdb_csv
+from src.show_recommender import ShowRecommender
+from src.tv_show import TVShow
+
+
+def unique_shows(shows):
+    """Return the first show of every (title, year); synthetic titles repeat."""
+    unique = {}
+    for show in shows:
+        unique.setdefault((show.title, show.year), show)
+    return list(unique.values())
+
+
+def newer_export(shows, changed, seed=7):
+    """Return a copy of shows where about a changed fraction of them were updated, deleted or added."""
+    rng = random.Random(seed)
+    export = {(show.title, show.year): show for show in shows}
+    keys = rng.sample(list(export), int(len(export) * changed * 2 / 3))
+    for key in keys[: len(keys) // 2]:
+        del export[key]
+    for key in keys[len(keys) // 2:]:
+        old = export[key]
+        export[key] = TVShow(old.title, old.genre, old.num_episodes + 1, round(rng.uniform(0, 10), 1),
+                             old.language, old.year)
+    for i in range(len(keys) // 2):
+        new_show = TVShow(f"New Show {i}", ["Drama"], rng.randint(1, 100), round(rng.uniform(0, 10), 1), "en", 2025)
+        export[(new_show.title, new_show.year)] = new_show
+    return list(export.values())
+
+
+def main() -> int:
+    """Run the benchmark and print the full build and refresh times.
+
+    Returns:
+        int: Process exit code (0 for success).
+    """
+    parser = argparse.ArgumentParser(description="Compare a full rebuild with an incremental refresh.")
+    parser.add_argument("--shows", type=int, default=150_000, help="Rows in the synthetic CSV.")
+    parser.add_argument("--changed", type=float, default=0.01, help="Fraction of shows that change.")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        csv_path = os.path.join(temp_dir, "tmdb.csv")
+        generate_tmdb_csv(csv_path, args.shows)
+        shows = unique_shows(load_tv_shows_from_tmdb_csv(csv_path, limit=None))
+        export = newer_export(shows, args.changed)
+
+        for columnar in (False, True):
+            recommender = ShowRecommender(columnar=columnar)
+            recommender.add_shows_from_list(shows)
+            # the title index exists in a running service, so the refresh has to keep it current
+            recommender.search_by_title("the")
+
+            start = time.perf_counter()
+            rebuilt = ShowRecommender(columnar=columnar)
+            rebuilt.add_shows_from_list(export)
+            rebuilt.search_by_title("the")
+            build_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            counts = recommender.refresh(export)
+            refresh_seconds = time.perf_counter() - start
+
+            assert recommender.get_statistic() == rebuilt.get_statistic()
+            backend = "columnar" if columnar else "list"
+            print(f"{backend} backend, {len(export)} shows: {counts}")
+            print(f"  full rebuild: {build_seconds:.3f} s")
+            print(f"  refresh:      {refresh_seconds:.3f} s ({refresh_seconds / build_seconds:.1%} of a rebuild)")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
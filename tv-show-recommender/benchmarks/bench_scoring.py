@@ -0,0 +1,105 @@
+"""Benchmark for the scoring models of ShowRecommender.get_recommendations().
+
+This script loads a TMDB CSV into the list, columnar and SQLite backends and prints, for a few
+queries, the median time of the plain rating-ordered get_recommendations() next to the same
+query ranked by a ScoringModel (the Bayesian rating alone, and a blend of five features). The
+query cache is turned off. If no --csv is given, a synthetic TMDB-shaped CSV with --shows rows is
+written to a temporary folder first.
+
+Example:
+    python -m benchmarks.bench_scoring --shows 150000
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from benchmarks.synthetic_tmdb import generate_tmdb_csv
+from src.data_processor import load_tv_shows_from_tmdb_csv, load_tv_shows_into_sqlite
+from src.scoring import ScoringModel
+from src.show_recommender import ShowRecommender
+
+# (label, get_recommendations() filters) of the timed queries
+QUERIES = [
+    ("no filters", {}),
+    ("drama", {"genre": "drama"}),
+    ("drama >= 7", {"genre": "drama", "min_rating": 7.0}),
+    ("en, 10-50 episodes", {"language": "en", "min_episodes": 10, "max_episodes": 50}),
+]
+
+# (label, scoring model) of the rankings compared with the plain rating order
+MODELS = [
+    ("bayesian", ScoringModel()),
+    ("blend", ScoringModel(
+        {"bayesian_rating": 1.0, "votes": 0.3, "recency": 0.2, "episodes": 0.1, "genre_match": 0.5},
+        genres=["comedy"],
+    )),
+]
+
+
+def median_ms(function, repeats):
+    """Return the median time of function() in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        began = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - began)
+    return statistics.median(times) * 1000
+
+
+def main() -> int:
+    """Run the benchmark and print the results.
+
+    Returns:
+        int: Process exit code (0 for success).
+    """
+    parser = argparse.ArgumentParser(description="Compare scored recommendations with the plain rating order.")
+    parser.add_argument("--csv", help="TMDB CSV to use instead of a synthetic one.")
+    parser.add_argument("--shows", type=int, default=150_000, help="Rows in the synthetic CSV.")
+    parser.add_argument("--repeats", type=int, default=10, help="Runs of each query.")
+    parser.add_argument("--limit", type=int, default=10, help="Recommendations per query.")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        csv_path = args.csv
+        if csv_path is None:
+            csv_path = os.path.join(temp_dir, "tmdb.csv")
+            generate_tmdb_csv(csv_path, args.shows)
+        shows = load_tv_shows_from_tmdb_csv(csv_path, limit=None)
+        database_path = os.path.join(temp_dir, "shows.db")
+        load_tv_shows_into_sqlite(csv_path, database_path)
+
+        backends = {}
+        for name, columnar in (("list", False), ("columnar", True)):
+            backends[name] = ShowRecommender(columnar=columnar, cache_size=0)
+            backends[name].add_shows_from_list(shows)
+        backends["sqlite"] = ShowRecommender(database=database_path, cache_size=0)
+
+        print(f"{len(shows)} shows, limit {args.limit}, times in ms")
+        header = "".join(f"{label:>12}" for label, _ in MODELS)
+        print(f"{'backend':10}{'query':22}{'rating':>12}{header}")
+        for name, recommender in backends.items():
+            # build the feature arrays before timing
+            recommender.get_recommendations(scoring=MODELS[0][1])
+            for label, filters in QUERIES:
+                plain = median_ms(lambda: recommender.get_recommendations(**filters, limit=args.limit), args.repeats)
+                scored = [
+                    median_ms(
+                        lambda: recommender.get_recommendations(**filters, limit=args.limit, scoring=model),
+                        args.repeats,
+                    )
+                    for _, model in MODELS
+                ]
+                print(f"{name:10}{label:22}{plain:>12.2f}" + "".join(f"{ms:>12.2f}" for ms in scored))
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,93 @@
+"""Benchmark for ShardedShowRecommender.
+
+This script loads a TMDB CSV into one ShowRecommender and into a ShardedShowRecommender with
+--shards worker processes, then prints the load time of both and the median latency of a few
+queries. The query caches are turned off. If no --csv is given, a synthetic TMDB-shaped CSV with
+--shows rows is written to a temporary folder first.
+
+Example:
+    python -m benchmarks.bench_sharding --shows 1000000 --shards 4
+"""
+
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+from benchmarks.synthetic_tmdb import generate_tmdb_csv
+from src.data_processor import load_tv_shows_from_tmdb_csv
+from src.sharding import ShardedShowRecommender
+from src.show_recommender import ShowRecommender
+
+# (label, method name, arguments) of the timed queries
+QUERIES = [
+    ("recommend drama >= 7, limit 10", "get_recommendations", {"genre": "drama", "min_rating": 7.0}),
+    ("recommend de, 10-50 episodes", "get_recommendations",
+     {"language": "de", "min_episodes": 10, "max_episodes": 50}),
+    ("recommend 20-30 episodes", "get_recommendations", {"min_episodes": 20, "max_episodes": 30}),
+    ("search_by_title('dark')", "search_by_title", {"search_term": "dark"}),
+    ("get_top_rated_shows(10)", "get_top_rated_shows", {"n": 10}),
+    ("get_statistic()", "get_statistic", {}),
+]
+
+
+def median_ms(recommender, method, arguments, repeats):
+    """Return the median time of a query in milliseconds."""
+    times = []
+    for _ in range(repeats):
+        began = time.perf_counter()
+        getattr(recommender, method)(**arguments)
+        times.append(time.perf_counter() - began)
+    return statistics.median(times) * 1000
+
+
+def main() -> int:
+    """Run the benchmark and print the results.
+
+    Returns:
+        int: Process exit code (0 for success).
+    """
+    parser = argparse.ArgumentParser(description="Compare a sharded recommender with a single one.")
+    parser.add_argument("--csv", help="TMDB CSV to use instead of a synthetic one.")
+    parser.add_argument("--shows", type=int, default=500_000, help="Rows in the synthetic CSV.")
+    parser.add_argument("--shards", type=int, default=os.cpu_count() or 1, help="Worker processes.")
+    parser.add_argument("--partition", default="hash", help='"hash" or "language".')
+    parser.add_argument("--columnar", action="store_true", help="Use the columnar backend.")
+    parser.add_argument("--repeats", type=int, default=10, help="Runs of each query.")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        csv_path = args.csv
+        if csv_path is None:
+            csv_path = os.path.join(temp_dir, "tmdb.csv")
+            generate_tmdb_csv(csv_path, args.shows)
+        shows = load_tv_shows_from_tmdb_csv(csv_path, limit=None)
+
+        began = time.perf_counter()
+        single = ShowRecommender(columnar=args.columnar, cache_size=0)
+        single.add_shows_from_list(shows)
+        single_load = time.perf_counter() - began
+
+        with ShardedShowRecommender(args.shards, args.partition, columnar=args.columnar, cache_size=0) as sharded:
+            began = time.perf_counter()
+            sharded.add_shows_from_list(shows)
+            sharded_load = time.perf_counter() - began
+
+            print(f"{len(shows)} shows, {args.shards} shards ({args.partition}), times in ms")
+            print(f"{'':34}{'single':>12}{'sharded':>12}")
+            print(f"{'load':34}{single_load * 1000:>12.0f}{sharded_load * 1000:>12.0f}")
+            for label, method, arguments in QUERIES:
+                single_ms = median_ms(single, method, arguments, args.repeats)
+                sharded_ms = median_ms(sharded, method, arguments, args.repeats)
+                print(f"{label:34}{single_ms:>12.2f}{sharded_ms:>12.2f}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,67 @@
+"""Benchmark for the binary snapshot cache.
+
+This script times a cold start from the TMDB CSV (csv.DictReader parsing) against
+a start from the snapshot written by load_tv_shows_from_tmdb_csv_cached(). If no
+--csv is given, a synthetic TMDB-shaped CSV with --shows rows is written to a
+temporary folder first.
+
+Example:
+    python -m benchmarks.bench_snapshot --shows 150000
+    python -m benchmarks.bench_snapshot --csv "C:\\path\\to\\TMDB_tv_dataset_v3.csv"
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+from benchmarks.synthetic_tmdb import generate_tmdb_csv
+from src.data_processor import load_tv_shows_from_tmdb_csv, load_tv_shows_from_tmdb_csv_cached
+
+
+def main() -> int:
+    """Run the benchmark and print the cold start times.
+
+    Returns:
+        int: Process exit code (0 for success).
+    """
+    parser = argparse.ArgumentParser(description="Compare CSV parsing with snapshot loading.")
+    parser.add_argument("--csv", help="TMDB CSV to use instead of a synthetic one.")
+    parser.add_argument("--shows", type=int, default=150_000, help="Rows in the synthetic CSV.")
+    args = parser.parse_args()
+
+    temp_dir = None
+    csv_path = args.csv
+    if csv_path is None:
+        temp_dir = tempfile.mkdtemp()
+        csv_path = os.path.join(temp_dir, "tmdb.csv")
+        generate_tmdb_csv(csv_path, args.shows)
+    snapshot_path = os.path.join(tempfile.mkdtemp(), "bench.snapshot")
+
+    try:
+        start = time.perf_counter()
+        shows = load_tv_shows_from_tmdb_csv(csv_path, limit=None)
+        csv_seconds = time.perf_counter() - start
+
+        # first cached call parses the CSV and writes the snapshot
+        load_tv_shows_from_tmdb_csv_cached(csv_path, limit=None, snapshot_path=snapshot_path)
+
+        start = time.perf_counter()
+        cached = load_tv_shows_from_tmdb_csv_cached(csv_path, limit=None, snapshot_path=snapshot_path)
+        snapshot_seconds = time.perf_counter() - start
+
+        assert len(cached) == len(shows)
+        print(f"{len(shows)} shows")
+        print(f"CSV parse:     {csv_seconds:.3f} s")
+        print(f"snapshot load: {snapshot_seconds:.3f} s ({csv_seconds / snapshot_seconds:.1f}x faster)")
+    finally:
+        shutil.rmtree(os.path.dirname(snapshot_path), ignore_errors=True)
+        if temp_dir is not None:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
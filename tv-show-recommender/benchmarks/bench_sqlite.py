@@ -0,0 +1,109 @@
+"""Benchmark for the SQLite storage engine of ShowRecommender.
+
+This script loads a TMDB CSV into a SQLite database with load_tv_shows_into_sqlite() and into
+the default in-memory list backend, then prints the load time, the Python memory each
+recommender holds (tracemalloc) and the median latency of a few queries on both. If no --csv is
+given, a synthetic TMDB-shaped CSV with --shows rows is written to a temporary folder first.
+
+Example:
+    python -m benchmarks.bench_sqlite --shows 150000
+"""
+
+import argparse
+import gc
+import os
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic_tmdb import generate_tmdb_csv
+from src.data_processor import load_tv_shows_from_tmdb_csv, load_tv_shows_into_sqlite
+from src.show_recommender import ShowRecommender
+
+# (label, method name, arguments) of the timed queries
+QUERIES = [
+    ("recommend drama >= 7, limit 10", "get_recommendations", {"genre": "drama", "min_rating": 7.0}),
+    ("recommend de, 10-50 episodes", "get_recommendations",
+     {"language": "de", "min_episodes": 10, "max_episodes": 50}),
+    ("filter_by_language('ja')", "filter_by_language", {"language": "ja"}),
+    ("filter_by_rating(9.5)", "filter_by_rating", {"min_rating": 9.5}),
+    ("search_by_title('dark')", "search_by_title", {"search_term": "dark"}),
+    ("get_top_rated_shows(10)", "get_top_rated_shows", {"n": 10}),
+]
+
+
+def median_ms(recommender, method, arguments, repeats):
+    """Return the median time of a query in milliseconds (the query cache is turned off)."""
+    times = []
+    for _ in range(repeats):
+        began = time.perf_counter()
+        getattr(recommender, method)(**arguments)
+        times.append(time.perf_counter() - began)
+    return statistics.median(times) * 1000
+
+
+def retained_bytes(start):
+    """Return the Python memory held by the recommender that start() returns."""
+    gc.collect()
+    tracemalloc.start()
+    recommender = start()
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return retained, recommender
+
+
+def main() -> int:
+    """Run the benchmark and print the results.
+
+    Returns:
+        int: Process exit code (0 for success).
+    """
+    parser = argparse.ArgumentParser(description="Compare the SQLite storage engine with the list backend.")
+    parser.add_argument("--csv", help="TMDB CSV to use instead of a synthetic one.")
+    parser.add_argument("--shows", type=int, default=150_000, help="Rows in the synthetic CSV.")
+    parser.add_argument("--repeats", type=int, default=20, help="Runs of each query.")
+    args = parser.parse_args()
+
+    temp_dir = tempfile.mkdtemp()
+    try:
+        csv_path = args.csv
+        if csv_path is None:
+            csv_path = os.path.join(temp_dir, "tmdb.csv")
+            generate_tmdb_csv(csv_path, args.shows)
+        database_path = os.path.join(temp_dir, "shows.db")
+
+        began = time.perf_counter()
+        stored = load_tv_shows_into_sqlite(csv_path, database_path)
+        sqlite_load = time.perf_counter() - began
+
+        def list_start():
+            recommender = ShowRecommender(cache_size=0)
+            recommender.add_shows_from_list(load_tv_shows_from_tmdb_csv(csv_path, limit=None))
+            return recommender
+
+        began = time.perf_counter()
+        list_start()
+        list_load = time.perf_counter() - began
+
+        list_memory, in_memory = retained_bytes(list_start)
+        sqlite_memory, on_disk = retained_bytes(lambda: ShowRecommender(cache_size=0, database=database_path))
+
+        print(f"{stored} shows")
+        print(f"{'':34}{'list':>12}{'sqlite':>12}")
+        print(f"{'load (s)':34}{list_load:>12.2f}{sqlite_load:>12.2f}")
+        print(f"{'Python memory held (MB)':34}{list_memory / 1e6:>12.1f}{sqlite_memory / 1e6:>12.1f}")
+        for label, method, arguments in QUERIES:
+            list_ms = median_ms(in_memory, method, arguments, args.repeats)
+            sqlite_ms = median_ms(on_disk, method, arguments, args.repeats)
+            print(f"{label + ' (ms)':34}{list_ms:>12.2f}{sqlite_ms:>12.2f}")
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,173 @@
+"""Benchmark suite for the TV show recommender at several dataset sizes.
+
+For every size, a synthetic TMDB-shaped CSV is generated (see synthetic_tmdb), then the
+suite reports:
+  - load time of load_tv_shows_from_tmdb_csv() and the peak memory while loading
+    (measured with tracemalloc in a separate run so it does not slow the timing),
+  - latency percentiles (p50/p95/p99, in milliseconds) of get_recommendations(),
+    search_by_title() and get_statistic() over many randomized calls.
+
+The query cache is turned off so every call is measured as a full computation. Like
+pytest-benchmark, every benchmark is a named function that is run many times, and the
+results can be saved as JSON to compare two runs.
+
+Example:
+    python -m benchmarks.bench_suite --sizes 10000 150000 1000000 --json results.json
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.synthetic_tmdb import GENRE_WEIGHTS, LANGUAGE_WEIGHTS, TITLE_WORDS, generate_tmdb_csv
+from src.data_processor import load_tv_shows_from_tmdb_csv
+from src.show_recommender import ShowRecommender
+
+
+def percentiles(samples_ms):
+    """Return the p50, p95, p99 and max of a list of timings in milliseconds."""
+    ordered = sorted(samples_ms)
+
+    def pick(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+    return {
+        "p50": pick(0.50),
+        "p95": pick(0.95),
+        "p99": pick(0.99),
+        "max": ordered[-1],
+        "mean": statistics.fmean(ordered),
+    }
+
+
+def measure_load(csv_path):
+    """Time a full load and measure its peak memory in a second, traced load."""
+    gc.collect()
+    start = time.perf_counter()
+    shows = load_tv_shows_from_tmdb_csv(csv_path, limit=None)
+    seconds = time.perf_counter() - start
+    del shows
+
+    gc.collect()
+    tracemalloc.start()
+    shows = load_tv_shows_from_tmdb_csv(csv_path, limit=None)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return shows, seconds, peak
+
+
+def query_benchmarks(rng):
+    """Return the named query benchmarks. Each one takes a recommender and runs one call with
+    randomized arguments drawn from rng."""
+    genres = list(GENRE_WEIGHTS)
+    languages = list(LANGUAGE_WEIGHTS)
+
+    def recommendations(recommender):
+        recommender.get_recommendations(
+            genre=rng.choice(genres + [None]),
+            min_rating=rng.choice([None, 5.0, 7.0, 8.5]),
+            min_episodes=rng.choice([None, 5, 20]),
+            max_episodes=rng.choice([None, 50, 200]),
+            language=rng.choice(languages + [None]),
+            limit=10,
+        )
+
+    def title_search(recommender):
+        word = rng.choice(TITLE_WORDS)
+        recommender.search_by_title(word[: rng.randint(3, len(word))])
+
+    def statistic(recommender):
+        recommender.get_statistic()
+
+    return {
+        "get_recommendations": recommendations,
+        "search_by_title": title_search,
+        "get_statistic": statistic,
+    }
+
+
+def run_size(rows, calls, seed, work_dir, columnar):
+    """Run every benchmark for one dataset size and return the results as a dict."""
+    csv_path = os.path.join(work_dir, f"tmdb_{rows}.csv")
+    generate_tmdb_csv(csv_path, rows, seed=seed)
+
+    shows, load_seconds, peak_bytes = measure_load(csv_path)
+    recommender = ShowRecommender(columnar=columnar, cache_size=0)
+    recommender.add_shows_from_list(shows)
+    # build lazily created indexes before timing
+    recommender.search_by_title("warm")
+
+    rng = random.Random(seed)
+    queries = {}
+    for name, benchmark in query_benchmarks(rng).items():
+        samples = []
+        for _ in range(calls):
+            start = time.perf_counter()
+            benchmark(recommender)
+            samples.append((time.perf_counter() - start) * 1000)
+        queries[name] = percentiles(samples)
+
+    return {
+        "rows": rows,
+        "loaded_shows": len(shows),
+        "load_seconds": load_seconds,
+        "load_peak_mib": peak_bytes / (1024 * 1024),
+        "queries_ms": queries,
+    }
+
+
+def print_result(result):
+    """Print the results for one dataset size as a small table."""
+    print(
+        f"\n== {result['rows']} rows ({result['loaded_shows']} valid) | "
+        f"load {result['load_seconds']:.2f} s | peak {result['load_peak_mib']:.1f} MiB"
+    )
+    print(f"{'query':<22} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    for name, stats in result["queries_ms"].items():
+        print(
+            f"{name:<22} {stats['p50']:>9.3f} {stats['p95']:>9.3f} "
+            f"{stats['p99']:>9.3f} {stats['max']:>9.3f}"
+        )
+
+
+def main() -> int:
+    """Parse CLI arguments, run the suite and print (and optionally save) the results.
+
+    Returns:
+        int: Process exit code (0 for success).
+    """
+    parser = argparse.ArgumentParser(description="Benchmark loading and queries at several sizes.")
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[10_000, 150_000], help="Dataset sizes (rows)."
+    )
+    parser.add_argument("--calls", type=int, default=200, help="Calls per query benchmark.")
+    parser.add_argument("--seed", type=int, default=551, help="Random seed for data and queries.")
+    parser.add_argument("--columnar", action="store_true", help="Use the columnar backend.")
+    parser.add_argument("--json", help="Also write the results to this JSON file.")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp()
+    results = []
+    try:
+        for rows in args.sizes:
+            result = run_size(rows, args.calls, args.seed, work_dir, args.columnar)
+            print_result(result)
+            results.append(result)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as json_file:
+            json.dump({"columnar": args.columnar, "results": results}, json_file, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,173 @@
+"""Load test for the recommendation HTTP service (src/service.py).
+
+Concurrent asyncio clients send randomized GET requests over keep-alive connections to
+a running service and the script reports throughput and latency percentiles. Queries
+are drawn from a pool of --distinct queries, so a small pool exercises request
+coalescing and the query cache, and a large one measures uncached queries.
+
+If no --port is given, the script writes a synthetic TMDB-shaped CSV with --shows rows,
+starts `python -m src.service` on it in a separate process and stops it afterwards.
+
+Example:
+    python -m benchmarks.load_test --shows 150000 --clients 32 --requests 5000
+    python -m benchmarks.load_test --port 8551 --clients 64 --duration 30
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlencode
+
+from benchmarks.bench_suite import percentiles
+from benchmarks.synthetic_tmdb import GENRE_WEIGHTS, LANGUAGE_WEIGHTS, TITLE_WORDS, generate_tmdb_csv
+
+
+def make_queries(count, seed):
+    """Return count random request paths covering every route."""
+    rng = random.Random(seed)
+    genres = [genre.lower() for genre in GENRE_WEIGHTS]
+    queries = []
+    for _ in range(count):
+        route = rng.choices(["recommendations", "search", "top"], weights=[6, 3, 1])[0]
+        if route == "recommendations":
+            params = {
+                "genre": rng.choice(genres + [""]),
+                "min_rating": rng.choice(["", "5", "7", "8.5"]),
+                "max_episodes": rng.choice(["", "50", "200"]),
+                "language": rng.choice(list(LANGUAGE_WEIGHTS) + [""]),
+                "limit": 10,
+            }
+            params = {name: value for name, value in params.items() if value != ""}
+        elif route == "search":
+            word = rng.choice(TITLE_WORDS)
+            params = {"q": word[: rng.randint(3, len(word))], "limit": 20}
+        else:
+            params = {"n": rng.choice([10, 50])}
+        queries.append(f"/{route}?{urlencode(params)}")
+    return queries
+
+
+async def fetch(reader, writer, host, path):
+    """Send one GET over an open connection and return (status, body)."""
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("latin-1"))
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    return status, await reader.readexactly(length)
+
+
+async def client(host, port, queries, rng, deadline, budget, latencies, errors):
+    """Send requests on one connection until the deadline passes or the budget is used up."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline and budget[0] > 0:
+            budget[0] -= 1
+            started = time.perf_counter()
+            status, _ = await fetch(reader, writer, host, rng.choice(queries))
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status != 200:
+                errors.append(status)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, clients, requests, duration, queries, seed):
+    """Run the clients and return (latencies in ms, error statuses, seconds)."""
+    latencies, errors = [], []
+    budget = [requests]
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, queries, random.Random(seed + i), deadline, budget, latencies, errors)
+        for i in range(clients)
+    ))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def service_stats(host, port):
+    """Return the service's /stats response."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        _, body = await fetch(reader, writer, host, "/stats")
+        return json.loads(body)
+    finally:
+        writer.close()
+
+
+def start_service(shows, work_dir):
+    """Start the service on a synthetic dataset and return (process, port)."""
+    csv_path = generate_tmdb_csv(os.path.join(work_dir, "tmdb.csv"), shows)
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.service", "--csv", csv_path, "--port", "0"],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    # the service prints "Serving N shows on http://host:port" once it is listening
+    line = process.stdout.readline()
+    if not line.startswith("Serving"):
+        process.kill()
+        raise RuntimeError("The service did not start.")
+    return process, int(line.rsplit(":", 1)[1])
+
+
+def main() -> int:
+    """Parse CLI arguments, run the load test and print the results.
+
+    Returns:
+        int: Process exit code (0 for success).
+    """
+    parser = argparse.ArgumentParser(description="Load test the recommendation service.")
+    parser.add_argument("--host", default="127.0.0.1", help="Service address.")
+    parser.add_argument("--port", type=int, help="Port of a running service (default: start one).")
+    parser.add_argument("--shows", type=int, default=150_000, help="Rows for the started service.")
+    parser.add_argument("--clients", type=int, default=32, help="Concurrent connections.")
+    parser.add_argument("--requests", type=int, default=5000, help="Total requests to send.")
+    parser.add_argument("--duration", type=float, default=60.0, help="Stop after this many seconds.")
+    parser.add_argument("--distinct", type=int, default=200, help="Size of the query pool.")
+    parser.add_argument("--seed", type=int, default=551, help="Random seed for the queries.")
+    args = parser.parse_args()
+
+    process = None
+    work_dir = tempfile.mkdtemp()
+    port = args.port
+    try:
+        if port is None:
+            process, port = start_service(args.shows, work_dir)
+        queries = make_queries(args.distinct, args.seed)
+        latencies, errors, seconds = asyncio.run(
+            run_load(args.host, port, args.clients, args.requests, args.duration, queries, args.seed)
+        )
+        stats = asyncio.run(service_stats(args.host, port))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    result = percentiles(latencies)
+    print(f"{len(latencies)} requests from {args.clients} clients in {seconds:.2f} s ({len(errors)} errors)")
+    print(f"throughput: {len(latencies) / seconds:.0f} requests/s")
+    print(
+        f"latency ms: p50 {result['p50']:.2f} | p95 {result['p95']:.2f} | "
+        f"p99 {result['p99']:.2f} | max {result['max']:.2f}"
+    )
+    print(f"service: {stats['service']}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
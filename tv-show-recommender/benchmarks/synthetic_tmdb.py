@@ -0,0 +1,171 @@
+"""Seeded generator for synthetic TMDB-shaped TV show CSV files.
+
+The real Kaggle TMDB TV dataset (about 150K rows) is not committed to git, so this
+script writes look-alike files offline for tests and benchmarks. The columns match
+TMDB_tv_dataset_v3.csv, the genre and language mixes follow the real dataset, and a
+small share of rows has missing fields or bad numeric values so the loaders' row
+skipping is exercised too. The same seed always produces the same file.
+
+Example:
+    python -m benchmarks.synthetic_tmdb --rows 150000 --out data/synthetic_tmdb_150k.csv
+"""
+
+import argparse
+import csv
+import random
+
+# The subset of TMDB_tv_dataset_v3.csv columns that is generated, in file order.
+COLUMNS = [
+    "id",
+    "name",
+    "number_of_seasons",
+    "number_of_episodes",
+    "original_language",
+    "vote_count",
+    "vote_average",
+    "overview",
+    "first_air_date",
+    "popularity",
+    "genres",
+    "origin_country",
+]
+
+# Approximate share of each genre in the TMDB dump (a show can have several).
+GENRE_WEIGHTS = {
+    "Drama": 30, "Comedy": 22, "Documentary": 14, "Animation": 12, "Reality": 10,
+    "Crime": 7, "Sci-Fi & Fantasy": 6, "Action & Adventure": 6, "Family": 5, "Kids": 5,
+    "Mystery": 4, "Talk": 4, "News": 3, "Soap": 3, "War & Politics": 1, "Western": 1,
+}
+
+# Approximate share of each original language (the long tail is grouped together).
+LANGUAGE_WEIGHTS = {
+    "en": 40, "ja": 9, "zh": 7, "ko": 5, "es": 5, "de": 4, "fr": 4, "pt": 3,
+    "ru": 3, "it": 2, "nl": 2, "sv": 1, "tr": 1, "hi": 1, "ar": 1, "pl": 1,
+}
+
+TITLE_WORDS = [
+    "Dark", "House", "Night", "City", "Love", "Secret", "Blue", "Lost", "Island", "Story",
+    "Kingdom", "Family", "Murder", "Star", "Game", "Road", "River", "King", "Summer",
+    "Crown", "Office", "Heist", "Black", "Mirror", "Wild", "Doctor", "Detective", "Ghost",
+]
+
+# Values that cannot be parsed as numbers, used for the "bad numeric value" rows.
+BAD_NUMBERS = ["N/A", "unknown", "12.5.3", "--", "ten"]
+
+
+def _weighted_sample(rng, weights, count):
+    """Pick count distinct keys from weights, favouring keys with larger weights."""
+    population = list(weights)
+    chosen = []
+    while len(chosen) < count:
+        key = rng.choices(population, weights=[weights[k] for k in population])[0]
+        if key not in chosen:
+            chosen.append(key)
+    return chosen
+
+
+def generate_rows(rows, seed=551, dirty_fraction=0.03):
+    """Yield synthetic TMDB rows as lists of strings in COLUMNS order.
+
+    Args:
+        rows (int): Number of rows to generate.
+        seed (int): Random seed; the same seed gives the same rows.
+        dirty_fraction (float): Share of rows with a bad numeric value.
+
+    Yields:
+        List[str]: One CSV row.
+    """
+    rng = random.Random(seed)
+    languages = list(LANGUAGE_WEIGHTS)
+    language_weights = list(LANGUAGE_WEIGHTS.values())
+
+    for show_id in range(1, rows + 1):
+        title = " ".join(rng.sample(TITLE_WORDS, rng.randint(1, 3)))
+        if rng.random() < 0.3:
+            title = f"{title} {rng.randint(2, 99)}"
+
+        seasons = max(1, int(rng.expovariate(1 / 2.5)))
+        episodes = seasons * rng.randint(1, 24)
+
+        # about half of the TMDB shows have no votes at all (and a 0.0 average)
+        vote_count = 0 if rng.random() < 0.5 else int(rng.paretovariate(1.2))
+        vote_average = 0.0 if vote_count == 0 else round(min(10.0, rng.gauss(6.8, 1.4)), 3)
+        vote_average = max(0.0, vote_average)
+
+        year = rng.randint(1950, 2024)
+        first_air_date = f"{year}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+
+        genre_count = min(3, int(rng.expovariate(1.0)) + 1)
+        genres = ", ".join(_weighted_sample(rng, GENRE_WEIGHTS, genre_count))
+        language = rng.choices(languages, weights=language_weights)[0]
+
+        overview = rng.choice([
+            "",
+            f"A {rng.choice(TITLE_WORDS).lower()} story, told over {seasons} seasons.",
+            'Critics called it "unmissable".',
+            "First line of the synopsis.\nSecond line, with a comma.",
+        ])
+
+        row = [
+            str(show_id), title, str(seasons), str(episodes), language, str(vote_count),
+            str(vote_average), overview, first_air_date, f"{rng.paretovariate(2.0):.3f}",
+            genres, rng.choice(["US", "GB", "JP", "KR", "DE", "FR", "ES", "CN", ""]),
+        ]
+
+        # missing fields: TMDB often leaves genres, dates and episode counts blank
+        if rng.random() < 0.08:
+            row[COLUMNS.index("genres")] = ""
+        if rng.random() < 0.05:
+            row[COLUMNS.index("first_air_date")] = ""
+        if rng.random() < 0.03:
+            row[COLUMNS.index("number_of_episodes")] = ""
+
+        # bad numeric values that the loaders must skip
+        if rng.random() < dirty_fraction:
+            column = rng.choice(["number_of_episodes", "vote_average"])
+            row[COLUMNS.index(column)] = rng.choice(BAD_NUMBERS + ["-4", "11.5"])
+
+        yield row
+
+
+def generate_tmdb_csv(path, rows, seed=551, dirty_fraction=0.03):
+    """Write a synthetic TMDB-shaped CSV file.
+
+    Args:
+        path (str): Output file path.
+        rows (int): Number of data rows to write.
+        seed (int): Random seed; the same seed gives the same file.
+        dirty_fraction (float): Share of rows with a bad numeric value.
+
+    Returns:
+        str: The output path.
+    """
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(COLUMNS)
+        writer.writerows(generate_rows(rows, seed=seed, dirty_fraction=dirty_fraction))
+    return path
+
+
+def main() -> int:
+    """Parse CLI arguments and write a synthetic dataset.
+
+    Returns:
+        int: Process exit code (0 for success).
+    """
+    parser = argparse.ArgumentParser(description="Write a synthetic TMDB-shaped TV show CSV.")
+    parser.add_argument("--rows", type=int, default=150_000, help="Number of rows to generate.")
+    parser.add_argument("--out", required=True, help="Output CSV path.")
+    parser.add_argument("--seed", type=int, default=551, help="Random seed.")
+    parser.add_argument(
+        "--dirty-fraction", type=float, default=0.03, help="Share of rows with bad numbers."
+    )
+    args = parser.parse_args()
+
+    generate_tmdb_csv(args.out, args.rows, seed=args.seed, dirty_fraction=args.dirty_fraction)
+    print(f"Wrote {args.rows} rows to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
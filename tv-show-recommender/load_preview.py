@@ -6,11 +6,17 @@ basic summary information plus a small sample of shows.
 
 Example:
     python load_preview.py --csv "C:\\path\\to\\TMDB_tv_dataset_v3.csv" --limit 1000 --show 10
+    python load_preview.py --csv "C:\\path\\to\\TMDB_tv_dataset_v3.csv" --limit 100000 --profile
 """
 
 import argparse
 
-from src.data_processor import load_tv_shows_from_tmdb_csv
+from src.data_processor import (
+    build_tmdb_snapshot,
+    iter_tv_shows_from_tmdb_csv,
+    load_tv_shows_from_tmdb_csv_cached,
+)
+from src.instrumentation import PROFILER
 from src.show_recommender import ShowRecommender
 
 
@@ -36,14 +42,42 @@ def main() -> int:
         default=10,
         help="How many loaded shows to print.",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always parse the CSV instead of using (and writing) the binary snapshot next to it.",
+    )
+    parser.add_argument(
+        "--lazy",
+        action="store_true",
+        help="Memory-map the snapshot and only build the shows that are printed.",
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Record loader and method timings, run a few sample queries and print the report.",
+    )
+    parser.add_argument(
+        "--profile-json",
+        default=None,
+        help="Also write the profile report as JSON to this file (implies --profile).",
+    )
     args = parser.parse_args()
+    profile = args.profile or args.profile_json is not None
+    if profile:
+        PROFILER.enable()
 
-    # Load a subset of the dataset for a quick sanity-check.
-    tv_shows = load_tv_shows_from_tmdb_csv(args.csv, limit=args.limit)
-
-    # Add the loaded TVShow objects into the recommender.
     recommender = ShowRecommender()
-    recommender.add_shows_from_list(tv_shows)
+    if args.lazy and not args.no_cache:
+        # Open the snapshot lazily: TVShow objects are only made for the rows that are used.
+        recommender = ShowRecommender.from_snapshot(build_tmdb_snapshot(args.csv, limit=args.limit))
+    elif args.no_cache:
+        # Stream a subset of the dataset straight into the recommender for a quick sanity-check.
+        # The shows are consumed while the CSV is read, so no separate list is built.
+        recommender.add_shows_from_list(iter_tv_shows_from_tmdb_csv(args.csv, limit=args.limit))
+    else:
+        # Reuse the snapshot from a previous run if the CSV has not changed since.
+        recommender.add_shows_from_list(load_tv_shows_from_tmdb_csv_cached(args.csv, limit=args.limit))
 
     print(f"Loaded {recommender.get_total_shows()} shows from: {args.csv}")
     stats = recommender.get_statistic()
@@ -51,9 +85,26 @@ def main() -> int:
     print()
 
     # Print a small sample of loaded shows to verify parsing.
-    for index, show in enumerate(tv_shows[: max(0, args.show)], 1):
+    for index, show in enumerate(recommender.shows[: max(0, args.show)], 1):
         print(f"{index}. {show.title} ({show.avg_rating}/10) [{', '.join(show.genre)}]")
 
+    if profile:
+        # A few typical queries, so the report shows the query paths as well as the loading.
+        genres = [genre for genre, _ in sorted(
+            recommender.get_genre_breakdown().items(), key=lambda item: -item[1]["count"]
+        )[:5]]
+        for genre in genres:
+            recommender.get_recommendations(genre=genre, min_rating=7.0, limit=10)
+            recommender.get_recommendations(genre=genre, max_episodes=50, language="en", limit=10)
+        for show in recommender.get_top_rated_shows(5):
+            recommender.search_by_title(show.title.split()[0] if show.title.split() else show.title)
+        recommender.filter_by_rating(8.0)
+        print()
+        print(PROFILER.report())
+        if args.profile_json is not None:
+            PROFILER.to_json(args.profile_json)
+            print(f"Wrote the profile to {args.profile_json}")
+
     return 0
 
 
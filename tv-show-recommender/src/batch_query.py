@@ -0,0 +1,179 @@
+"""EE551- Engineering Programming: Python. Fall 2025. Batch query module.
+This module evaluates many recommendation profiles together for
+ShowRecommender.get_recommendations_batch(). Identical profiles are only computed once,
+and the genre and language candidates that several profiles share are looked up once and
+reused. Large batches can be spread across worker processes.
+"""
+
+import heapq
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# keys a preference profile can have (all optional), in get_recommendations() order
+PROFILE_KEYS = ("genre", "min_rating", "min_episodes", "max_episodes", "language")
+
+# batches with fewer distinct profiles than this are evaluated in the calling process
+PARALLEL_THRESHOLD = 2000
+
+
+def normalize_profile(profile):
+    """This turns a profile dictionary into a hashable key tuple in PROFILE_KEYS order. Genre and
+    language are lowercased (they are matched case-insensitively) and empty strings become None.
+    A ValueError is raised for keys that get_recommendations() does not have.
+    """
+    unknown = set(profile) - set(PROFILE_KEYS)
+    if unknown:
+        raise ValueError(f"Unknown profile keys: {sorted(unknown)}")
+    genre = profile.get("genre") or None
+    language = profile.get("language") or None
+    return (
+        genre.lower() if genre else None,
+        profile.get("min_rating"),
+        profile.get("min_episodes"),
+        profile.get("max_episodes"),
+        language.lower() if language else None,
+    )
+
+
+class BatchEvaluator:
+    """This class answers many normalized profiles against one ShowRecommender. It remembers the
+    candidate ids (list backend) or boolean masks (columnar backend) for every genre, language
+    and genre/language pair it has seen, so profiles that share those predicates reuse them.
+    """
+
+    def __init__(self, recommender):
+        """This makes an evaluator for the recommender's current shows."""
+        self.recommender = recommender
+        self._candidate_ids = {}
+        self._masks = {}
+
+    def _ids_for(self, genre, language):
+        """This returns the sorted candidate ids for a genre/language pair (list backend)."""
+        key = (genre, language)
+        if key not in self._candidate_ids:
+            recommender = self.recommender
+            posting_lists = []
+            if genre:
+                posting_lists.append(recommender._genre_ids(genre))
+            if language:
+                posting_lists.append(recommender._language_index.get(language))
+            posting_lists.sort(key=len)
+            candidate_ids = posting_lists[0]
+            for other_ids in posting_lists[1:]:
+                other_ids = set(other_ids)
+                candidate_ids = [show_id for show_id in candidate_ids if show_id in other_ids]
+            self._candidate_ids[key] = candidate_ids
+        return self._candidate_ids[key]
+
+    def _mask_for(self, kind, value):
+        """This returns the cached boolean mask for one genre or language (columnar backend)."""
+        key = (kind, value)
+        if key not in self._masks:
+            store = self.recommender._store
+            if kind == "genre":
+                self._masks[key] = store.genre_mask(value)
+            else:
+                self._masks[key] = store.language_mask(value)
+        return self._masks[key]
+
+    def evaluate(self, key, limit):
+        """This returns the ids of the recommendations for one normalized profile, best first. The
+        result is the same as get_recommendations() with the same arguments.
+        """
+        genre, min_rating, min_episodes, max_episodes, language = key
+        recommender = self.recommender
+        has_numeric = min_rating is not None or min_episodes is not None or max_episodes is not None
+
+        if not (genre or language or has_numeric):
+            return recommender._rating_order.first_ids(limit)
+
+        if recommender._store is not None:
+            store = recommender._store
+            mask = store.all_mask()
+            if genre:
+                mask &= self._mask_for("genre", genre)
+            if language:
+                mask &= self._mask_for("language", language)
+            if min_rating is not None:
+                mask &= store.rating_mask(min_rating)
+            if min_episodes is not None or max_episodes is not None:
+                mask &= store.episode_mask(min_episodes, max_episodes)
+            return store.top_k(mask.nonzero()[0], limit).tolist()
+
+        shows = recommender.shows
+        if genre or language:
+            candidate_ids = self._ids_for(genre, language)
+        else:
+            candidate_ids = range(len(shows))
+        if has_numeric:
+            candidate_ids = [
+                show_id
+                for show_id in candidate_ids
+                if (min_rating is None or shows[show_id].avg_rating >= min_rating)
+                and (min_episodes is None or shows[show_id].num_episodes >= min_episodes)
+                and (max_episodes is None or shows[show_id].num_episodes <= max_episodes)
+            ]
+
+        def rating(show_id):
+            return shows[show_id].avg_rating
+
+        if limit is None or limit < 0:
+            return sorted(candidate_ids, key=rating, reverse=True)[:limit]
+        # candidate ids are in collection order, so nlargest keeps ties in collection order
+        return heapq.nlargest(limit, candidate_ids, key=rating)
+
+
+# evaluator of the worker process, set by _init_worker()
+_worker_evaluator = None
+
+
+def _init_worker(recommender):
+    """This runs once in every worker process and keeps an evaluator for its copy of the shows."""
+    global _worker_evaluator
+    _worker_evaluator = BatchEvaluator(recommender)
+
+
+def _evaluate_chunk(keys, limit):
+    """This evaluates a chunk of normalized profiles inside a worker process. Only ids are sent
+    back, so the TVShow objects do not have to be pickled again.
+    """
+    return [_worker_evaluator.evaluate(key, limit) for key in keys]
+
+
+def evaluate_batch(recommender, profiles, limit=10, workers=None):
+    """This evaluates a list of profiles and returns one list of show ids per profile, in the same
+    order as profiles. workers is the number of worker processes: None picks one per CPU for
+    large batches (and none for small ones), 1 always evaluates in this process.
+    """
+    keys = [normalize_profile(profile) for profile in profiles]
+    # identical profiles are evaluated once
+    unique_keys = list(dict.fromkeys(keys))
+
+    if workers is None:
+        workers = (os.cpu_count() or 1) if len(unique_keys) >= PARALLEL_THRESHOLD else 1
+
+    if workers <= 1 or len(unique_keys) < 2:
+        evaluator = BatchEvaluator(recommender)
+        unique_results = [evaluator.evaluate(key, limit) for key in unique_keys]
+    else:
+        # sort the profiles so each worker gets profiles that share genre/language predicates
+        ordered = sorted(
+            range(len(unique_keys)),
+            key=lambda i: (unique_keys[i][0] or "", unique_keys[i][4] or ""),
+        )
+        chunk_size = -(-len(ordered) // (workers * 4))
+        chunks = [ordered[i:i + chunk_size] for i in range(0, len(ordered), chunk_size)]
+        unique_results = [None] * len(unique_keys)
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(recommender,)
+        ) as executor:
+            futures = [
+                executor.submit(_evaluate_chunk, [unique_keys[i] for i in chunk], limit)
+                for chunk in chunks
+            ]
+            for chunk, future in zip(chunks, futures):
+                for i, result in zip(chunk, future.result()):
+                    unique_results[i] = result
+
+    result_by_key = dict(zip(unique_keys, unique_results))
+    return [result_by_key[key] for key in keys]
@@ -13,8 +13,25 @@ rows into TVShow objects that can be used by the ShowRecommender class.
 # continues to run even if the dataset has inconsistencies.
 
 import csv
-from typing import List, Optional
-
+import io
+import mmap
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .dataset_snapshot import (
+    default_snapshot_path,
+    is_snapshot_valid,
+    load_snapshot,
+    save_snapshot,
+    source_key,
+)
+from .instrumentation import PROFILER
+from .sqlite_store import SQLiteShowStore
 from .tv_show import TVShow
 
 
@@ -35,6 +52,10 @@ def load_tv_shows_from_csv(file_path: str) -> List[TVShow]:
 
     # List that will store all valid TVShow objects.
     tv_shows = []
+    # Rows read and skip reasons, reported to the profiler when it is enabled.
+    started = time.perf_counter()
+    rows_read = 0
+    skipped: Counter = Counter()
 
     try:
         # Open the CSV file safely.
@@ -43,10 +64,15 @@ def load_tv_shows_from_csv(file_path: str) -> List[TVShow]:
 
             # Loop through each row in the dataset.
             for row in reader:
+                rows_read += 1
+                # The field being converted, so a failure can be reported with its reason.
+                field = "row"
+                num_episodes, avg_rating = 0, 0.0
                 try:
                     # Extract and clean string fields.
                     title = row.get("title", "").strip()
-                    language = row.get("language", "").strip()
+                    # Intern the language so every show in the same language shares one string.
+                    language = sys.intern(row.get("language", "").strip())
 
                     # Genre can be stored as a string or list-like format.
                     genre = row.get("genre", "")
@@ -55,9 +81,13 @@ def load_tv_shows_from_csv(file_path: str) -> List[TVShow]:
                         genre = [g.strip() for g in genre.split(",") if g.strip()]
 
                     # Convert numeric values safely.
+                    field = "num_episodes"
                     num_episodes = int(row.get("episodes", 0))
+                    field = "avg_rating"
                     avg_rating = float(row.get("rating", 0))
+                    field = "year"
                     year = int(row.get("year", 0))
+                    field = ""
 
                     # create a TVShow object
                     show = TVShow(
@@ -74,16 +104,193 @@ def load_tv_shows_from_csv(file_path: str) -> List[TVShow]:
 
                 except (ValueError, TypeError):
                     # Skip rows with invalid numeric data.
+                    skipped[_skip_reason(field, num_episodes, avg_rating)] += 1
                     continue
 
     except FileNotFoundError:
         # Raise a clear error if dataset is missing.
         raise FileNotFoundError(f"CSV file not found at: {file_path}")
 
+    if PROFILER.enabled:
+        PROFILER.record_load(
+            "load_tv_shows_from_csv", time.perf_counter() - started, rows_read, len(tv_shows), skipped
+        )
+
     # return the fully processed list of TVShow objects
     return tv_shows
 
 
+def _skip_reason(field: str, num_episodes: int, avg_rating: float) -> str:
+    """
+    Name the reason a row was skipped, for the profiler.
+
+    Args:
+        field (str): The TVShow field that could not be converted, or "" if every field was
+            converted and TVShow rejected the values.
+        num_episodes (int): The converted episode count (only used when field is "").
+        avg_rating (float): The converted rating (only used when field is "").
+
+    Returns:
+        str: A short reason like "invalid avg_rating" or "negative num_episodes".
+    """
+    if field:
+        return f"invalid {field}"
+    if not 0 <= avg_rating <= 10:
+        return "avg_rating out of range"
+    if num_episodes < 0:
+        return "negative num_episodes"
+    return "invalid show"
+
+
+def _parse_vote_count(value: Optional[str]) -> Optional[int]:
+    """
+    Convert a TMDB vote_count cell into a number of votes.
+
+    Args:
+        value (Optional[str]): The cell text, or None if the column is missing.
+
+    Returns:
+        Optional[int]: The vote count, or None when it is missing, unreadable or negative (the
+        row is still loaded, the show's vote count is just unknown).
+    """
+    try:
+        count = int(value)
+    except (TypeError, ValueError):
+        return None
+    return count if count >= 0 else None
+
+
+def _parse_tmdb_row(row: Dict[str, str]) -> Tuple[Optional[TVShow], str]:
+    """
+    Convert one TMDB CSV row (as read by csv.DictReader) into a TVShow object, or name the
+    reason it has to be skipped.
+
+    Args:
+        row (Dict[str, str]): The CSV row keyed by column name.
+
+    Returns:
+        Tuple[Optional[TVShow], str]: (show, "") for a valid row, or (None, skip reason).
+    """
+    # The field being converted, so a failure can be reported with its reason.
+    field = "row"
+    num_episodes, avg_rating = 0, 0.0
+    try:
+        # Map TMDB column names into our TVShow fields.
+        title = (row.get("name") or "").strip()
+        # Intern the language so every show in the same language shares one string.
+        language = sys.intern((row.get("original_language") or "").strip())
+
+        # TMDB stores genres as a comma-separated string; split into a list.
+        genres_raw = (row.get("genres") or "").strip()
+        genre = [g.strip() for g in genres_raw.split(",") if g.strip()]
+
+        # Convert numeric values required by TVShow.
+        field = "num_episodes"
+        num_episodes = int(row.get("number_of_episodes") or 0)
+        field = "avg_rating"
+        avg_rating = float(row.get("vote_average") or 0)
+
+        # Convert first air date (YYYY-MM-DD) into a year integer.
+        field = "year"
+        first_air_date = (row.get("first_air_date") or "").strip()
+        year = int(first_air_date[:4]) if len(first_air_date) >= 4 else None
+
+        field = ""
+        show = TVShow(
+            title=title,
+            genre=genre,
+            num_episodes=num_episodes,
+            avg_rating=avg_rating,
+            language=language,
+            year=year,
+            vote_count=_parse_vote_count(row.get("vote_count")),
+        )
+        return show, ""
+
+    except (ValueError, TypeError):
+        # Skip any invalid row (bad numbers or missing data).
+        return None, _skip_reason(field, num_episodes, avg_rating)
+
+
+def iter_tv_shows_from_tmdb_csv(file_path: str, limit: Optional[int] = None) -> Iterator[TVShow]:
+    """
+    Stream TV shows from the Kaggle TMDB TV dataset (v3) CSV file. Rows are read and
+    converted one at a time, so a TVShow is available as soon as its row has been read
+    and the full list never has to be held in memory.
+
+    The column mapping and row-skipping rules are the same as load_tv_shows_from_tmdb_csv().
+    When the profiler is enabled, the rows read and skipped (with reasons) are recorded once the
+    stream ends; the time includes what the caller did with the shows in between.
+
+    Args:
+        file_path (str): Path to the TMDB CSV dataset file.
+        limit (Optional[int]): Max number of valid rows to yield. None (the default) reads the whole file.
+
+    Yields:
+        TVShow: One TVShow object per valid row.
+    """
+    max_valid = None if limit is None else max(0, int(limit))
+    if max_valid == 0:
+        return
+
+    loaded = 0
+    started = time.perf_counter()
+    rows_read = 0
+    skipped: Counter = Counter()
+    try:
+        with open(file_path, mode="r", encoding="utf-8") as csv_file:
+            reader = csv.DictReader(csv_file)
+
+            for row in reader:
+                rows_read += 1
+                show, reason = _parse_tmdb_row(row)
+                if show is None:
+                    skipped[reason] += 1
+                    continue
+
+                yield show
+                loaded += 1
+
+                # Stop once we have yielded the requested number of valid rows.
+                if max_valid is not None and loaded >= max_valid:
+                    break
+
+    except FileNotFoundError:
+        raise FileNotFoundError(f"CSV file not found at: {file_path}")
+    finally:
+        # This also runs when the caller stops reading the stream early.
+        if PROFILER.enabled and rows_read:
+            PROFILER.record_load(
+                "iter_tv_shows_from_tmdb_csv", time.perf_counter() - started, rows_read, loaded, skipped
+            )
+
+
+def iter_tv_show_batches_from_tmdb_csv(
+    file_path: str, batch_size: int = 10000, limit: Optional[int] = None
+) -> Iterator[List[TVShow]]:
+    """
+    Stream TV shows from the TMDB CSV file in fixed-size batches. Only one batch is held
+    in memory at a time, so peak memory is bounded by batch_size instead of the file size.
+
+    Args:
+        file_path (str): Path to the TMDB CSV dataset file.
+        batch_size (int): Number of TVShow objects per batch (the last batch may be smaller).
+        limit (Optional[int]): Max number of valid rows to yield in total. None reads the whole file.
+
+    Yields:
+        List[TVShow]: Lists of at most batch_size TVShow objects, in file order.
+    """
+    if batch_size < 1:
+        raise ValueError("batch_size must be at least 1.")
+
+    shows = iter_tv_shows_from_tmdb_csv(file_path, limit=limit)
+    while True:
+        batch = list(islice(shows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
 def load_tv_shows_from_tmdb_csv(file_path: str, limit: Optional[int] = 1000) -> List[TVShow]:
     """
     Load TV show data from the Kaggle TMDB TV dataset (v3) CSV file and convert each
@@ -96,6 +303,10 @@ def load_tv_shows_from_tmdb_csv(file_path: str, limit: Optional[int] = 1000) ->
         - vote_average -> avg_rating
         - original_language -> language
         - first_air_date -> year (YYYY extracted from YYYY-MM-DD)
+        - vote_count -> vote_count (optional; None when missing or invalid)
+
+    Use iter_tv_shows_from_tmdb_csv() or iter_tv_show_batches_from_tmdb_csv() to stream the
+    shows (for example straight into ShowRecommender.add_shows_from_list()) instead.
 
     Args:
         file_path (str): Path to the TMDB CSV dataset file.
@@ -104,51 +315,290 @@ def load_tv_shows_from_tmdb_csv(file_path: str, limit: Optional[int] = 1000) ->
     Returns:
         List[TVShow]: List of TVShow objects loaded from the dataset.
     """
-    tv_shows: List[TVShow] = []
+    return list(iter_tv_shows_from_tmdb_csv(file_path, limit=limit))
+
+
+def _text_stream(raw: bytes) -> io.TextIOWrapper:
+    """
+    Wrap raw CSV bytes in a text stream that decodes them exactly like open(..., mode="r",
+    encoding="utf-8") does in the serial loaders (including newline translation).
+
+    Args:
+        raw (bytes): Raw bytes read from the CSV file.
+
+    Returns:
+        io.TextIOWrapper: A text stream over the bytes.
+    """
+    return io.TextIOWrapper(io.BytesIO(raw), encoding="utf-8")
+
+
+def _find_row_boundaries(data: mmap.mmap, start: int, chunk_bytes: int) -> List[int]:
+    """
+    Split data[start:] into byte ranges of roughly chunk_bytes that end on row boundaries.
+
+    A newline only ends a row when it is outside a quoted field. Quotes inside a field are
+    escaped by doubling them, so a newline ends a row exactly when the number of quote
+    characters since the previous row boundary is even.
+
+    Args:
+        data (mmap.mmap): The memory-mapped CSV file.
+        start (int): Offset of the first data row (just after the header).
+        chunk_bytes (int): Target size of each range.
+
+    Returns:
+        List[int]: Sorted offsets, starting with start and ending with len(data).
+    """
+    size = len(data)
+    boundaries = [start]
+    while boundaries[-1] < size:
+        previous = boundaries[-1]
+        position = previous + chunk_bytes
+        if position >= size:
+            boundaries.append(size)
+            break
+
+        in_quotes = data[previous:position].count(b'"') % 2 == 1
+        while True:
+            newline = data.find(b"\n", position)
+            if newline == -1:
+                boundaries.append(size)
+                break
+            if data[position:newline].count(b'"') % 2 == 1:
+                in_quotes = not in_quotes
+            if not in_quotes:
+                boundaries.append(newline + 1)
+                break
+            position = newline + 1
+    return boundaries
+
+
+def _parse_tmdb_byte_range(
+    file_path: str, start: int, end: int, fieldnames: List[str]
+) -> Tuple[List[TVShow], int, Dict[str, int]]:
+    """
+    Parse the TMDB rows stored in file_path[start:end]. This runs inside a worker process.
+
+    Args:
+        file_path (str): Path to the TMDB CSV dataset file.
+        start (int): Offset of the first byte of the range (a row boundary).
+        end (int): Offset just after the last byte of the range (a row boundary).
+        fieldnames (List[str]): Column names from the CSV header.
+
+    Returns:
+        Tuple[List[TVShow], int, Dict[str, int]]: The valid shows in the range, in file order,
+        the number of rows read and the number of skipped rows per skip reason.
+    """
+    with open(file_path, mode="rb") as raw_file:
+        raw_file.seek(start)
+        raw = raw_file.read(end - start)
+
+    reader = csv.DictReader(_text_stream(raw), fieldnames=fieldnames)
+    tv_shows = []
+    rows_read = 0
+    skipped: Counter = Counter()
+    for row in reader:
+        rows_read += 1
+        show, reason = _parse_tmdb_row(row)
+        if show is None:
+            skipped[reason] += 1
+        else:
+            tv_shows.append(show)
+    return tv_shows, rows_read, dict(skipped)
+
+
+def _split_tmdb_csv(file_path: str, chunk_bytes: int) -> Tuple[List[str], List[int]]:
+    """
+    Read the TMDB CSV header and split the rest of the file into row-aligned byte ranges.
+
+    Args:
+        file_path (str): Path to the TMDB CSV dataset file.
+        chunk_bytes (int): Target size of each range.
+
+    Returns:
+        Tuple[List[str], List[int]]: The column names and the range boundaries.
+    """
+    with open(file_path, mode="rb") as raw_file:
+        if os.fstat(raw_file.fileno()).st_size == 0:
+            return [], [0]
+        with mmap.mmap(raw_file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            header_end = _find_row_boundaries(data, 0, 1)[1]
+            header = next(csv.reader(_text_stream(data[:header_end])), [])
+            return header, _find_row_boundaries(data, header_end, chunk_bytes)
+
+
+def load_tv_shows_from_tmdb_csv_parallel(
+    file_path: str,
+    limit: Optional[int] = 1000,
+    workers: Optional[int] = None,
+    chunk_bytes: int = 4 * 1024 * 1024,
+) -> List[TVShow]:
+    """
+    Load the TMDB TV dataset with several worker processes.
+
+    The file is split into byte ranges that start and end on row boundaries (newlines
+    inside quoted fields are respected), each range is parsed in a ProcessPoolExecutor
+    worker, and the results are joined back in file order. Rows are converted and skipped
+    with the same rules as load_tv_shows_from_tmdb_csv(), so both return the same shows.
+
+    This is opt-in: the parsed shows are pickled back from the workers, so it only pays
+    off on machines with several free cores.
+
+    Args:
+        file_path (str): Path to the TMDB CSV dataset file.
+        limit (Optional[int]): Max number of valid rows to load. Use None for no limit.
+        workers (Optional[int]): Number of worker processes. Defaults to the CPU count.
+        chunk_bytes (int): Target size in bytes of the range given to each task.
+
+    Returns:
+        List[TVShow]: List of TVShow objects loaded from the dataset.
+    """
+    if chunk_bytes < 1:
+        raise ValueError("chunk_bytes must be at least 1.")
     max_valid = None if limit is None else max(0, int(limit))
+    if max_valid == 0:
+        return []
 
     try:
-        with open(file_path, mode="r", encoding="utf-8") as csv_file:
-            reader = csv.DictReader(csv_file)
-
-            for row in reader:
-                # Stop once we have loaded the requested number of valid rows.
-                if max_valid is not None and len(tv_shows) >= max_valid:
-                    break
+        fieldnames, boundaries = _split_tmdb_csv(file_path, chunk_bytes)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"CSV file not found at: {file_path}")
+    ranges = list(zip(boundaries, boundaries[1:]))
+    if not ranges:
+        return []
 
-                try:
-                    # Map TMDB column names into our TVShow fields.
-                    title = (row.get("name") or "").strip()
-                    language = (row.get("original_language") or "").strip()
+    started = time.perf_counter()
+    rows_read = 0
+    skipped: Counter = Counter()
+    tv_shows: List[TVShow] = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(_parse_tmdb_byte_range, file_path, start, end, fieldnames)
+            for start, end in ranges
+        ]
+        # Collect the results in file order and stop once the limit is reached.
+        for future in futures:
+            range_shows, range_rows, range_skipped = future.result()
+            tv_shows.extend(range_shows)
+            rows_read += range_rows
+            skipped.update(range_skipped)
+            if max_valid is not None and len(tv_shows) >= max_valid:
+                for pending in futures:
+                    pending.cancel()
+                break
+
+    if max_valid is not None:
+        tv_shows = tv_shows[:max_valid]
+    if PROFILER.enabled:
+        PROFILER.record_load(
+            "load_tv_shows_from_tmdb_csv_parallel", time.perf_counter() - started, rows_read, len(tv_shows), skipped
+        )
+    return tv_shows
 
-                    # TMDB stores genres as a comma-separated string; split into a list.
-                    genres_raw = (row.get("genres") or "").strip()
-                    genre = [g.strip() for g in genres_raw.split(",") if g.strip()]
 
-                    # Convert numeric values required by TVShow.
-                    num_episodes = int(row.get("number_of_episodes") or 0)
-                    avg_rating = float(row.get("vote_average") or 0)
+def load_tv_shows_from_tmdb_csv_cached(
+    file_path: str, limit: Optional[int] = 1000, snapshot_path: Optional[str] = None
+) -> List[TVShow]:
+    """
+    Load TMDB TV shows through a binary snapshot cache (see dataset_snapshot).
 
-                    # Convert first air date (YYYY-MM-DD) into a year integer.
-                    first_air_date = (row.get("first_air_date") or "").strip()
-                    year = int(first_air_date[:4]) if len(first_air_date) >= 4 else None
+    If a snapshot made from the same CSV (same path, size and modification time) and
+    the same limit exists, it is loaded instead of parsing the CSV. Otherwise the CSV
+    is parsed with load_tv_shows_from_tmdb_csv() and a new snapshot is written.
 
-                    show = TVShow(
-                        title=title,
-                        genre=genre,
-                        num_episodes=num_episodes,
-                        avg_rating=avg_rating,
-                        language=language,
-                        year=year,
-                    )
+    Args:
+        file_path (str): Path to the TMDB CSV dataset file.
+        limit (Optional[int]): Max number of valid rows to load. Use None for no limit.
+        snapshot_path (Optional[str]): Snapshot directory. Defaults to the CSV path plus ".snapshot".
 
-                    tv_shows.append(show)
+    Returns:
+        List[TVShow]: List of TVShow objects, identical to load_tv_shows_from_tmdb_csv().
+    """
+    if snapshot_path is None:
+        snapshot_path = default_snapshot_path(file_path)
+    max_valid = None if limit is None else max(0, int(limit))
 
-                except (ValueError, TypeError):
-                    # Skip any invalid row (bad numbers or missing data).
-                    continue
+    if is_snapshot_valid(snapshot_path, file_path, limit=max_valid):
+        started = time.perf_counter()
+        tv_shows = load_snapshot(snapshot_path)
+        if PROFILER.enabled:
+            PROFILER.record_load("load_snapshot", time.perf_counter() - started, len(tv_shows), len(tv_shows))
+        return tv_shows
 
+    try:
+        # Take the key before parsing so a file changed mid-parse is not cached as current.
+        key = source_key(file_path)
     except FileNotFoundError:
         raise FileNotFoundError(f"CSV file not found at: {file_path}")
 
+    tv_shows = load_tv_shows_from_tmdb_csv(file_path, limit=max_valid)
+    try:
+        save_snapshot(tv_shows, snapshot_path, key, limit=max_valid)
+    except OSError:
+        # A snapshot that cannot be written (e.g. read-only folder) only costs speed next time.
+        pass
+
     return tv_shows
+
+
+def build_tmdb_snapshot(
+    file_path: str, limit: Optional[int] = 1000, snapshot_path: Optional[str] = None
+) -> str:
+    """
+    Make sure an up-to-date binary snapshot of a TMDB CSV exists and return its path.
+
+    The CSV is only parsed when there is no snapshot for the same file and limit yet. The
+    snapshot can be opened lazily with ShowRecommender.from_snapshot(), which memory-maps
+    it instead of building every TVShow up front.
+
+    Args:
+        file_path (str): Path to the TMDB CSV dataset file.
+        limit (Optional[int]): Max number of valid rows to keep. Use None for no limit.
+        snapshot_path (Optional[str]): Snapshot directory. Defaults to the CSV path plus ".snapshot".
+
+    Returns:
+        str: The snapshot directory.
+    """
+    if snapshot_path is None:
+        snapshot_path = default_snapshot_path(file_path)
+    max_valid = None if limit is None else max(0, int(limit))
+
+    if not is_snapshot_valid(snapshot_path, file_path, limit=max_valid):
+        try:
+            key = source_key(file_path)
+        except FileNotFoundError:
+            raise FileNotFoundError(f"CSV file not found at: {file_path}")
+        # Unlike the cached loader, a snapshot that cannot be written is an error here.
+        save_snapshot(load_tv_shows_from_tmdb_csv(file_path, limit=max_valid), snapshot_path, key, limit=max_valid)
+
+    return snapshot_path
+
+
+def load_tv_shows_into_sqlite(
+    file_path: str, database_path: str, limit: Optional[int] = None, batch_size: int = 10000
+) -> int:
+    """
+    Parse the TMDB CSV and store the shows in a SQLite database that ShowRecommender can open
+    with ShowRecommender(database=database_path). The shows are streamed in batches and each
+    batch is written with executemany(), all inside one transaction, so the whole load is a
+    single commit. Shows are added after any shows the database already has.
+
+    Args:
+        file_path (str): Path to the TMDB CSV dataset file.
+        database_path (str): SQLite database file (created if it does not exist).
+        limit (Optional[int]): Max number of valid rows to store. None stores the whole file.
+        batch_size (int): Number of shows written per executemany() call.
+
+    Returns:
+        int: The number of shows stored.
+    """
+    store = SQLiteShowStore(database_path)
+    stored = 0
+    try:
+        with store.transaction():
+            for batch in iter_tv_show_batches_from_tmdb_csv(file_path, batch_size, limit):
+                store.insert(batch)
+                stored += len(batch)
+        store.analyze()
+    finally:
+        store.close()
+    return stored
@@ -0,0 +1,446 @@
+"""
+EE551 – Engineering Programming: Python. Fall 2025.
+The dataset_snapshot module saves parsed TV show data in a compact binary
+snapshot so the TMDB CSV does not have to be parsed again on every start.
+
+A snapshot is a directory of NumPy .npy files (one per column) plus a
+meta.json file. The .npy files can be memory-mapped with numpy.load().
+"""
+
+# Snapshot layout (n = number of shows):
+#   ratings.npy         float64[n]
+#   episodes.npy        int64[n]
+#   years.npy           int64[n]      (MISSING_YEAR when the show has no year)
+#   languages.npy       int32[n]      codes into meta["languages"]
+#   vote_counts.npy     int64[n]      (MISSING_VOTES when the vote count is unknown)
+#   title_heap.npy      uint8[...]    every title, UTF-8 encoded, back to back
+#   title_offsets.npy   int64[n + 1]  title i is title_heap[offsets[i]:offsets[i + 1]]
+#   genre_codes.npy     int32[...]    codes into meta["genres"], grouped by show
+#   genre_offsets.npy   int64[n + 1]  genres of show i are genre_codes[offsets[i]:offsets[i + 1]]
+#   meta.json           format version, source file key, loader limit and vocabularies
+#
+# The source key (absolute path, size in bytes and mtime) is checked before a snapshot is
+# used, so editing or replacing the CSV automatically makes the old snapshot stale.
+
+import gc
+import json
+import os
+import shutil
+import sys
+from collections.abc import Sequence
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from .show_store import MISSING_YEAR
+from .tv_show import TVShow, _shared_genres
+
+SNAPSHOT_VERSION = 2
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# stored in vote_counts.npy for shows without a vote count
+MISSING_VOTES = -1
+
+COLUMN_NAMES = [
+    "ratings",
+    "episodes",
+    "years",
+    "languages",
+    "vote_counts",
+    "title_heap",
+    "title_offsets",
+    "genre_codes",
+    "genre_offsets",
+]
+
+
+def default_snapshot_path(source_path: str) -> str:
+    """
+    Return the snapshot directory used for a CSV file when no path is given.
+
+    Args:
+        source_path (str): Path to the source CSV file.
+
+    Returns:
+        str: The snapshot directory path (the CSV path plus ".snapshot").
+    """
+    return source_path + SNAPSHOT_SUFFIX
+
+
+def source_key(source_path: str) -> Dict[str, Any]:
+    """
+    Build the key that identifies one version of a source file.
+
+    Args:
+        source_path (str): Path to the source CSV file.
+
+    Returns:
+        Dict[str, Any]: The absolute path, size in bytes and modification time in nanoseconds.
+    """
+    stat = os.stat(source_path)
+    return {
+        "path": os.path.abspath(source_path),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def _offsets(lengths: List[int]) -> np.ndarray:
+    """
+    Turn a list of item lengths into an offsets array that starts at 0.
+
+    Args:
+        lengths (List[int]): Length of each item.
+
+    Returns:
+        np.ndarray: int64 array with len(lengths) + 1 entries.
+    """
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return offsets
+
+
+def save_snapshot(
+    shows: List[TVShow],
+    snapshot_path: str,
+    source: Dict[str, Any],
+    limit: Optional[int] = None,
+) -> None:
+    """
+    Write TV shows to a snapshot directory keyed on the source CSV file.
+
+    The snapshot is written to a temporary directory first and then moved into
+    place, so a crash while saving never leaves a half-written snapshot behind.
+
+    Args:
+        shows (List[TVShow]): The shows to save.
+        snapshot_path (str): Directory to write the snapshot to (replaced if it exists).
+        source (Dict[str, Any]): source_key() of the CSV, taken before it was parsed.
+        limit (Optional[int]): The loader limit that was used, stored so a snapshot
+            made with one limit is not reused for another.
+    """
+    language_codes: Dict[str, int] = {}
+    genre_codes: Dict[str, int] = {}
+
+    titles = [show.title.encode("utf-8") for show in shows]
+    languages = [language_codes.setdefault(show.language, len(language_codes)) for show in shows]
+    show_genres = [
+        [genre_codes.setdefault(genre, len(genre_codes)) for genre in show.genre] for show in shows
+    ]
+
+    columns = {
+        "ratings": np.array([show.avg_rating for show in shows], dtype=np.float64),
+        "episodes": np.array([show.num_episodes for show in shows], dtype=np.int64),
+        "years": np.array(
+            [MISSING_YEAR if show.year is None else show.year for show in shows], dtype=np.int64
+        ),
+        "languages": np.array(languages, dtype=np.int32),
+        "vote_counts": np.array(
+            [MISSING_VOTES if show.vote_count is None else show.vote_count for show in shows], dtype=np.int64
+        ),
+        "title_heap": np.frombuffer(b"".join(titles), dtype=np.uint8),
+        "title_offsets": _offsets([len(title) for title in titles]),
+        "genre_codes": np.array(
+            [code for codes in show_genres for code in codes], dtype=np.int32
+        ),
+        "genre_offsets": _offsets([len(codes) for codes in show_genres]),
+    }
+    meta = {
+        "version": SNAPSHOT_VERSION,
+        "source": source,
+        "limit": limit,
+        "count": len(shows),
+        "languages": list(language_codes),
+        "genres": list(genre_codes),
+    }
+
+    temp_path = snapshot_path + ".tmp"
+    shutil.rmtree(temp_path, ignore_errors=True)
+    os.makedirs(temp_path)
+    for name, column in columns.items():
+        np.save(os.path.join(temp_path, name + ".npy"), column)
+    # meta.json is written last, so a snapshot without it is never treated as valid
+    with open(os.path.join(temp_path, "meta.json"), "w", encoding="utf-8") as meta_file:
+        json.dump(meta, meta_file)
+
+    shutil.rmtree(snapshot_path, ignore_errors=True)
+    os.replace(temp_path, snapshot_path)
+
+
+def read_snapshot_meta(snapshot_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read the meta.json file of a snapshot.
+
+    Args:
+        snapshot_path (str): The snapshot directory.
+
+    Returns:
+        Optional[Dict[str, Any]]: The metadata, or None if the snapshot is missing or unreadable.
+    """
+    try:
+        with open(os.path.join(snapshot_path, "meta.json"), encoding="utf-8") as meta_file:
+            meta = json.load(meta_file)
+    except (OSError, ValueError):
+        return None
+    if meta.get("version") != SNAPSHOT_VERSION:
+        return None
+    return meta
+
+
+def is_snapshot_valid(snapshot_path: str, source_path: str, limit: Optional[int] = None) -> bool:
+    """
+    Check that a snapshot exists and was made from the current version of the source file.
+
+    Args:
+        snapshot_path (str): The snapshot directory.
+        source_path (str): Path to the source CSV file.
+        limit (Optional[int]): The loader limit the caller wants.
+
+    Returns:
+        bool: True if the snapshot can be used instead of parsing the CSV.
+    """
+    meta = read_snapshot_meta(snapshot_path)
+    if meta is None:
+        return False
+    try:
+        current_key = source_key(source_path)
+    except OSError:
+        return False
+    return meta["source"] == current_key and meta["limit"] == limit
+
+
+def load_snapshot_columns(snapshot_path: str, mmap_mode: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Load the raw column arrays of a snapshot.
+
+    Args:
+        snapshot_path (str): The snapshot directory.
+        mmap_mode (Optional[str]): Passed to numpy.load(); use "r" to memory-map the columns.
+
+    Returns:
+        Dict[str, Any]: One NumPy array per column name, plus the metadata under "meta".
+    """
+    meta = read_snapshot_meta(snapshot_path)
+    if meta is None:
+        raise ValueError(f"Not a valid snapshot: {snapshot_path}")
+    columns: Dict[str, Any] = {
+        name: np.load(os.path.join(snapshot_path, name + ".npy"), mmap_mode=mmap_mode)
+        for name in COLUMN_NAMES
+    }
+    columns["meta"] = meta
+    return columns
+
+
+def load_snapshot(snapshot_path: str) -> List[TVShow]:
+    """
+    Rebuild the list of TVShow objects stored in a snapshot.
+
+    Args:
+        snapshot_path (str): The snapshot directory.
+
+    Returns:
+        List[TVShow]: The shows, in the same order they were saved.
+    """
+    columns = load_snapshot_columns(snapshot_path)
+    meta = columns["meta"]
+
+    # convert every column to Python values in one step each
+    ratings = columns["ratings"].tolist()
+    episodes = columns["episodes"].tolist()
+    years = [None if year == MISSING_YEAR else year for year in columns["years"].tolist()]
+    language_names = meta["languages"]
+    languages = [language_names[code] for code in columns["languages"].tolist()]
+    vote_counts = [None if votes == MISSING_VOTES else votes for votes in columns["vote_counts"].tolist()]
+
+    title_heap = columns["title_heap"].tobytes()
+    title_offsets = columns["title_offsets"].tolist()
+
+    genre_names = meta["genres"]
+    genre_codes = [genre_names[code] for code in columns["genre_codes"].tolist()]
+    genre_offsets = columns["genre_offsets"].tolist()
+
+    shows = []
+    # building many objects at once triggers repeated full garbage collections that cannot
+    # free anything, so the collector is paused while the shows are created
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for i in range(meta["count"]):
+            shows.append(
+                TVShow(
+                    title=title_heap[title_offsets[i]:title_offsets[i + 1]].decode("utf-8"),
+                    genre=genre_codes[genre_offsets[i]:genre_offsets[i + 1]],
+                    num_episodes=episodes[i],
+                    avg_rating=ratings[i],
+                    language=languages[i],
+                    year=years[i],
+                    vote_count=vote_counts[i],
+                )
+            )
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return shows
+
+
+class LazyShowList(Sequence):
+    """
+    A list of TVShow objects backed by the memory-mapped columns of a snapshot.
+
+    A TVShow is only built when its row is read (for example because a query returns
+    it), and it is kept so the same object is returned next time. Titles are decoded
+    from the title heap and genres from the genre codes of that one row. Shows that are
+    appended later are stored as normal objects after the snapshot rows.
+    """
+
+    def __init__(self, snapshot_path: str):
+        """
+        Memory-map the columns of a snapshot.
+
+        Args:
+            snapshot_path (str): The snapshot directory.
+        """
+        self._columns = load_snapshot_columns(snapshot_path, mmap_mode="r")
+        meta = self._columns["meta"]
+        self._count: int = meta["count"]
+        # the vocabularies are small, so their strings are interned once up front
+        self._language_names = [sys.intern(name) for name in meta["languages"]]
+        self._genre_names: List[str] = meta["genres"]
+        self._genre_pairs: Dict[Tuple[int, ...], Any] = {}
+        self._built: List[Optional[TVShow]] = [None] * self._count
+        self._appended: List[TVShow] = []
+        # number of snapshot rows that have been turned into TVShow objects
+        self.materialized = 0
+
+    def __len__(self) -> int:
+        """Return the number of shows (snapshot rows plus appended shows)."""
+        return self._count + len(self._appended)
+
+    def __getitem__(self, index):
+        """Return the show at index (building it if needed), or a list for a slice."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("show index out of range")
+        if index >= self._count:
+            return self._appended[index - self._count]
+        show = self._built[index]
+        if show is None:
+            show = self._build(index)
+            self._built[index] = show
+            self.materialized += 1
+        return show
+
+    def __setitem__(self, index: int, show: TVShow) -> None:
+        """Put another show at index (used when a show is replaced). A snapshot row is not
+        changed; the new show is simply returned instead of building the row."""
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("show index out of range")
+        if index >= self._count:
+            self._appended[index - self._count] = show
+        else:
+            self._built[index] = show
+
+    def __delitem__(self, index) -> None:
+        """Remove shows from the end of the list. Only a slice that runs to the end (like
+        del shows[size:]) is supported, which is what a delete that moves the last shows into the
+        freed rows needs."""
+        if not isinstance(index, slice):
+            raise TypeError("Only a slice to the end of the list can be deleted.")
+        start, stop, step = index.indices(len(self))
+        if step != 1 or (stop != len(self) and start < stop):
+            raise TypeError("Only a slice to the end of the list can be deleted.")
+        if start >= self._count:
+            del self._appended[start - self._count:]
+            return
+        del self._built[start:]
+        self._appended = []
+        self._count = start
+
+    def __iter__(self) -> Iterator[TVShow]:
+        """Iterate over every show (this builds all of them)."""
+        for index in range(len(self)):
+            yield self[index]
+
+    def append(self, show: TVShow) -> None:
+        """Add one show after the existing ones."""
+        self._appended.append(show)
+
+    def extend(self, shows) -> None:
+        """Add several shows after the existing ones."""
+        self._appended.extend(shows)
+
+    def _genre_pair(self, codes: Tuple[int, ...]):
+        """Return the shared (genres, lowercase genres) pair for one row's genre codes."""
+        pair = self._genre_pairs.get(codes)
+        if pair is None:
+            pair = _shared_genres(tuple(self._genre_names[code] for code in codes))
+            self._genre_pairs[codes] = pair
+        return pair
+
+    def _build(self, index: int) -> TVShow:
+        """Build the TVShow for one snapshot row. The row was valid when it was saved, so the
+        TVShow checks are not run again."""
+        columns = self._columns
+        title_start, title_end = columns["title_offsets"][index:index + 2].tolist()
+        genre_start, genre_end = columns["genre_offsets"][index:index + 2].tolist()
+        year = int(columns["years"][index])
+        votes = int(columns["vote_counts"][index])
+        return TVShow._trusted(
+            columns["title_heap"][title_start:title_end].tobytes().decode("utf-8"),
+            self._genre_pair(tuple(columns["genre_codes"][genre_start:genre_end].tolist())),
+            int(columns["episodes"][index]),
+            float(columns["ratings"][index]),
+            self._language_names[columns["languages"][index]],
+            None if year == MISSING_YEAR else year,
+            None if votes == MISSING_VOTES else votes,
+        )
+
+    def iter_titles(self) -> Iterator[str]:
+        """
+        Iterate over every title without building TVShow objects.
+
+        Yields:
+            str: The title of each show, in order.
+        """
+        heap = self._columns["title_heap"].tobytes()
+        offsets = self._columns["title_offsets"].tolist()
+        for index in range(self._count):
+            show = self._built[index]
+            if show is not None:
+                # the row may hold a show that replaced the snapshot row
+                yield show.title
+            else:
+                yield heap[offsets[index]:offsets[index + 1]].decode("utf-8")
+        for show in self._appended:
+            yield show.title
+
+    def row_columns(self) -> Dict[str, Any]:
+        """
+        Return the snapshot rows as columns, in the format ShowRecommender uses to index many
+        shows at once, without building TVShow objects.
+
+        Returns:
+            Dict[str, Any]: ratings, episodes and years (MISSING_YEAR for none) as NumPy arrays,
+            plus year_values, languages and genres (one tuple per row) as lists.
+        """
+        columns = self._columns
+        years = np.asarray(columns["years"])
+        genre_codes = columns["genre_codes"].tolist()
+        genre_offsets = columns["genre_offsets"].tolist()
+        genres = [
+            self._genre_pair(tuple(genre_codes[genre_offsets[index]:genre_offsets[index + 1]]))[0]
+            for index in range(self._count)
+        ]
+        return {
+            "ratings": np.asarray(columns["ratings"]),
+            "episodes": np.asarray(columns["episodes"]),
+            "years": years,
+            "year_values": [None if year == MISSING_YEAR else year for year in years.tolist()],
+            "languages": [self._language_names[code] for code in columns["languages"].tolist()],
+            "genres": genres,
+        }
@@ -0,0 +1,213 @@
+"""EE551- Engineering Programming: Python. Fall 2025. Instrumentation module.
+This module is an opt-in profiler for the loaders in data_processor and the ShowRecommender
+methods. When it is turned on it records, per method, the number of calls, a latency histogram
+and how many rows were scanned and returned, and per loader how many rows were read, loaded and
+skipped (with the reason) and how fast. It is off by default; then an instrumented method only
+checks one flag before running, so it costs almost nothing.
+
+Example:
+    from src.instrumentation import PROFILER
+    PROFILER.enable()
+    ... load shows and run queries ...
+    print(PROFILER.report())
+    PROFILER.to_json("profile.json")
+"""
+
+import functools
+import json
+import threading
+import time
+from collections import Counter
+
+# upper bounds (in milliseconds) of the latency histogram buckets; slower calls go in a last bucket
+LATENCY_BUCKETS_MS = (0.01, 0.03, 0.1, 0.3, 1, 3, 10, 30, 100, 300, 1000, 3000)
+
+
+class _MethodStats:
+    """This class holds the numbers recorded for one method."""
+
+    def __init__(self):
+        """This starts every counter at zero."""
+        self.calls = 0
+        self.errors = 0
+        self.seconds = 0.0
+        self.max_seconds = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.rows_scanned = 0
+        self.rows_returned = 0
+
+    def add(self, seconds, returned, failed):
+        """This records one call that took seconds and returned the given number of rows."""
+        self.calls += 1
+        self.errors += failed
+        self.seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        milliseconds = seconds * 1000
+        bucket = 0
+        while bucket < len(LATENCY_BUCKETS_MS) and milliseconds > LATENCY_BUCKETS_MS[bucket]:
+            bucket += 1
+        self.histogram[bucket] += 1
+        if returned is not None:
+            self.rows_returned += returned
+
+    def to_dict(self):
+        """This returns the numbers as a JSON-able dictionary (times in milliseconds)."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": round(self.seconds * 1000, 3),
+            "mean_ms": round(self.seconds * 1000 / self.calls, 4) if self.calls else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "latency_histogram": {"buckets_ms": list(LATENCY_BUCKETS_MS), "counts": list(self.histogram)},
+            "rows_scanned": self.rows_scanned,
+            "rows_returned": self.rows_returned,
+        }
+
+
+class _LoaderStats:
+    """This class holds the numbers recorded for one loader."""
+
+    def __init__(self):
+        """This starts every counter at zero."""
+        self.runs = 0
+        self.seconds = 0.0
+        self.rows_read = 0
+        self.rows_loaded = 0
+        self.skipped = Counter()
+
+    def to_dict(self):
+        """This returns the numbers as a JSON-able dictionary."""
+        return {
+            "runs": self.runs,
+            "seconds": round(self.seconds, 4),
+            "rows_read": self.rows_read,
+            "rows_loaded": self.rows_loaded,
+            "rows_skipped": sum(self.skipped.values()),
+            "skip_reasons": dict(self.skipped.most_common()),
+            "rows_per_second": round(self.rows_read / self.seconds) if self.seconds else None,
+        }
+
+
+class Profiler:
+    """This class collects the method and loader numbers. Recording is thread-safe, so queries
+    running on the service's worker threads can be profiled too. Use the shared PROFILER instance.
+    """
+
+    def __init__(self):
+        """This makes a profiler that is turned off."""
+        self.enabled = False
+        self._lock = threading.Lock()
+        self.reset()
+
+    def enable(self):
+        """This turns recording on."""
+        self.enabled = True
+
+    def disable(self):
+        """This turns recording off. The numbers recorded so far are kept."""
+        self.enabled = False
+
+    def reset(self):
+        """This forgets everything recorded so far."""
+        with self._lock:
+            self._methods = {}
+            self._loaders = {}
+
+    def record_call(self, name, seconds, returned=None, failed=False):
+        """This records one call of the method name that took seconds and returned rows."""
+        with self._lock:
+            stats = self._methods.get(name)
+            if stats is None:
+                stats = self._methods[name] = _MethodStats()
+            stats.add(seconds, returned, failed)
+
+    def record_scan(self, name, rows):
+        """This adds rows to the number of rows the method name looked at."""
+        with self._lock:
+            stats = self._methods.get(name)
+            if stats is None:
+                stats = self._methods[name] = _MethodStats()
+            stats.rows_scanned += rows
+
+    def record_load(self, name, seconds, rows_read, rows_loaded, skipped=None):
+        """This records one run of the loader name. skipped maps a skip reason to a row count."""
+        with self._lock:
+            stats = self._loaders.get(name)
+            if stats is None:
+                stats = self._loaders[name] = _LoaderStats()
+            stats.runs += 1
+            stats.seconds += seconds
+            stats.rows_read += rows_read
+            stats.rows_loaded += rows_loaded
+            if skipped:
+                stats.skipped.update(skipped)
+
+    def snapshot(self):
+        """This returns everything recorded so far as a JSON-able dictionary with a "methods" and a
+        "loaders" part, each keyed by name.
+        """
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "methods": {name: stats.to_dict() for name, stats in sorted(self._methods.items())},
+                "loaders": {name: stats.to_dict() for name, stats in sorted(self._loaders.items())},
+            }
+
+    def to_json(self, path=None, indent=2):
+        """This returns the snapshot as a JSON string, and also writes it to path if one is given."""
+        text = json.dumps(self.snapshot(), indent=indent)
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as json_file:
+                json_file.write(text + "\n")
+        return text
+
+    def report(self):
+        """This returns the snapshot as readable text tables."""
+        snapshot = self.snapshot()
+        lines = []
+        if snapshot["loaders"]:
+            lines.append(f"{'loader':<48}{'rows read':>11}{'loaded':>10}{'skipped':>9}{'seconds':>9}{'rows/s':>10}")
+            for name, stats in snapshot["loaders"].items():
+                lines.append(
+                    f"{name:<48}{stats['rows_read']:>11}{stats['rows_loaded']:>10}"
+                    f"{stats['rows_skipped']:>9}{stats['seconds']:>9.3f}{stats['rows_per_second'] or 0:>10}"
+                )
+                for reason, count in stats["skip_reasons"].items():
+                    lines.append(f"    skipped {count} rows: {reason}")
+            lines.append("")
+        if snapshot["methods"]:
+            lines.append(f"{'method':<48}{'calls':>7}{'mean ms':>10}{'max ms':>10}{'scanned':>10}{'returned':>10}")
+            for name, stats in snapshot["methods"].items():
+                lines.append(
+                    f"{name:<48}{stats['calls']:>7}{stats['mean_ms']:>10.3f}{stats['max_ms']:>10.3f}"
+                    f"{stats['rows_scanned']:>10}{stats['rows_returned']:>10}"
+                )
+        return "\n".join(lines) if lines else "Nothing was recorded."
+
+
+# the profiler shared by the loaders and every ShowRecommender
+PROFILER = Profiler()
+
+
+def profiled(function):
+    """This decorator records the calls of a function or method in PROFILER (under its qualified
+    name, like "ShowRecommender.get_recommendations"). When the result is a list, its length is
+    counted as the rows returned. When profiling is off, the function runs directly.
+    """
+    name = function.__qualname__
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if not PROFILER.enabled:
+            return function(*args, **kwargs)
+        started = time.perf_counter()
+        try:
+            result = function(*args, **kwargs)
+        except BaseException:
+            PROFILER.record_call(name, time.perf_counter() - started, failed=True)
+            raise
+        returned = len(result) if isinstance(result, list) else None
+        PROFILER.record_call(name, time.perf_counter() - started, returned)
+        return result
+
+    return wrapper
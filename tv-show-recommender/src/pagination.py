@@ -0,0 +1,76 @@
+"""EE551- Engineering Programming: Python. Fall 2025. Pagination module.
+This module defines the Page class returned by ShowRecommender.get_page() and the opaque
+continuation tokens (cursors) that let a caller ask for the page after it. A cursor remembers
+the query it belongs to, the collection version and where the previous page stopped, so the next
+page starts there instead of skipping over every earlier match again.
+"""
+
+import base64
+import binascii
+import json
+
+# queries that can be paged: the name used by get_page() -> the filters its arguments fill in.
+# They page filter_by_genre(), filter_by_rating(), filter_by_episodes(), filter_by_language() and
+# search_by_title().
+PAGE_QUERIES = {
+    "genre": ("genre",),
+    "rating": ("min_rating",),
+    "episodes": ("min_episodes", "max_episodes"),
+    "language": ("language",),
+    "title": ("title",),
+}
+
+# orders a page can be in: the order of the list-returning method, or highest rating first
+# (ties in collection order, like get_recommendations())
+PAGE_ORDERS = ("collection", "rating")
+
+
+class Page:
+    """This class is one page of results: the shows on it, the cursor for the next page (None if
+    this is the last page) and the number of matches before the first show on it.
+    """
+
+    def __init__(self, shows, next_cursor, offset):
+        """This makes a page (see ShowRecommender.get_page())."""
+        self.shows = shows
+        self.next_cursor = next_cursor
+        self.offset = offset
+
+    def __len__(self):
+        """This returns the number of shows on the page."""
+        return len(self.shows)
+
+    def __iter__(self):
+        """This iterates over the shows on the page."""
+        return iter(self.shows)
+
+    def __repr__(self):
+        """This returns a string representation for debugging."""
+        return f"Page(shows={len(self.shows)}, offset={self.offset}, next_cursor={self.next_cursor!r})"
+
+
+def encode_cursor(query, args, order, version, offset, position):
+    """This packs where a page stopped into an opaque URL-safe string. position is the id to
+    continue from in collection order, or the [rating, id] of the last show in rating order.
+    """
+    state = [query, list(args), order, version, offset, position]
+    text = json.dumps(state, separators=(",", ":"))
+    return base64.urlsafe_b64encode(text.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, query, args, order, version):
+    """This unpacks a cursor made by encode_cursor() and returns (offset, position). A ValueError
+    is raised if the cursor is damaged, belongs to a different query or order, or the collection
+    has changed since it was made.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+        cursor_query, cursor_args, cursor_order, cursor_version, offset, position = state
+    except (AttributeError, UnicodeError, binascii.Error, TypeError, ValueError):
+        raise ValueError("Invalid cursor.") from None
+    if (cursor_query, cursor_args, cursor_order) != (query, list(args), order):
+        raise ValueError("The cursor belongs to a different query.")
+    if cursor_version != version:
+        raise ValueError("The collection has changed since the cursor was made.")
+    return offset, position
@@ -0,0 +1,67 @@
+"""EE551- Engineering Programming: Python. Fall 2025. Query cache module.
+This module defines the QueryCache class, a small least-recently-used (LRU) cache that
+ShowRecommender uses to remember the answers to repeated queries.
+"""
+
+from collections import OrderedDict
+
+
+class QueryCache:
+    """This class is a bounded LRU cache for query results. Every entry belongs to one version of
+    the show collection: when the recommender passes a newer version number (because shows were
+    added) all old entries are dropped, so a cached answer is never out of date. It counts hits
+    and misses so the cache can be checked from the notebook.
+    """
+
+    def __init__(self, maxsize=128):
+        """This makes an empty cache that holds at most maxsize results. A maxsize of 0 turns caching
+        off (every lookup is a miss and nothing is stored).
+        """
+        if maxsize < 0:
+            raise ValueError("maxsize cannot be a negative number.")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._version = None
+        self._entries = OrderedDict()
+
+    def __len__(self):
+        """This returns the number of cached results."""
+        return len(self._entries)
+
+    def clear(self):
+        """This removes every cached result (the hit and miss counters are kept)."""
+        self._entries.clear()
+
+    def get_or_compute(self, key, version, compute):
+        """This returns the cached result for key if it was stored for the same collection version.
+        Otherwise compute() is called, and its result is stored and returned. key must be hashable.
+        """
+        if version != self._version:
+            # the collection changed since these results were stored
+            self._entries.clear()
+            self._version = version
+
+        if key in self._entries:
+            self.hits += 1
+            # mark the entry as the most recently used one
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+        self.misses += 1
+        result = compute()
+        if self.maxsize > 0:
+            self._entries[key] = result
+            if len(self._entries) > self.maxsize:
+                # drop the least recently used entry
+                self._entries.popitem(last=False)
+        return result
+
+    def get_stats(self):
+        """This returns a dictionary with the hit and miss counters and the current size."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
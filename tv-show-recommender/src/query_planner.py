@@ -0,0 +1,371 @@
+"""EE551- Engineering Programming: Python. Fall 2025. Query planner module.
+This module decides in which order ShowRecommender.get_recommendations() applies its filters.
+Every filter (genre, language, minimum rating, episode range) gets an estimate of how many shows
+it keeps, taken from the running statistics and the range indexes. The planner starts from the
+cheapest way to get candidates and checks the remaining filters most selective first, in one
+pass with no list built between the steps.
+"""
+
+import heapq
+from itertools import islice
+from operator import attrgetter
+
+import numpy as np
+
+# relative cost of checking one show against a filter on the list backend (measured, with the
+# rating check as 1)
+CHECK_COSTS = {"rating": 1.0, "episodes": 1.5, "language": 1.3, "genre": 9.0}
+# relative cost of putting one show id in a set, and of looking one candidate id up in it
+ID_SET_BUILD_COST = 0.75
+ID_CHECK_COST = 0.6
+
+_by_rating = attrgetter("avg_rating")
+
+# on the column store, later filters only look at the shows that are left once fewer than
+# 1 / SUBSET_RATIO of all shows are; before that, a mask over every show is cheaper
+SUBSET_RATIO = 8
+
+
+class Predicate:
+    """This class is one filter of a query: its kind ("genre", "language", "rating" or
+    "episodes"), its arguments, the estimated number of shows that pass it and whether that
+    estimate is exact. The kind "order" is not a filter but a way to get candidates: every show,
+    best rated first.
+    """
+
+    def __init__(self, kind, arguments, estimate, exact):
+        """This makes a predicate. arguments is a tuple with the filter values."""
+        self.kind = kind
+        self.arguments = arguments
+        self.estimate = estimate
+        self.exact = exact
+        # True when the list backend checks candidate ids against a set of the matching ids
+        # instead of checking every candidate show
+        self.use_ids = False
+
+    def describe(self):
+        """This returns a short text like "language = 'de'" for explain()."""
+        if self.kind == "genre":
+            return f"genre contains {self.arguments[0]!r}"
+        if self.kind == "language":
+            return f"language = {self.arguments[0]!r}"
+        if self.kind == "rating":
+            return f"rating >= {self.arguments[0]}"
+        if self.kind == "order":
+            return "all shows, best rated first"
+        low, high = self.arguments
+        if low is None:
+            return f"episodes <= {high}"
+        if high is None:
+            return f"episodes >= {low}"
+        return f"{low} <= episodes <= {high}"
+
+
+class QueryPlan:
+    """This class is the plan for one query: the predicate whose index gives the candidate shows
+    (the driver, or None to start from every show), the remaining predicates in the order they
+    are checked, predicates that were dropped because every show passes them, and the limit.
+    After execution, rows holds the number of shows left after each step and scanned the number
+    of shows that were looked at (both only counted on the list backend when tracing).
+    """
+
+    def __init__(self, total, driver, checks, skipped, limit, columnar=False, empty=False, reads=None):
+        """This makes a plan (see QueryPlanner.plan()). reads is the expected number of candidates
+        read from the driver (less than its estimate when the scan can stop early).
+        """
+        self.total = total
+        self.reads = reads
+        self.columnar = columnar
+        self.driver = driver
+        self.checks = checks
+        self.skipped = skipped
+        self.limit = limit
+        # True when an exact estimate showed that no show can match
+        self.empty = empty
+        self.rows = []
+        self.scanned = 0
+
+    def steps(self):
+        """This returns the plan as a list of step descriptions with their estimated row counts."""
+        if self.empty:
+            return [("no show can match", 0)]
+        if self.driver is None:
+            steps = [("scan all shows", self.total)]
+        elif self.columnar:
+            steps = [(f"mask all shows: {self.driver.describe()}", self.driver.estimate)]
+        else:
+            reads = self.driver.estimate if self.reads is None else round(self.reads)
+            steps = [(f"index lookup: {self.driver.describe()}", reads)]
+        remaining = steps[0][1]
+        for predicate in self.checks:
+            # estimates of later steps assume the filters are independent
+            remaining = remaining * predicate.estimate / max(1, self.total)
+            method = " (id set)" if predicate.use_ids else ""
+            steps.append((f"check {predicate.describe()}{method}", round(remaining)))
+        return steps
+
+
+class QueryPlanner:
+    """This class plans and runs get_recommendations() queries for one ShowRecommender."""
+
+    def __init__(self, recommender):
+        """This makes a planner that reads the recommender's statistics and indexes."""
+        self.recommender = recommender
+
+    def _predicates(self, genre, min_rating, min_episodes, max_episodes, language):
+        """This makes a Predicate for every filter that is set."""
+        recommender = self.recommender
+        stats = recommender._stats
+        predicates = []
+        if genre:
+            target = genre.lower()
+            # shows with several matching genres are counted more than once, so this is an upper bound
+            estimate = sum(
+                count for name, count in stats.genre_counts.items()
+                if isinstance(name, str) and target in name.lower()
+            )
+            predicates.append(Predicate("genre", (genre,), min(estimate, stats.count), exact=False))
+        if language:
+            estimate = stats.language_counts.get(language.lower(), 0)
+            predicates.append(Predicate("language", (language,), estimate, exact=True))
+        if min_rating is not None:
+            estimate = recommender._rating_order.count_between(high=-min_rating)
+            predicates.append(Predicate("rating", (min_rating,), estimate, exact=True))
+        if min_episodes is not None or max_episodes is not None:
+            estimate = recommender._episode_index.count_between(min_episodes, max_episodes)
+            predicates.append(Predicate("episodes", (min_episodes, max_episodes), estimate, exact=True))
+        return predicates
+
+    def plan(self, genre=None, min_rating=None, min_episodes=None, max_episodes=None, language=None, limit=10):
+        """This chooses the plan for a query. Filters that every show passes are dropped. The driver
+        is the filter whose index returns the fewest candidates; on the list backend a rating driver
+        (or, without a minimum rating, the rating order of all shows) already returns the best shows
+        first, so it only needs to read about limit / (share of shows passing the other filters)
+        entries. The other filters are checked in
+        order of cost per show removed (on the column store every check costs about the same, so
+        that is simply the most selective first). On the list backend a genre or language check can
+        also be done with a set of the matching ids, which costs one set entry per matching show but
+        is much cheaper per candidate; it is used when that is cheaper for the expected number of
+        candidates, and those checks run first because they work on ids before shows are looked up.
+        """
+        total = len(self.recommender.shows)
+        columnar = self.recommender._store is not None
+        predicates = self._predicates(genre, min_rating, min_episodes, max_episodes, language)
+        skipped = [p for p in predicates if p.exact and p.estimate >= total]
+        predicates = [p for p in predicates if p not in skipped]
+        if any(p.exact and p.estimate == 0 for p in predicates):
+            return QueryPlan(total, None, [], skipped, limit, columnar=columnar, empty=True)
+
+        def selectivity(predicate):
+            return predicate.estimate / max(1, total)
+
+        drivers = list(predicates)
+        if not columnar and min_rating is None and predicates:
+            drivers.append(Predicate("order", (), total, exact=True))
+
+        def driver_cost(predicate):
+            if columnar or predicate.kind not in ("rating", "order") or limit is None or limit < 0:
+                return predicate.estimate
+            others = 1.0
+            for other in predicates:
+                if other is not predicate:
+                    others *= selectivity(other)
+            return min(predicate.estimate, limit / max(others, 1.0 / max(1, total)))
+
+        # min() keeps the first of equal costs, so the rating order is only used when it is cheaper
+        driver = min(drivers, key=driver_cost, default=None)
+        if driver is not None and driver_cost(driver) >= total and not columnar:
+            driver = None
+
+        def rank(predicate):
+            passing = selectivity(predicate)
+            cost = 1.0 if columnar else CHECK_COSTS[predicate.kind]
+            return cost / max(1e-9, 1.0 - passing)
+
+        checks = sorted((p for p in predicates if p is not driver), key=rank)
+        if not columnar:
+            reads = total if driver is None else driver_cost(driver)
+            for predicate in checks:
+                if predicate.kind in ("genre", "language"):
+                    set_cost = ID_SET_BUILD_COST * predicate.estimate + ID_CHECK_COST * reads
+                    predicate.use_ids = set_cost < CHECK_COSTS[predicate.kind] * reads
+            # sorted() is stable, so the id checks keep their order by rank
+            checks.sort(key=lambda predicate: not predicate.use_ids)
+        reads = None if driver is None else driver_cost(driver)
+        return QueryPlan(total, driver, checks, skipped, limit, columnar=columnar, reads=reads)
+
+    # -- list backend ------------------------------------------------------------------------
+
+    def _show_check(self, predicate):
+        """This returns a function that checks one TVShow against the predicate."""
+        if predicate.kind == "genre":
+            genre = predicate.arguments[0]
+            return lambda show: show.matches_genre(genre)
+        if predicate.kind == "language":
+            target = predicate.arguments[0].lower()
+            return lambda show: show.lowercase_language == target
+        if predicate.kind == "rating":
+            min_rating = predicate.arguments[0]
+            return lambda show: show.avg_rating >= min_rating
+        low, high = predicate.arguments
+        if low is None:
+            return lambda show: show.num_episodes <= high
+        if high is None:
+            return lambda show: show.num_episodes >= low
+        return lambda show: low <= show.num_episodes <= high
+
+    def _id_set(self, predicate):
+        """This returns the set of ids of the shows that pass a genre or language predicate."""
+        recommender = self.recommender
+        if predicate.kind == "language":
+            return set(recommender._language_index.get(predicate.arguments[0].lower()))
+        target = predicate.arguments[0].lower()
+        index = recommender._genre_index
+        return set().union(*(index.get(key) for key in index.keys() if target in key))
+
+    def _driver_ids(self, driver):
+        """This returns the candidate ids of the driver: in rating order for a rating or order driver
+        and in collection order otherwise.
+        """
+        recommender = self.recommender
+        if driver is None:
+            return range(len(recommender.shows))
+        if driver.kind == "genre":
+            return recommender._genre_ids(driver.arguments[0])
+        if driver.kind == "language":
+            return recommender._language_index.get(driver.arguments[0].lower())
+        if driver.kind == "rating":
+            return recommender._rating_order.iter_between(high=-driver.arguments[0])
+        if driver.kind == "order":
+            return recommender._rating_order.iter_between()
+        return sorted(recommender._episode_index.ids_between(*driver.arguments))
+
+    def _execute_shows(self, plan, trace):
+        """This runs a plan on the list backend and returns the TVShow objects, best first."""
+        shows = self.recommender.shows
+        candidate_ids = self._driver_ids(plan.driver)
+        counters = []
+        if trace:
+            candidate_ids, counter = _counted(candidate_ids)
+            counters.append(counter)
+        # chained filter() calls check every candidate against all filters in one pass; the id
+        # checks come first in plan.checks, so they run before the shows are looked up
+        for predicate in plan.checks:
+            if not predicate.use_ids:
+                break
+            candidate_ids = filter(self._id_set(predicate).__contains__, candidate_ids)
+            if trace:
+                candidate_ids, counter = _counted(candidate_ids)
+                counters.append(counter)
+        candidates = map(shows.__getitem__, candidate_ids)
+        for predicate in plan.checks:
+            if predicate.use_ids:
+                continue
+            candidates = filter(self._show_check(predicate), candidates)
+            if trace:
+                candidates, counter = _counted(candidates)
+                counters.append(counter)
+
+        limit = plan.limit
+        if plan.driver is not None and plan.driver.kind in ("rating", "order"):
+            # the candidates come best first, so the first matches are the answer
+            if limit is None or limit < 0:
+                result = list(candidates)[:limit]
+            else:
+                result = list(islice(candidates, limit))
+        elif limit is None or limit < 0:
+            result = sorted(candidates, key=_by_rating, reverse=True)[:limit]
+        else:
+            # candidates are in collection order, so nlargest keeps ties in collection order
+            result = heapq.nlargest(limit, candidates, key=_by_rating)
+        plan.rows = [counter[0] for counter in counters]
+        plan.scanned = plan.rows[0] if trace else 0
+        return result
+
+    # -- columnar backend --------------------------------------------------------------------
+
+    def _mask(self, predicate, ids):
+        """This returns the store mask of the predicate for the shows in ids (all shows when None)."""
+        store = self.recommender._store
+        if predicate.kind == "genre":
+            return store.genre_mask(predicate.arguments[0], ids=ids)
+        if predicate.kind == "language":
+            return store.language_mask(predicate.arguments[0], ids=ids)
+        if predicate.kind == "rating":
+            return store.rating_mask(predicate.arguments[0], ids=ids)
+        return store.episode_mask(*predicate.arguments, ids=ids)
+
+    def _execute_columnar(self, plan):
+        """This runs a plan on the column store. The masks of the first filters are combined with &
+        over every show; once few shows are left, each later filter only looks at those shows.
+        """
+        store = self.recommender._store
+        predicates = ([plan.driver] if plan.driver is not None else []) + plan.checks
+        mask = None
+        ids = None
+        plan.rows = []
+        for predicate in predicates:
+            if ids is None:
+                if mask is None:
+                    mask = self._mask(predicate, None)
+                else:
+                    mask &= self._mask(predicate, None)
+                left = int(np.count_nonzero(mask))
+                if left * SUBSET_RATIO < plan.total:
+                    ids = mask.nonzero()[0]
+            else:
+                ids = ids[self._mask(predicate, ids)]
+                left = len(ids)
+            plan.rows.append(left)
+        if ids is None:
+            ids = np.arange(len(store)) if mask is None else mask.nonzero()[0]
+            if mask is None:
+                plan.rows.append(len(ids))
+        # every mask over all shows looks at each show once
+        plan.scanned = plan.total
+        return self.recommender._shows_from_ids(store.top_k(ids, plan.limit))
+
+    def execute(self, plan, trace=False):
+        """This runs a plan and returns the recommended TVShow objects, best first. With trace=True
+        the number of shows left after each step is counted in plan.rows (the list backend only
+        counts shows it actually read, so a rating driver that stopped early shows fewer rows).
+        """
+        if plan.empty:
+            plan.rows = [0]
+            plan.scanned = 0
+            return []
+        if plan.columnar:
+            return self._execute_columnar(plan)
+        return self._execute_shows(plan, trace)
+
+    def explain(self, genre=None, min_rating=None, min_episodes=None, max_episodes=None, language=None, limit=10):
+        """This plans and runs a query and returns a dictionary that describes what was done: the
+        backend, every step with its estimated and actual number of shows, the filters that were
+        dropped and how many shows were returned.
+        """
+        plan = self.plan(genre, min_rating, min_episodes, max_episodes, language, limit)
+        result = self.execute(plan, trace=True)
+        return {
+            "backend": "columnar" if plan.columnar else "list",
+            "total_shows": plan.total,
+            "steps": [
+                {"step": description, "estimated_rows": estimate, "rows": rows}
+                for (description, estimate), rows in zip(plan.steps(), plan.rows)
+            ],
+            "skipped": [predicate.describe() for predicate in plan.skipped],
+            "returned": len(result),
+        }
+
+
+def _counted(iterable):
+    """This wraps an iterable so the items that pass through it are counted. It returns the new
+    iterator and a one-item list that holds the count.
+    """
+    counter = [0]
+
+    def counting():
+        for item in iterable:
+            counter[0] += 1
+            yield item
+
+    return counting(), counter
@@ -0,0 +1,222 @@
+"""EE551- Engineering Programming: Python. Fall 2025. Running statistics module.
+This module defines the RunningStats class. ShowRecommender updates it every time a show is
+added, so collection statistics are available in O(1) instead of rescanning every show.
+"""
+
+from collections import Counter
+
+import numpy as np
+
+# width of one rating histogram bucket (the notebook plots ratings in half-point steps)
+RATING_BUCKET_WIDTH = 0.5
+RATING_BUCKETS = int(10 / RATING_BUCKET_WIDTH)
+
+# rating sums are kept as whole numbers of 1/RATING_SCALE points: integer sums are exact, so
+# adding and removing shows in any order gives the same totals as adding the shows left once.
+# The scale is a power of two, so scaling a rating only moves its binary point: every rating
+# of at least 1/128 (and 0) becomes a whole number without rounding, and 10 * RATING_SCALE
+# still fits in an int64 for the NumPy sums of add_columns().
+RATING_SCALE = 2 ** 59
+
+# add_columns() sums the high and low bits of the scaled ratings apart, so the int64 sums
+# cannot overflow for fewer than 2 ** 31 shows
+_LOW_BITS = 32
+
+
+def _scaled(rating):
+    """This returns a rating as a whole number of 1/RATING_SCALE points."""
+    return int(rating * RATING_SCALE)
+
+
+def _group_sums(rows, groups, scaled):
+    """This returns the exact sum of the scaled ratings of every group (rows gives the group of
+    each rating) as a list of Python ints.
+    """
+    high = np.zeros(groups, dtype=np.int64)
+    low = np.zeros(groups, dtype=np.int64)
+    np.add.at(high, rows, scaled >> _LOW_BITS)
+    np.add.at(low, rows, scaled & ((1 << _LOW_BITS) - 1))
+    return [(h << _LOW_BITS) + l for h, l in zip(high.tolist(), low.tolist())]
+
+
+class RunningStats:
+    """This class keeps running totals for a collection of shows: the number of shows, the sum of
+    ratings and episodes, how many shows (and how much rating) each genre and language has, a
+    rating histogram and the number of shows per year.
+    """
+
+    def __init__(self):
+        """This makes empty statistics."""
+        self.count = 0
+        # sum of the ratings, in 1/RATING_SCALE points like the per-genre and per-language sums
+        self.rating_sum = 0
+        self.episode_total = 0
+        # genre -> number of shows with it, and the sum of their ratings
+        self.genre_counts = Counter()
+        self.genre_rating_sums = Counter()
+        # lowercase language -> number of shows, and the sum of their ratings
+        self.language_counts = Counter()
+        self.language_rating_sums = Counter()
+        # year -> number of shows (shows without a year are counted under None)
+        self.year_counts = Counter()
+        # rating_histogram[i] counts ratings in [i * width, (i + 1) * width); 10 goes in the last one
+        self.rating_histogram = [0] * RATING_BUCKETS
+
+    @staticmethod
+    def _bucket(rating):
+        """This returns the histogram bucket of a rating."""
+        return min(int(rating / RATING_BUCKET_WIDTH), RATING_BUCKETS - 1)
+
+    def add(self, show):
+        """This adds one show to every running total."""
+        rating = _scaled(show.avg_rating)
+        self.count += 1
+        self.rating_sum += rating
+        self.episode_total += show.num_episodes
+        # a show that lists the same genre twice still counts once for it
+        for genre in set(show.genre):
+            self.genre_counts[genre] += 1
+            self.genre_rating_sums[genre] += rating
+        language = show.lowercase_language
+        self.language_counts[language] += 1
+        self.language_rating_sums[language] += rating
+        self.year_counts[show.year] += 1
+        self.rating_histogram[self._bucket(show.avg_rating)] += 1
+
+    def remove(self, show):
+        """This takes one show that was added before out of every running total. Genres, languages
+        and years that no show has any more are dropped.
+        """
+        rating = _scaled(show.avg_rating)
+        self.count -= 1
+        self.rating_sum -= rating
+        self.episode_total -= show.num_episodes
+        for genre in set(show.genre):
+            self._decrement(self.genre_counts, self.genre_rating_sums, genre, rating)
+        language = show.lowercase_language
+        self._decrement(self.language_counts, self.language_rating_sums, language, rating)
+        self.year_counts[show.year] -= 1
+        if self.year_counts[show.year] == 0:
+            del self.year_counts[show.year]
+        self.rating_histogram[self._bucket(show.avg_rating)] -= 1
+
+    @staticmethod
+    def _decrement(counts, rating_sums, key, rating):
+        """This takes one show with the (scaled) rating away from a key of a count and rating sum
+        counter.
+        """
+        counts[key] -= 1
+        rating_sums[key] -= rating
+        if counts[key] == 0:
+            del counts[key]
+            del rating_sums[key]
+
+    def add_columns(self, ratings, episodes, years, languages, genres):
+        """This adds many shows given as columns: NumPy arrays of ratings and episode counts, a list
+        of years (None when missing), a list of languages and a list of genre tuples. The counts
+        are added up per distinct value with NumPy instead of one show at a time.
+        """
+        count = len(ratings)
+        if count == 0:
+            return
+        self.count += count
+        # astype() truncates like int(), so every rating is scaled as add() scales it
+        scaled = (np.asarray(ratings, dtype=np.float64) * RATING_SCALE).astype(np.int64)
+        self.episode_total += int(episodes.sum())
+
+        # count and rating sum for every distinct genre tuple, then for the genres in it
+        tuple_ids = {}
+        rows = np.array([tuple_ids.setdefault(genre_tuple, len(tuple_ids)) for genre_tuple in genres])
+        counts = np.bincount(rows, minlength=len(tuple_ids)).tolist()
+        sums = _group_sums(rows, len(tuple_ids), scaled)
+        for genre_tuple, tuple_count, tuple_sum in zip(tuple_ids, counts, sums):
+            for genre in set(genre_tuple):
+                self.genre_counts[genre] += tuple_count
+                self.genre_rating_sums[genre] += tuple_sum
+
+        # same for the languages; spellings like "EN" and "en" add up under the lowercase one
+        language_ids = {}
+        rows = np.array([language_ids.setdefault(language, len(language_ids)) for language in languages])
+        counts = np.bincount(rows, minlength=len(language_ids)).tolist()
+        sums = _group_sums(rows, len(language_ids), scaled)
+        for language, language_count, language_sum in zip(language_ids, counts, sums):
+            self.language_counts[language.lower()] += language_count
+            self.language_rating_sums[language.lower()] += language_sum
+        # every show has one language, so the language sums add up to the sum of all ratings
+        self.rating_sum += sum(sums)
+
+        self.year_counts.update(years)
+        buckets = np.minimum((ratings / RATING_BUCKET_WIDTH).astype(np.int64), RATING_BUCKETS - 1)
+        for bucket, bucket_count in enumerate(np.bincount(buckets, minlength=RATING_BUCKETS).tolist()):
+            self.rating_histogram[bucket] += bucket_count
+
+    def merge(self, other):
+        """This adds the totals of another RunningStats (for example of another shard of the same
+        collection) to these ones. Every total is a count or a sum, so merging the parts gives the
+        totals of the whole collection.
+        """
+        self.count += other.count
+        self.rating_sum += other.rating_sum
+        self.episode_total += other.episode_total
+        self.genre_counts.update(other.genre_counts)
+        self.genre_rating_sums.update(other.genre_rating_sums)
+        self.language_counts.update(other.language_counts)
+        self.language_rating_sums.update(other.language_rating_sums)
+        self.year_counts.update(other.year_counts)
+        self.rating_histogram = [
+            mine + theirs for mine, theirs in zip(self.rating_histogram, other.rating_histogram)
+        ]
+
+    def average_rating(self):
+        """This returns the average rating of all shows (0 when there are none)."""
+        return self.rating_sum / (self.count * RATING_SCALE) if self.count else 0
+
+    def summary(self):
+        """This returns the get_statistic() dictionary: the number of shows, the average rating
+        (rounded to 2 places), the total number of episodes and the number of distinct genres.
+        """
+        # handles edge case of empty collection
+        if not self.count:
+            # returns 0s for empty collections
+            return {"total_shows": 0, "avg_rating": 0, "total_episodes": 0, "total_genres": 0}
+        return {
+            "total_shows": self.count,
+            "avg_rating": round(self.average_rating(), 2),
+            "total_episodes": self.episode_total,
+            "total_genres": len(self.genre_counts),
+        }
+
+    def _breakdown(self, counts, rating_sums):
+        """This turns a count and rating sum counter into {key: {"count", "avg_rating"}}, most
+        common first and ties by name. The order does not depend on the order the keys were first
+        counted in, which changes when shows are removed and added back.
+        """
+        # str() also orders genres that are not strings, such as None
+        ordered = sorted(counts.items(), key=lambda item: (-item[1], str(item[0])))
+        return {
+            key: {"count": count, "avg_rating": round(rating_sums[key] / (count * RATING_SCALE), 2)}
+            for key, count in ordered
+        }
+
+    def genre_breakdown(self):
+        """This returns the number of shows and average rating per genre, most common first (ties
+        by name).
+        """
+        return self._breakdown(self.genre_counts, self.genre_rating_sums)
+
+    def language_breakdown(self):
+        """This returns the number of shows and average rating per language, most common first
+        (ties by name).
+        """
+        return self._breakdown(self.language_counts, self.language_rating_sums)
+
+    def histogram(self):
+        """This returns (bucket_edges, counts) for the rating histogram. There is one more edge
+        than there are counts, like numpy.histogram().
+        """
+        edges = [i * RATING_BUCKET_WIDTH for i in range(RATING_BUCKETS + 1)]
+        return edges, list(self.rating_histogram)
+
+    def years(self):
+        """This returns the number of shows per year, sorted by year (shows without a year are left out)."""
+        return {year: self.year_counts[year] for year in sorted(y for y in self.year_counts if y is not None)}
@@ -0,0 +1,132 @@
+"""EE551- Engineering Programming: Python. Fall 2025. Scoring module.
+This module defines ScoringModel, the pluggable ranking used by
+ShowRecommender.get_recommendations(scoring=...). A model blends per-show features with
+configurable weights: a Bayesian rating that pulls ratings with few votes towards the typical
+rating, the raw rating, popularity (vote count), recency, episode count and genre match. The
+features are read from the precomputed arrays of the SimilarityEngine, so every show that passes
+the filters is scored in one vectorized pass and only the best k are sorted.
+"""
+
+import math
+
+import numpy as np
+
+# features a ScoringModel can weight; every feature is scaled to 0-1
+FEATURES = ("bayesian_rating", "rating", "votes", "recency", "episodes", "genre_match")
+
+# weights used when a model is made without any: rank by the vote-aware rating only
+DEFAULT_WEIGHTS = {"bayesian_rating": 1.0}
+
+
+def top_k(ids, scores, k):
+    """This returns the ids with the k highest scores, best first (all of them when k is None; a
+    negative k drops ids from the end like list slicing). ids must be sorted, so ties are in
+    collection order. np.argpartition finds the k-th best score in O(n), then only the ids at or
+    above it are sorted.
+    """
+    if k is not None and 0 <= k < len(ids):
+        if k == 0:
+            return ids[:0]
+        cutoff = scores[np.argpartition(-scores, k - 1)[k - 1]]
+        keep = scores >= cutoff
+        ids, scores = ids[keep], scores[keep]
+    return ids[np.lexsort((ids, -scores))][:k]
+
+
+class ScoringModel:
+    """This class ranks shows by a weighted sum of features (see FEATURES):
+
+    - bayesian_rating: (votes * rating + m * C) / (votes + m) / 10, where C is the mean rating of
+      the shows that have votes and m is the vote count 90% of them stay below, as in the IMDb
+      Top 250 formula (prior_rating and prior_votes override them). A 10.0 from 3 votes ends up
+      close to C, a rating from thousands of votes stays where it is. Shows without a known vote
+      count get C.
+    - rating: the raw rating / 10.
+    - votes: log(1 + votes) scaled so the most voted show has 1 (0 when unknown).
+    - recency: 0 for the first year in the collection up to 1 for the last (0 without a year).
+    - episodes: log(1 + episodes) scaled so the longest show has 1.
+    - genre_match: the share of the model's genres the show has (same rule as matches_genre()).
+
+    Subclasses can plug in other formulas by overriding feature() or scores() (and key(), so the
+    query cache can tell the models apart).
+    """
+
+    def __init__(self, weights=None, prior_votes=None, prior_rating=None, genres=()):
+        """This makes a model. weights maps feature names to weights (DEFAULT_WEIGHTS when None).
+        A ValueError is raised for an unknown feature, a weight that is not a finite number, a
+        prior_votes that is not positive, or a genre_match weight without genres.
+        """
+        weights = DEFAULT_WEIGHTS if weights is None else weights
+        unknown = set(weights) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"Unknown scoring features: {sorted(unknown)}")
+        if not all(isinstance(weight, (int, float)) and math.isfinite(weight) for weight in weights.values()):
+            raise ValueError("Scoring weights must be finite numbers.")
+        if prior_votes is not None and prior_votes <= 0:
+            raise ValueError("prior_votes must be positive.")
+        # features with weight 0 are not computed at all
+        self.weights = {name: float(weight) for name, weight in weights.items() if weight}
+        self.prior_votes = prior_votes
+        self.prior_rating = prior_rating
+        self.genres = tuple(genres)
+        if "genre_match" in self.weights and not self.genres:
+            raise ValueError("The genre_match feature needs genres.")
+
+    def __repr__(self):
+        """This returns a string representation for debugging."""
+        return (
+            f"ScoringModel(weights={self.weights}, prior_votes={self.prior_votes}, "
+            f"prior_rating={self.prior_rating}, genres={list(self.genres)})"
+        )
+
+    def key(self):
+        """This returns a hashable key for the query cache. Models with the same key must rank
+        shows the same way.
+        """
+        return (
+            type(self).__name__,
+            tuple(sorted(self.weights.items())),
+            self.prior_votes,
+            self.prior_rating,
+            tuple(genre.lower() for genre in self.genres),
+        )
+
+    def feature(self, name, features, ids):
+        """This returns one feature (0 to 1) for the shows in ids. features is the SimilarityEngine
+        that holds the arrays of every show.
+        """
+        summary = features.summary()
+        if name == "rating":
+            return features.ratings[ids] / 10
+        if name == "bayesian_rating":
+            votes = np.nan_to_num(features.votes[ids], nan=0.0)
+            prior_votes = summary["votes_p90"] if self.prior_votes is None else self.prior_votes
+            prior_rating = summary["mean_rating"] if self.prior_rating is None else self.prior_rating
+            shrunk = (votes * features.ratings[ids] + prior_votes * prior_rating) / (votes + prior_votes)
+            return shrunk / 10
+        if name == "votes":
+            if not summary["max_log_votes"]:
+                return np.zeros(len(ids))
+            return np.nan_to_num(np.log1p(features.votes[ids]), nan=0.0) / summary["max_log_votes"]
+        if name == "recency":
+            if summary["first_year"] is None:
+                return np.zeros(len(ids))
+            span = (summary["last_year"] - summary["first_year"]) or 1.0
+            return np.nan_to_num((features.years[ids] - summary["first_year"]) / span, nan=0.0)
+        if name == "episodes":
+            return features.log_episodes[ids] / (summary["max_log_episodes"] or 1.0)
+        if name == "genre_match":
+            matches = np.zeros(len(ids))
+            for genre in self.genres:
+                matches += features.genre_matches(genre, ids)
+            return matches / len(self.genres)
+        raise ValueError(f"Unknown scoring feature: {name}")
+
+    def scores(self, features, ids):
+        """This returns the score of every show in ids (a NumPy array of show ids), computed with
+        whole-array operations: the weighted sum of the features.
+        """
+        score = np.zeros(len(ids))
+        for name, weight in self.weights.items():
+            score += weight * self.feature(name, features, ids)
+        return score
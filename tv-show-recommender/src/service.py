@@ -0,0 +1,304 @@
+"""EE551- Engineering Programming: Python. Fall 2025. Recommendation service module.
+This module serves a ShowRecommender over a small local HTTP/JSON API so a frontend can use it.
+It only needs the standard library: asyncio handles the connections, the queries run in a
+thread pool so the event loop stays responsive, and identical requests that arrive while the
+same query is still running share its result instead of computing it again.
+
+Example:
+    python -m src.service --csv "C:\\path\\to\\TMDB_tv_dataset_v3.csv" --port 8551
+    curl "http://127.0.0.1:8551/recommendations?genre=drama&min_rating=8&limit=5"
+"""
+
+import argparse
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlsplit
+
+from src.data_processor import build_tmdb_snapshot, load_tv_shows_from_tmdb_csv_cached
+from src.sharding import ShardedShowRecommender
+from src.show_recommender import ShowRecommender
+
+# largest limit a request can ask for, so one request cannot ask for the whole dataset
+MAX_LIMIT = 1000
+
+# HTTP reason phrases for the status codes the service sends
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}
+
+
+class RequestError(ValueError):
+    """This error is raised for a request with a missing or invalid query parameter. It becomes
+    a 400 response with the message in the JSON body.
+    """
+
+
+def _text(params, name):
+    """This returns a text query parameter, or None when it is missing or empty."""
+    value = params.get(name, [""])[-1].strip()
+    return value or None
+
+
+def _number(params, name, kind, default=None, minimum=0, maximum=None):
+    """This returns a numeric query parameter converted with kind (int or float). A RequestError
+    is raised if it cannot be converted or is outside minimum..maximum.
+    """
+    value = _text(params, name)
+    if value is None:
+        return default
+    try:
+        number = kind(value)
+    except ValueError:
+        raise RequestError(f"{name} must be a number.")
+    if number < minimum:
+        raise RequestError(f"{name} must be at least {minimum}.")
+    if maximum is not None and number > maximum:
+        raise RequestError(f"{name} must be at most {maximum}.")
+    return number
+
+
+class RecommendationService:
+    """This class answers HTTP requests with one ShowRecommender. It has these GET routes (all
+    answers are JSON):
+
+        /recommendations?genre=&min_rating=&min_episodes=&max_episodes=&language=&limit=10
+        /search?q=&limit=50
+        /top?n=10
+        /stats
+
+    Shows are returned as TVShow.get_info_dict() dictionaries. The recommender is not thread-safe,
+    so by default the queries run on a single worker thread; concurrent identical requests are
+    coalesced into one computation.
+    """
+
+    def __init__(self, recommender, workers=1):
+        """This makes a service for the recommender. workers is the number of query threads."""
+        self.recommender = recommender
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="recommender")
+        # (route, arguments) -> future of the response body that is being computed
+        self._in_flight = {}
+        self._server = None
+        self.requests = 0
+        self.computed = 0
+        self.coalesced = 0
+
+    def _parse(self, path, params):
+        """This turns a route and its query parameters into (handler, arguments). The arguments are
+        normalized so requests that mean the same query get the same key.
+        """
+        if path == "/recommendations":
+            genre = _text(params, "genre")
+            language = _text(params, "language")
+            return self._recommendations, (
+                genre.lower() if genre else None,
+                _number(params, "min_rating", float, maximum=10),
+                _number(params, "min_episodes", int),
+                _number(params, "max_episodes", int),
+                language.lower() if language else None,
+                _number(params, "limit", int, default=10, maximum=MAX_LIMIT),
+            )
+        if path == "/search":
+            term = _text(params, "q")
+            if term is None:
+                raise RequestError("q is required.")
+            return self._search, (term.lower(), _number(params, "limit", int, default=50, maximum=MAX_LIMIT))
+        if path == "/top":
+            return self._top, (_number(params, "n", int, default=10, maximum=MAX_LIMIT),)
+        if path == "/stats":
+            return self._stats, ()
+        return None, ()
+
+    @staticmethod
+    def _shows_body(shows):
+        """This encodes a list of shows as a JSON response body."""
+        return json.dumps([show.get_info_dict() for show in shows]).encode("utf-8")
+
+    def _recommendations(self, genre, min_rating, min_episodes, max_episodes, language, limit):
+        """This runs get_recommendations() (on a worker thread)."""
+        return self._shows_body(
+            self.recommender.get_recommendations(
+                genre=genre,
+                min_rating=min_rating,
+                min_episodes=min_episodes,
+                max_episodes=max_episodes,
+                language=language,
+                limit=limit,
+            )
+        )
+
+    def _search(self, term, limit):
+        """This runs search_by_title() (on a worker thread)."""
+        return self._shows_body(self.recommender.search_by_title(term)[:limit])
+
+    def _top(self, n):
+        """This runs get_top_rated_shows() (on a worker thread)."""
+        return self._shows_body(self.recommender.get_top_rated_shows(n))
+
+    def _stats(self):
+        """This returns the collection statistics and the service counters (on a worker thread)."""
+        return json.dumps({
+            "collection": self.recommender.get_statistic(),
+            "service": {
+                "requests": self.requests,
+                "computed": self.computed,
+                "coalesced": self.coalesced,
+            },
+        }).encode("utf-8")
+
+    async def query(self, path, params):
+        """This returns the JSON body for a route and its query parameters. If the same query is
+        already running, this waits for that computation instead of starting another one.
+        """
+        handler, arguments = self._parse(path, params)
+        if handler is None:
+            return None
+        key = (path, arguments)
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self._executor, handler, *arguments)
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+            self.computed += 1
+        else:
+            self.coalesced += 1
+        # shield() keeps one client that disconnects from cancelling the others' result
+        return await asyncio.shield(future)
+
+    async def _respond(self, method, target):
+        """This returns (status, body) for one request."""
+        if method != "GET":
+            return 405, {"error": "Only GET is supported."}
+        url = urlsplit(target)
+        try:
+            body = await self.query(url.path, parse_qs(url.query))
+        except RequestError as error:
+            return 400, {"error": str(error)}
+        except Exception as error:
+            return 500, {"error": f"{type(error).__name__}: {error}"}
+        if body is None:
+            return 404, {"error": f"Unknown path: {url.path}"}
+        return 200, body
+
+    async def _handle_connection(self, reader, writer):
+        """This serves the HTTP/1.1 requests of one connection (kept open between requests unless
+        the client asks to close it).
+        """
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await self._send(writer, 400, {"error": "Malformed request line."}, keep_alive=False)
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                # request bodies are not used, but they must be read to reach the next request
+                length = int(headers.get("content-length") or 0)
+                if length:
+                    await reader.readexactly(length)
+
+                self.requests += 1
+                status, body = await self._respond(method, target)
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+                await self._send(writer, status, body, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    @staticmethod
+    async def _send(writer, status, body, keep_alive):
+        """This writes one JSON response. body is already encoded bytes or a JSON-able object."""
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+        head = (
+            f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            "\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def start(self, host="127.0.0.1", port=8551):
+        """This starts listening and returns the (host, port) it is bound to (port 0 picks a free port)."""
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def serve_forever(self):
+        """This serves requests until the task is cancelled."""
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self):
+        """This stops the server and the worker threads."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        self._executor.shutdown(wait=False)
+
+
+async def _serve(recommender, host, port, workers):
+    """This runs the service until it is interrupted."""
+    service = RecommendationService(recommender, workers=workers)
+    bound_host, bound_port = await service.start(host, port)
+    # load tests read this line to find the port
+    print(f"Serving {recommender.get_total_shows()} shows on http://{bound_host}:{bound_port}", flush=True)
+    try:
+        await service.serve_forever()
+    finally:
+        await service.close()
+
+
+def main() -> int:
+    """Parse CLI arguments, load the dataset once and serve it.
+
+    Returns:
+        int: Process exit code (0 for success).
+    """
+    parser = argparse.ArgumentParser(description="Serve TV show recommendations over HTTP/JSON.")
+    parser.add_argument("--csv", required=True, help="Path to TMDB_tv_dataset_v3.csv")
+    parser.add_argument("--limit", type=int, default=None, help="Max rows to load (default: all).")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on.")
+    parser.add_argument("--port", type=int, default=8551, help="Port to listen on (0 picks a free one).")
+    parser.add_argument("--workers", type=int, default=1, help="Query threads.")
+    parser.add_argument("--lazy", action="store_true", help="Open the dataset snapshot lazily.")
+    parser.add_argument("--shards", type=int, default=None, help="Split the shows across this many processes.")
+    args = parser.parse_args()
+
+    if args.shards:
+        recommender = ShardedShowRecommender(args.shards, columnar=True)
+        recommender.add_shows_from_list(load_tv_shows_from_tmdb_csv_cached(args.csv, limit=args.limit))
+    elif args.lazy:
+        recommender = ShowRecommender.from_snapshot(build_tmdb_snapshot(args.csv, limit=args.limit))
+    else:
+        recommender = ShowRecommender(columnar=True)
+        recommender.add_shows_from_list(load_tv_shows_from_tmdb_csv_cached(args.csv, limit=args.limit))
+
+    try:
+        asyncio.run(_serve(recommender, args.host, args.port, args.workers))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if args.shards:
+            recommender.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
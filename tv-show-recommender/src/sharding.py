@@ -0,0 +1,448 @@
+"""EE551- Engineering Programming: Python. Fall 2025. Sharding module.
+This module defines ShardedShowRecommender, a ShowRecommender whose shows are split across
+several worker processes (shards). Every shard holds its own ShowRecommender, so loading and
+querying use one core and one process heap per shard. A query is sent to every shard at once
+(scatter), each shard answers with its own best shows, and the answers are merged (gather):
+top-k lists are merged by rating and statistics are added up.
+"""
+
+import heapq
+import multiprocessing
+import os
+import threading
+import zlib
+from itertools import islice
+from operator import itemgetter
+
+from src.batch_query import normalize_profile
+from src.running_stats import RunningStats
+from src.show_recommender import DUPLICATE_POLICIES, ShowRecommender
+from src.tv_show import TVShow
+
+# ways shows can be split across the shards
+PARTITIONS = ("hash", "language")
+
+# shows sent to the shards in one round by add_shows_from_list()
+_SEND_BATCH_SIZE = 10000
+
+# ShowRecommender methods a shard answers with a list of shows
+_QUERY_METHODS = {
+    "filter_by_genre",
+    "filter_by_rating",
+    "filter_by_episodes",
+    "filter_by_language",
+    "get_recommendations",
+    "get_top_rated_shows",
+    "search_by_title",
+    "get_shows_by_year",
+}
+
+
+def _shard_limit(limit):
+    """This returns how many shows each shard has to send for a limit: the limit itself, or all of
+    them when the limit is None or negative (a negative limit drops shows from the end of the
+    merged list, so it can only be applied after merging).
+    """
+    return limit if limit is not None and limit >= 0 else None
+
+
+class _Shard:
+    """This class is the state of one shard inside its worker process: a ShowRecommender and the
+    global id (position in the whole collection) of every show in it. Queries are answered with
+    (global id, show) pairs, so the parent can merge the shards in collection order without keeping
+    any shows itself.
+    """
+
+    def __init__(self, columnar, cache_size):
+        """This makes an empty shard."""
+        self.recommender = ShowRecommender(columnar=columnar, cache_size=cache_size)
+        # local show id -> global id
+        self.global_ids = []
+        # id() of every stored TVShow object -> global id, to look up the shows a query returns
+        self._global_of = {}
+
+    def add(self, global_ids, shows, duplicates):
+        """This adds shows with their global ids and returns how many of them got a new position.
+        With a duplicates policy other than "keep", only the first show of each new title and year
+        gets a new position and a replacement takes the position (and global id) of the show it
+        replaces.
+        """
+        recommender = self.recommender
+        first_id = len(recommender.shows)
+        new_ids = global_ids
+        replaced = False
+        if duplicates != "keep":
+            new_titles = set()
+            new_ids = []
+            for global_id, show in zip(global_ids, shows):
+                key = (show.title, show.year)
+                if recommender.find_show_id(*key) is not None or key in new_titles:
+                    replaced = True
+                else:
+                    new_titles.add(key)
+                    new_ids.append(global_id)
+        try:
+            recommender.add_shows_from_list(shows, duplicates)
+        finally:
+            # if a show was refused, the shows before it are in and keep their ids
+            added = new_ids[:len(recommender.shows) - first_id]
+            self.global_ids.extend(added)
+            if duplicates == "replace" and replaced:
+                # replaced shows are new objects in old positions
+                self._global_of = {
+                    id(show): global_id for show, global_id in zip(recommender.shows, self.global_ids)
+                }
+            else:
+                for show_id, global_id in zip(range(first_id, len(recommender.shows)), added):
+                    self._global_of[id(recommender.shows[show_id])] = global_id
+        return len(added)
+
+    def _with_ids(self, shows):
+        """This returns (global id, show) pairs for the shows of a result."""
+        global_of = self._global_of
+        return [(global_of[id(show)], show) for show in shows]
+
+    def query(self, name, args, kwargs):
+        """This runs one of the _QUERY_METHODS and returns (global id, show) pairs for its shows."""
+        if name not in _QUERY_METHODS:
+            raise ValueError(f"Shards do not answer {name}().")
+        return self._with_ids(getattr(self.recommender, name)(*args, **kwargs))
+
+    def batch(self, profiles, limit):
+        """This runs get_recommendations_batch() in this shard (without more worker processes)."""
+        results = self.recommender.get_recommendations_batch(profiles, limit=limit, workers=1)
+        return [self._with_ids(shows) for shows in results]
+
+    def size(self):
+        """This returns the number of shows in the shard."""
+        return len(self.recommender.shows)
+
+    def stats(self):
+        """This returns the running statistics of the shard, to be merged by the parent."""
+        return self.recommender.get_running_stats()
+
+
+def _serve_shard(connection, columnar, cache_size):
+    """This is the main loop of a shard process. It receives (command, arguments) requests, runs
+    the _Shard method of that name and sends back (True, result) or (False, exception), until it
+    gets "close".
+    """
+    shard = _Shard(columnar, cache_size)
+    while True:
+        command, args = connection.recv()
+        if command == "close":
+            connection.close()
+            return
+        try:
+            result = getattr(shard, command)(*args)
+        except Exception as error:
+            connection.send((False, error))
+        else:
+            connection.send((True, result))
+
+
+class ShardedShowRecommender:
+    """This class has the same loading and query methods as ShowRecommender, but keeps the shows in
+    several worker processes. partition says which shard a show goes to:
+
+    - "hash": a hash of the title and year, so the shards get about the same number of shows and
+      shows with the same title and year always share a shard (duplicate checks stay exact).
+    - "language": every language lives in one shard (a new language goes to the smallest shard),
+      so a query with a language filter only asks that shard.
+
+    Results are the same as a ShowRecommender with the same shows added in the same order, ties in
+    collection order included. Only the shards hold the shows: this process keeps counts, and the
+    shows of a result are copies sent back by the shards with their global ids (so TVShow objects
+    are equal to, but not the same objects as, the ones that were added). Call close() (or use a
+    with block) to stop the worker processes.
+    """
+
+    def __init__(self, shards=None, partition="hash", columnar=False, cache_size=128):
+        """This starts the shard processes. shards is their number (one per CPU when None);
+        columnar and cache_size are passed to the ShowRecommender of every shard. A ValueError is
+        raised for an unknown partition or fewer than 1 shard.
+        """
+        if partition not in PARTITIONS:
+            raise ValueError(f"partition must be one of {', '.join(PARTITIONS)}.")
+        shards = (os.cpu_count() or 1) if shards is None else shards
+        if shards < 1:
+            raise ValueError("There must be at least 1 shard.")
+        self.partition = partition
+        self._connections = []
+        self._processes = []
+        context = multiprocessing.get_context()
+        for _ in range(shards):
+            parent_end, child_end = context.Pipe()
+            process = context.Process(
+                target=_serve_shard, args=(child_end, columnar, cache_size), daemon=True
+            )
+            process.start()
+            child_end.close()
+            self._connections.append(parent_end)
+            self._processes.append(process)
+        # the next global id; global ids follow the order shows are added in (shows a duplicates
+        # policy left out, or a failed batch, leave gaps)
+        self._next_id = 0
+        # shows each shard holds, and the shard of every language (language partition)
+        self._sizes = [0] * shards
+        self._language_shards = {}
+        # one request at a time goes through the pipes, so threads cannot get each other's answers
+        self._lock = threading.Lock()
+        # version of the collection and the merged shard statistics of that version
+        self._version = 0
+        self._stats = None
+
+    def __enter__(self):
+        """This lets the recommender be used in a with block that closes it."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """This closes the recommender at the end of a with block."""
+        self.close()
+
+    def close(self):
+        """This stops the shard processes. The recommender cannot be used afterwards."""
+        for connection, process in zip(self._connections, self._processes):
+            if process.is_alive():
+                connection.send(("close", ()))
+            connection.close()
+            process.join()
+        self._connections = []
+        self._processes = []
+
+    @property
+    def shard_count(self):
+        """This returns the number of shards."""
+        return len(self._processes)
+
+    def _gather(self, requests):
+        """This sends {shard: (command, arguments)} requests to their shards at once, waits for every
+        answer and returns {shard: result}. If a shard raised an exception, it is raised here (after
+        all answers are read, so the next request does not get an old answer).
+        """
+        if not self._connections:
+            raise ValueError("The recommender is closed.")
+        results = {}
+        error = None
+        with self._lock:
+            for shard, request in requests.items():
+                self._connections[shard].send(request)
+            for shard in requests:
+                succeeded, value = self._connections[shard].recv()
+                if succeeded:
+                    results[shard] = value
+                elif error is None:
+                    error = value
+        if error is not None:
+            raise error
+        return results
+
+    def _broadcast(self, command, *args):
+        """This sends the same request to every shard and returns {shard: result}."""
+        return self._gather({shard: (command, args) for shard in range(self.shard_count)})
+
+    def _shards_for(self, language):
+        """This returns the shards that can have shows in language (None, meaning every shard,
+        without a language or with hash partitioning).
+        """
+        if language and self.partition == "language":
+            shard = self._language_shards.get(language.lower())
+            return [] if shard is None else [shard]
+        return None
+
+    def _query(self, name, *args, shards=None, **kwargs):
+        """This runs a ShowRecommender query on the given shards (all of them when None) and returns
+        the list of global ids of every shard.
+        """
+        shards = range(self.shard_count) if shards is None else shards
+        results = self._gather({shard: ("query", (name, args, kwargs)) for shard in shards})
+        return list(results.values())
+
+    def _in_collection_order(self, parts):
+        """This merges the (global id, show) lists of the shards, each in collection order, into one
+        list of shows in collection order.
+        """
+        return [show for _, show in heapq.merge(*parts, key=itemgetter(0))]
+
+    def _best_first(self, parts, limit):
+        """This merges the (global id, show) lists of the shards, each best first (highest rating,
+        ties in collection order), and returns the first limit shows with the same slicing rules as
+        ShowRecommender (None is all of them, a negative limit drops shows from the end).
+        """
+        merged = heapq.merge(*parts, key=lambda pair: (-pair[1].avg_rating, pair[0]))
+        if limit is not None and limit >= 0:
+            # the merge stops after limit shows
+            merged = islice(merged, limit)
+        return [show for _, show in merged][:limit]
+
+    def _shard_of(self, show, sizes):
+        """This returns the shard a new show goes to. sizes holds the number of shows of each shard,
+        including the ones of the batch that were given a shard already.
+        """
+        if self.partition == "language":
+            key = show.lowercase_language
+            if key not in self._language_shards:
+                # kept even if the batch fails: a shard may have added some shows of the language
+                self._language_shards[key] = sizes.index(min(sizes))
+            return self._language_shards[key]
+        # crc32 is the same in every run, unlike hash() of a string
+        return zlib.crc32(f"{show.title}\0{show.year}".encode("utf-8")) % self.shard_count
+
+    def add_show(self, show, duplicates="keep"):
+        """This adds a TV show to its shard, like ShowRecommender.add_show()."""
+        self.add_shows_from_list([show], duplicates)
+
+    def add_shows_from_list(self, show_list, duplicates="keep"):
+        """This adds multiple TV shows, like ShowRecommender.add_shows_from_list(). The shows are
+        sent in batches and every shard adds its part of a batch at the same time. duplicates other
+        than "keep" needs the hash partition, where shows with the same title and year share a shard.
+        """
+        if duplicates not in DUPLICATE_POLICIES:
+            raise ValueError(f"duplicates must be one of {', '.join(DUPLICATE_POLICIES)}.")
+        if duplicates != "keep" and self.partition != "hash":
+            raise ValueError('Duplicate checks need partition="hash".')
+        show_iter = iter(show_list)
+        for batch in iter(lambda: list(islice(show_iter, _SEND_BATCH_SIZE)), []):
+            if not all(isinstance(show, TVShow) for show in batch):
+                raise TypeError("Only TVShow objects can be added.")
+            parts = {}
+            sizes = list(self._sizes)
+            for global_id, show in enumerate(batch, self._next_id):
+                shard = self._shard_of(show, sizes)
+                global_ids, shows = parts.setdefault(shard, ([], []))
+                global_ids.append(global_id)
+                shows.append(show)
+                sizes[shard] += 1
+            # the global ids of the batch are used up even if a shard fails, since other shards (or
+            # the shows before the failing one) may have taken some of them
+            self._next_id += len(batch)
+            self._version += 1
+            try:
+                results = self._gather({shard: ("add", part + (duplicates,)) for shard, part in parts.items()})
+            except Exception:
+                # the shards that did not fail added their part, so count again what they hold
+                sizes = self._broadcast("size")
+                self._sizes = [sizes[shard] for shard in range(self.shard_count)]
+                raise
+            for shard, added in results.items():
+                self._sizes[shard] += added
+
+    def get_total_shows(self):
+        """This returns the total number of shows in all shards."""
+        return sum(self._sizes)
+
+    def filter_by_genre(self, genre):
+        """This filters the shows by genre, like ShowRecommender.filter_by_genre()."""
+        return self._in_collection_order(self._query("filter_by_genre", genre))
+
+    def filter_by_rating(self, min_rating):
+        """This filters the shows by minimum rating, like ShowRecommender.filter_by_rating()."""
+        return self._in_collection_order(self._query("filter_by_rating", min_rating))
+
+    def filter_by_episodes(self, min_episodes=None, max_episodes=None):
+        """This filters the shows by episode count, like ShowRecommender.filter_by_episodes()."""
+        return self._in_collection_order(self._query("filter_by_episodes", min_episodes, max_episodes))
+
+    def filter_by_language(self, language):
+        """This filters the shows by language, like ShowRecommender.filter_by_language()."""
+        parts = self._query("filter_by_language", language, shards=self._shards_for(language))
+        return self._in_collection_order(parts)
+
+    def search_by_title(self, search_term):
+        """This looks for shows by title, like ShowRecommender.search_by_title()."""
+        return self._in_collection_order(self._query("search_by_title", search_term))
+
+    def get_shows_by_year(self, year):
+        """This gets the shows that aired in a year, like ShowRecommender.get_shows_by_year()."""
+        return self._in_collection_order(self._query("get_shows_by_year", year))
+
+    def get_recommendations(
+        self,
+        genre=None,
+        min_rating=None,
+        min_episodes=None,
+        max_episodes=None,
+        language=None,
+        limit=10,
+        scoring=None,
+    ):
+        """This gets recommendations like ShowRecommender.get_recommendations(). Every shard finds
+        its own best limit shows (with its own query cache) and the sorted lists are merged, so only
+        limit shows per shard are sent back. scoring is not supported: scoring models scale their
+        features by statistics of the whole collection (such as the 90th percentile of the vote
+        counts), which the shards cannot add up, so a ValueError is raised when it is given.
+        """
+        if scoring is not None:
+            raise ValueError("Scoring models need the whole collection; use a ShowRecommender for scoring=.")
+        parts = self._query(
+            "get_recommendations", genre, min_rating, min_episodes, max_episodes, language,
+            limit=_shard_limit(limit), shards=self._shards_for(language),
+        )
+        return self._best_first(parts, limit)
+
+    def get_recommendations_batch(self, profiles, limit=10, workers=None):
+        """This gets recommendations for many profiles, like
+        ShowRecommender.get_recommendations_batch(). Every shard answers the whole batch at once and
+        the lists of each profile are merged. workers is not used: the shards already are the
+        worker processes.
+        """
+        profiles = list(profiles)
+        for profile in profiles:
+            # unknown keys are refused before anything is sent
+            normalize_profile(profile)
+        results = self._broadcast("batch", profiles, _shard_limit(limit))
+        return [
+            self._best_first([result[i] for result in results.values()], limit)
+            for i in range(len(profiles))
+        ]
+
+    def get_top_rated_shows(self, n=10):
+        """This gets the top N highest rated shows, like ShowRecommender.get_top_rated_shows()."""
+        return self._best_first(self._query("get_top_rated_shows", _shard_limit(n)), n)
+
+    def _merged_stats(self):
+        """This returns the RunningStats of the whole collection: the statistics of every shard added
+        up. They are kept until the collection changes.
+        """
+        if self._stats is None or self._stats[0] != self._version:
+            merged = RunningStats()
+            for stats in self._broadcast("stats").values():
+                merged.merge(stats)
+            self._stats = (self._version, merged)
+        return self._stats[1]
+
+    def get_all_genres(self):
+        """This gets a sorted list of all the genres, like ShowRecommender.get_all_genres()."""
+        return sorted(self._merged_stats().genre_counts)
+
+    def get_statistic(self):
+        """This gets the collection statistics, like ShowRecommender.get_statistic()."""
+        return self._merged_stats().summary()
+
+    def get_genre_breakdown(self):
+        """This gets the count and average rating per genre, like
+        ShowRecommender.get_genre_breakdown().
+        """
+        return self._merged_stats().genre_breakdown()
+
+    def get_language_breakdown(self):
+        """This gets the count and average rating per language, like
+        ShowRecommender.get_language_breakdown().
+        """
+        return self._merged_stats().language_breakdown()
+
+    def get_rating_histogram(self):
+        """This gets the rating histogram, like ShowRecommender.get_rating_histogram()."""
+        return self._merged_stats().histogram()
+
+    def get_year_counts(self):
+        """This gets the number of shows per year, like ShowRecommender.get_year_counts()."""
+        return self._merged_stats().years()
+
+    def __str__(self):
+        """Return a user-friendly string representation of the recommender."""
+        return f"ShardedShowRecommender with {self.shard_count} shards"
+
+    def __repr__(self):
+        """Return a technical string representation useful for debugging."""
+        return f"ShardedShowRecommender(shards = {self.shard_count}, partition = {self.partition!r})"
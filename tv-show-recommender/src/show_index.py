@@ -0,0 +1,305 @@
+"""EE551- Engineering Programming: Python. Fall 2025. Show index module.
+This module defines the index classes used by ShowRecommender to find shows without
+scanning the whole collection. Indexes store show ids (positions in ShowRecommender.shows)
+instead of the TVShow objects themselves.
+"""
+
+import bisect
+import heapq
+from collections import defaultdict
+from itertools import islice
+
+# a sorted list that gets or loses fewer than this many values is changed in place one value at
+# a time; for more, it is copied once in slices between the changed positions
+_SLICE_THRESHOLD = 8
+
+
+def _group_by_key(pairs):
+    """This groups (key, show_id) pairs into {key: set of show ids}."""
+    groups = defaultdict(set)
+    for key, show_id in pairs:
+        groups[key].add(show_id)
+    return groups
+
+
+def merge_sorted(values, added):
+    """This returns a new sorted list with the values of the sorted list added merged into the
+    sorted list values. Each new value is placed with a binary search and the old values between
+    two new ones are copied as one slice, so it costs O(k log n) comparisons plus one copy.
+    """
+    merged = []
+    previous = 0
+    for value in added:
+        position = bisect.bisect_right(values, value, previous)
+        merged += values[previous:position]
+        merged.append(value)
+        previous = position
+    merged += values[previous:]
+    return merged
+
+
+def remove_sorted(values, removed):
+    """This returns a new list with the values of the sorted list removed taken out of the sorted
+    list values (every removed value must be in values), found with binary searches like in
+    merge_sorted().
+    """
+    kept = []
+    previous = 0
+    for value in removed:
+        position = bisect.bisect_left(values, value, previous)
+        kept += values[previous:position]
+        previous = position + 1
+    kept += values[previous:]
+    return kept
+
+
+class InvertedIndex:
+    """This class maps a normalized key (like a lowercase genre or a year) to the list of
+    show ids that have that key. Ids are added in increasing order, so every posting list
+    is already sorted and results come back in collection order.
+    """
+
+    def __init__(self):
+        """This makes an empty index."""
+        self._postings = {}
+
+    def __len__(self):
+        """This returns the number of distinct keys."""
+        return len(self._postings)
+
+    def __contains__(self, key):
+        """This checks if any show has the key."""
+        return key in self._postings
+
+    def add(self, key, show_id):
+        """This records that the show with show_id has the key."""
+        postings = self._postings.get(key)
+        if postings is None:
+            self._postings[key] = [show_id]
+        elif postings[-1] != show_id:
+            # a show that lists the same key twice is only stored once
+            postings.append(show_id)
+
+    def extend(self, key, show_ids):
+        """This records that every show in show_ids has the key. show_ids must be sorted, without
+        repeats, and larger than any id already stored, like ids of newly added shows.
+        """
+        postings = self._postings.get(key)
+        if postings is None:
+            self._postings[key] = list(show_ids)
+        else:
+            postings.extend(show_ids)
+
+    def insert(self, key, show_id):
+        """This records that the show with show_id has the key, for any show_id (not only ids larger
+        than the ones already stored). It is placed with a binary search so the list stays sorted.
+        """
+        postings = self._postings.get(key)
+        if postings is None:
+            self._postings[key] = [show_id]
+            return
+        position = bisect.bisect_left(postings, show_id)
+        if position == len(postings) or postings[position] != show_id:
+            postings.insert(position, show_id)
+
+    def remove(self, key, show_id):
+        """This removes show_id from the key's list. A key without shows left is dropped, so keys()
+        only returns keys that some show still has. A ValueError is raised if the show does not have
+        the key.
+        """
+        postings = self._postings.get(key, [])
+        position = bisect.bisect_left(postings, show_id)
+        if position == len(postings) or postings[position] != show_id:
+            raise ValueError(f"Show {show_id} is not indexed under {key!r}.")
+        del postings[position]
+        if not postings:
+            del self._postings[key]
+
+    def insert_many(self, pairs):
+        """This records many (key, show_id) pairs with any ids (the ids must not be under the key
+        already). A key that gets a few ids has them inserted one at a time and a key that gets more
+        is merged with them in one pass.
+        """
+        for key, show_ids in _group_by_key(pairs).items():
+            postings = self._postings.get(key)
+            if postings is None:
+                self._postings[key] = sorted(show_ids)
+            elif len(show_ids) < _SLICE_THRESHOLD:
+                for show_id in show_ids:
+                    bisect.insort(postings, show_id)
+            else:
+                self._postings[key] = merge_sorted(postings, sorted(show_ids))
+
+    def remove_many(self, pairs):
+        """This removes many (key, show_id) pairs that are in the index. A key that loses a few ids
+        has them deleted one at a time and a key that loses more is copied once without them. A key
+        without shows left is dropped.
+        """
+        for key, show_ids in _group_by_key(pairs).items():
+            postings = self._postings[key]
+            if len(show_ids) < _SLICE_THRESHOLD:
+                for show_id in show_ids:
+                    del postings[bisect.bisect_left(postings, show_id)]
+            else:
+                postings = self._postings[key] = remove_sorted(postings, sorted(show_ids))
+            if not postings:
+                del self._postings[key]
+
+    def get(self, key):
+        """This returns the sorted list of show ids for the key (empty if the key is unknown).
+        The returned list belongs to the index, so callers should not modify it.
+        """
+        return self._postings.get(key, [])
+
+    def keys(self):
+        """This returns all keys in the index."""
+        return self._postings.keys()
+
+    def get_many(self, keys):
+        """This returns the sorted union of the posting lists for several keys."""
+        postings = [self._postings[key] for key in keys if key in self._postings]
+        if not postings:
+            return []
+        if len(postings) == 1:
+            return postings[0]
+        # merge the sorted lists and drop ids that appear under more than one key
+        merged = []
+        for show_id in heapq.merge(*postings):
+            if not merged or merged[-1] != show_id:
+                merged.append(show_id)
+        return merged
+
+
+class SortedIndex:
+    """This class keeps show ids sorted by a numeric key, like a rating or an episode count. The
+    keys and ids are kept in two parallel sorted lists, and shows with the same key are ordered by
+    id (collection order). New shows are placed with bisect, so the order never has to be rebuilt
+    from scratch, and a range of keys is found with two binary searches (O(log n + matches)).
+    """
+
+    def __init__(self):
+        """This makes an empty sorted index."""
+        self._keys = []
+        self._ids = []
+
+    def __len__(self):
+        """This returns the number of indexed shows."""
+        return len(self._keys)
+
+    def _position(self, key, show_id):
+        """This returns where (key, show_id) belongs in the sorted lists."""
+        low = bisect.bisect_left(self._keys, key)
+        high = bisect.bisect_right(self._keys, key, low)
+        # among equal keys the ids are sorted too
+        return bisect.bisect_left(self._ids, show_id, low, high)
+
+    def add(self, key, show_id):
+        """This inserts one show into its sorted position."""
+        position = self._position(key, show_id)
+        self._keys.insert(position, key)
+        self._ids.insert(position, show_id)
+
+    def remove(self, key, show_id):
+        """This removes the entry (key, show_id). A ValueError is raised if it is not in the index."""
+        position = self._position(key, show_id)
+        if position == len(self._keys) or self._keys[position] != key or self._ids[position] != show_id:
+            raise ValueError(f"Show {show_id} is not indexed under {key!r}.")
+        del self._keys[position]
+        del self._ids[position]
+
+    def remove_many(self, pairs):
+        """This removes many (key, show_id) entries that are in the index. A few entries are removed
+        one at a time; for more, the lists are copied once in slices between the removed entries.
+        """
+        removed = sorted(pairs)
+        if len(removed) < _SLICE_THRESHOLD:
+            for key, show_id in removed:
+                self.remove(key, show_id)
+            return
+        keys = []
+        ids = []
+        previous = 0
+        for key, show_id in removed:
+            position = self._position(key, show_id)
+            if position == len(self._keys) or self._keys[position] != key or self._ids[position] != show_id:
+                raise ValueError(f"Show {show_id} is not indexed under {key!r}.")
+            keys += self._keys[previous:position]
+            ids += self._ids[previous:position]
+            previous = position + 1
+        keys += self._keys[previous:]
+        ids += self._ids[previous:]
+        self._keys = keys
+        self._ids = ids
+
+    def add_many(self, pairs):
+        """This inserts many (key, show_id) pairs. Large batches are sorted on their own, and then
+        each new entry's position is found with a binary search and the existing entries between two
+        positions are copied over as one slice, instead of one insert (and list shift) per show.
+        """
+        new_entries = sorted(pairs)
+        if len(new_entries) < 32:
+            for key, show_id in new_entries:
+                self.add(key, show_id)
+            return
+        old_keys = self._keys
+        old_ids = self._ids
+        keys = []
+        ids = []
+        previous = 0
+        for key, show_id in new_entries:
+            position = self._position(key, show_id)
+            keys += old_keys[previous:position]
+            ids += old_ids[previous:position]
+            keys.append(key)
+            ids.append(show_id)
+            previous = position
+        keys += old_keys[previous:]
+        ids += old_ids[previous:]
+        self._keys = keys
+        self._ids = ids
+
+    def add_sorted(self, keys, show_ids):
+        """This inserts many shows given as two parallel lists that are already sorted by
+        (key, show_id). An empty index simply takes the lists over.
+        """
+        if not self._keys:
+            self._keys = list(keys)
+            self._ids = list(show_ids)
+            return
+        self.add_many(zip(keys, show_ids))
+
+    def first_ids(self, n=None):
+        """This returns the ids of the first n entries (all of them when n is None). The slice
+        follows normal list slicing, so a negative n drops entries from the end.
+        """
+        return self._ids[:n]
+
+    def _bounds(self, low, high):
+        """This returns the slice of entries with low <= key <= high (None means no bound)."""
+        start = 0 if low is None else bisect.bisect_left(self._keys, low)
+        end = len(self._keys) if high is None else bisect.bisect_right(self._keys, high)
+        return start, max(start, end)
+
+    def count_between(self, low=None, high=None):
+        """This returns how many shows have low <= key <= high in O(log n)."""
+        start, end = self._bounds(low, high)
+        return end - start
+
+    def ids_between(self, low=None, high=None):
+        """This returns the ids of shows with low <= key <= high, in key order."""
+        start, end = self._bounds(low, high)
+        return self._ids[start:end]
+
+    def iter_after(self, key=None, show_id=None):
+        """This iterates over the ids of the entries that come after (key, show_id) in key order
+        (every entry when key is None). The entry itself does not have to be in the index.
+        """
+        start = 0 if key is None else self._position(key, show_id + 1)
+        return islice(self._ids, start, None)
+
+    def iter_between(self, low=None, high=None):
+        """This is like ids_between() but returns an iterator, so a caller that stops early does
+        not copy the whole range.
+        """
+        start, end = self._bounds(low, high)
+        return islice(self._ids, start, end)
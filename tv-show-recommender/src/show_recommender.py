@@ -2,8 +2,105 @@
 defines that ShowRecommender class. This manages TV shows and provides filtering and recommendations
 based on the user preferences.
 """
+import bisect
+import heapq
+import numbers
+import sys
+import time
+from itertools import islice
+
+import numpy as np
+
 #updated this from tv_show ... to src.tv_show ...
-from src.tv_show import TVShow
+from src.tv_show import TVShow, _shared_genres
+from src.show_store import MISSING_YEAR, ColumnarShowStore
+from src.show_index import InvertedIndex, SortedIndex
+from src.title_index import TitleIndex
+from src.similarity import SimilarityEngine
+from src.scoring import ScoringModel, top_k
+from src.query_cache import QueryCache
+from src.running_stats import RunningStats
+from src.batch_query import evaluate_batch, normalize_profile
+from src.query_planner import QueryPlanner
+from src.dataset_snapshot import LazyShowList
+from src.sqlite_store import SQLiteShowList, SQLiteShowStore
+from src.pagination import PAGE_ORDERS, PAGE_QUERIES, Page, decode_cursor, encode_cursor
+from src.instrumentation import PROFILER, profiled
+
+# number of shows add_shows_from_list() takes from its input at a time
+_ADD_BATCH_SIZE = 10000
+
+# a paged rating or episode filter on the list backend checks the shows one by one (and stops
+# when the page is full) if at least 1 in this many shows match; otherwise it uses the index
+_SCAN_RATIO = 8
+
+# a column store mask is turned into Python ids this many shows at a time, so a paged query that
+# stops early does not convert the whole mask
+_MASK_CHUNK_SIZE = 4096
+
+# what add_show() and add_shows_from_list() do with a show whose title and year are already in
+# the collection: add it anyway, leave the collection as it is, or put it in place of the old one
+DUPLICATE_POLICIES = ("keep", "skip", "replace")
+
+# DataFrame column used for each TVShow field by add_shows_from_dataframe() (the TMDB names)
+DATAFRAME_COLUMNS = {
+    "title": "name",
+    "genre": "genres",
+    "num_episodes": "number_of_episodes",
+    "avg_rating": "vote_average",
+    "language": "original_language",
+    "year": "year",
+    "vote_count": "vote_count",
+}
+
+
+def _group_rows(keys):
+    """This groups the positions of a NumPy array by value. It yields (value, positions) for every
+    distinct value, with the positions in increasing order.
+    """
+    distinct, inverse = np.unique(keys, return_inverse=True)
+    inverse = inverse.reshape(-1)
+    order = np.argsort(inverse, kind="stable")
+    bounds = np.cumsum(np.bincount(inverse, minlength=len(distinct)))[:-1]
+    return zip(distinct.tolist(), np.split(order, bounds))
+
+
+def _factorize(values):
+    """This gives every distinct value in a list a code. It returns (distinct values, NumPy array
+    with the code of every value). The values must be hashable.
+    """
+    codes_by_value = {}
+    codes = [codes_by_value.setdefault(value, len(codes_by_value)) for value in values]
+    return list(codes_by_value), np.array(codes, dtype=np.int64)
+
+
+def _parse_genre_value(value):
+    """This turns one genres cell into a tuple of genre strings. A cell can be a list or tuple of
+    genres (like in the notebook) or a TMDB style comma-separated string; anything else (NaN, None)
+    means no genres.
+    """
+    if isinstance(value, str):
+        return tuple(g.strip() for g in value.split(",") if g.strip())
+    if isinstance(value, (list, tuple)):
+        return tuple(str(g).strip() for g in value if str(g).strip())
+    return ()
+
+
+def _ids_from(ids, start):
+    """This yields the ids of a sorted list from the first one that is at least start, without
+    copying the list.
+    """
+    for position in range(bisect.bisect_left(ids, start), len(ids)):
+        yield ids[position]
+
+
+def _sql_limit(n, total):
+    """This turns a list-slice style limit ([:n], where None is everything and a negative n drops
+    shows from the end) into a LIMIT for a collection of total shows (None is no limit).
+    """
+    if n is None or n >= 0:
+        return n
+    return max(total + n, 0)
 
 
 class ShowRecommender:
@@ -13,29 +110,655 @@ class ShowRecommender:
     and it will let users find their next show to watch.
     """
 
-    def __init__(self):
-        """This starts the ShowRecommender with an empty list of TV Shows."""
+    def __init__(self, columnar=False, cache_size=128, database=None):
+        """This starts the ShowRecommender with an empty list of TV Shows. If columnar is True the
+        ratings, episodes, years, languages and genres are also kept in a NumPy backed
+        ColumnarShowStore, so filters and statistics run as vectorized array operations. The results
+        are the same either way. Shows should not be modified after they are added when columnar is on.
+        cache_size is how many get_recommendations(), get_all_genres() and get_statistic() results are
+        remembered (0 turns the cache off).
+
+        If database is a file path (or ":memory:"), the shows are stored in a SQLite database
+        (SQLiteShowStore) instead of Python objects, and queries run as indexed SQL. A database file
+        that already has shows is opened with them. columnar cannot be used together with database.
+        """
+        if columnar and database is not None:
+            raise ValueError("columnar and database cannot be used together.")
+        # optional SQLite storage engine; when it is used, the indexes and statistics below stay
+        # empty and every query is answered by the database
+        self._sql = SQLiteShowStore(database) if database is not None else None
         # list that stores the TVShow objects
         # when the project is done- this will have all of the shows from the dataset
-        self.shows = []
+        self.shows = [] if self._sql is None else SQLiteShowList(self._sql)
+        # optional column store that mirrors self.shows (row i is self.shows[i])
+        self._store = ColumnarShowStore() if columnar else None
+        # inverted indexes from lowercase genre, lowercase language and year to show ids
+        self._genre_index = InvertedIndex()
+        self._language_index = InvertedIndex()
+        self._year_index = InvertedIndex()
+        # show ids ordered from highest to lowest rating (ties in collection order); the keys are
+        # negative ratings, so "rating >= x" is the range of keys up to -x
+        self._rating_order = SortedIndex()
+        # range indexes on episode count and year (shows without a year are left out)
+        self._episode_index = SortedIndex()
+        self._year_range_index = SortedIndex()
+        # trigram title index, built the first time a title search is made
+        self._title_index = None
+        # (title, year) -> id of the first show with that title and year, built the first time a
+        # duplicate check or find_show() needs it
+        self._identity = None
+        # genre/rating/vote/episode/year/language features for similar_to() and scoring models,
+        # built on first use
+        self._similarity = None
+        # version of the collection; add_show() and add_shows_from_list() increase it so cached
+        # query results from before the change are never returned
+        self._version = 0
+        self._query_cache = QueryCache(cache_size)
+        # running totals (counts, sums, genre/language breakdowns, rating histogram) that are
+        # updated as shows are added, so statistics never rescan the collection
+        self._stats = RunningStats()
+        # orders the get_recommendations() filters by how many shows they keep
+        self._planner = QueryPlanner(self)
 
-    def add_show(self, show):
-        """This adds a TV show object to the collection. A TypeError is raised if the provided
-        object isn't a TVShow instance.
+    def _index_show(self, show_id, show):
+        """This adds a show that is stored at position show_id to the inverted indexes."""
+        for genre in show.lowercase_genres:
+            self._genre_index.add(genre, show_id)
+        self._language_index.add(show.lowercase_language, show_id)
+        self._year_index.add(show.year, show_id)
+        if self._title_index is not None:
+            self._title_index.add(show_id, show.title)
+
+    def _get_identity_index(self):
+        """This returns the (title, year) identity index, building it from the current shows the
+        first time. Once it exists, new shows are added to it as well.
+        """
+        if self._identity is None:
+            if self._sql is not None:
+                keys = self._sql.keys()
+            elif isinstance(self.shows, LazyShowList):
+                # read the titles and years without building every show
+                years = [None if year == MISSING_YEAR else year for year in self._store.years.tolist()]
+                keys = zip(self.shows.iter_titles(), years)
+            else:
+                keys = [(show.title, show.year) for show in self.shows]
+            keys = list(keys)
+            # built backwards, so a key that appears more than once ends up with its first id
+            self._identity = dict(zip(reversed(keys), range(len(keys) - 1, -1, -1)))
+        return self._identity
+
+    def _check_show(self, show):
+        """This raises a TypeError if show is not a TVShow, and a ValueError if its year is not a
+        whole number or None. The year indexes compare years with each other, so a year like "2002"
+        is refused before any index is changed, on every backend. The SQLite backend also refuses
+        shows it cannot store (see SQLiteShowStore.check_show()) at this point.
         """
-        # validate that we are only adding TVShow objects
         if not isinstance(show, TVShow):
             raise TypeError("Only TVShow objects can be added.")
-        # add validated show to the collection
+        if show.year is not None and not isinstance(show.year, numbers.Integral):
+            raise ValueError("Year must be a whole number or None.")
+        if self._sql is not None:
+            self._sql.check_show(show)
+
+    @staticmethod
+    def _check_duplicates(duplicates):
+        """This raises a ValueError if duplicates is not one of DUPLICATE_POLICIES."""
+        if duplicates not in DUPLICATE_POLICIES:
+            raise ValueError(f"duplicates must be one of {', '.join(DUPLICATE_POLICIES)}.")
+
+    def _get_title_index(self):
+        """This returns the title index, building it from the current shows the first time. Once it
+        exists, add_show() keeps it up to date.
+        """
+        if self._title_index is None:
+            title_index = TitleIndex()
+            if self._sql is not None:
+                titles = self._sql.iter_titles()
+            elif isinstance(self.shows, LazyShowList):
+                # read the titles straight from the snapshot instead of building every show
+                titles = self.shows.iter_titles()
+            else:
+                titles = (show.title for show in self.shows)
+            for show_id, title in enumerate(titles):
+                title_index.add(show_id, title)
+            self._title_index = title_index
+        return self._title_index
+
+    def _genre_ids(self, genre):
+        """This returns the sorted ids of shows that match the genre. A show matches when one of its
+        genres contains the target (case-insensitive), so every genre key containing it is merged.
+        """
+        target = genre.lower()
+        return self._genre_index.get_many(key for key in self._genre_index.keys() if target in key)
+
+    def _shows_from_ids(self, ids):
+        """This turns an array of show ids from the column store into a list of TVShow objects."""
+        return [self.shows[i] for i in ids.tolist()]
+
+    def _shows_from_mask(self, mask):
+        """This turns a boolean mask from the column store into a list of TVShow objects."""
+        return self._shows_from_ids(mask.nonzero()[0])
+
+    @profiled
+    def add_show(self, show, duplicates="keep"):
+        """This adds a TV show object to the collection. A TypeError is raised if the provided
+        object isn't a TVShow instance, and a ValueError if its year is not a whole number or None.
+        duplicates says what happens when a show with the same title and year is already in the
+        collection: "keep" adds it anyway, "skip" leaves the collection as it is and "replace" puts
+        the new show in place of the old one. The check is a dictionary lookup, not a scan of every
+        show.
+        """
+        # validate that we are only adding TVShow objects with a usable year
+        self._check_show(show)
+        self._check_duplicates(duplicates)
+        if duplicates != "keep":
+            existing_id = self._get_identity_index().get((show.title, show.year))
+            if existing_id is not None:
+                if duplicates == "replace":
+                    self._replace_shows({existing_id: show})
+                return
+        if self._sql is not None:
+            self._add_validated([show])
+            return
+        # add validated show to the collection; no index key can raise (see lowercase_genres and
+        # lowercase_language), so no index is left holding an id without a show
+        show_id = len(self.shows)
+        self._index_show(show_id, show)
+        self._rating_order.add(-show.avg_rating, show_id)
+        self._episode_index.add(show.num_episodes, show_id)
+        if show.year is not None:
+            self._year_range_index.add(show.year, show_id)
+        if self._identity is not None:
+            self._identity.setdefault((show.title, show.year), show_id)
         self.shows.append(show)
+        if self._store is not None:
+            self._store.append(show)
+        self._stats.add(show)
+        self._version += 1
 
-    def add_shows_from_list(self, show_list):
+    @profiled
+    def add_shows_from_list(self, show_list, duplicates="keep"):
         """This adds multiple TV Shows from the list. This is useful when loading many shows from the
-        dataset. add_show() is used to make sure each show is validated.
+        dataset. show_list can be any iterable, including a generator such as
+        data_processor.iter_tv_shows_from_tmdb_csv(); it is consumed in batches, so a stream never has
+        to be turned into one big list first. Every show is validated like in add_show(). If an invalid
+        object is found, the batches before it have already been added. duplicates works like in
+        add_show(), also for repeats inside show_list ("replace" keeps the last one, in the position
+        of the first). Each show is checked with one dictionary lookup, so removing the duplicates of
+        a large load costs O(n).
+        """
+        self._check_duplicates(duplicates)
+        started = time.perf_counter()
+        first_id = len(self.shows)
+        show_iter = iter(show_list)
+        if self._sql is not None:
+            # every batch is written in one transaction, committed at the end
+            with self._sql.transaction():
+                for batch in iter(lambda: list(islice(show_iter, _ADD_BATCH_SIZE)), []):
+                    self._add_batch(batch, duplicates)
+            self._sql.analyze()
+        else:
+            while True:
+                batch = list(islice(show_iter, _ADD_BATCH_SIZE))
+                if not batch:
+                    break
+                self._add_batch(batch, duplicates)
+        if PROFILER.enabled:
+            added = len(self.shows) - first_id
+            PROFILER.record_load("ShowRecommender.add_shows_from_list", time.perf_counter() - started, added, added)
+
+    def _add_batch(self, new_shows, duplicates="keep"):
+        """This adds a list of shows. Each batch is added to the indexes at once (a single merge into
+        the rating order instead of one insert per show).
         """
-        # this loops through each show and adds it- this validates each show
-        for show in show_list:
-            self.add_show(show)
+        # this loops through each show and validates it before anything is added
+        for show in new_shows:
+            self._check_show(show)
+        if duplicates != "keep":
+            new_shows = self._drop_duplicates(new_shows, duplicates == "replace")
+            if not new_shows:
+                return
+        self._add_validated(new_shows)
+
+    def _drop_duplicates(self, new_shows, replace):
+        """This returns the shows of a batch whose title and year are not in the collection yet, with
+        repeats inside the batch removed. If replace is True, a duplicate takes the place of the
+        earlier show: shows already in the collection are replaced right away and earlier shows of
+        the batch are swapped in the returned list.
+        """
+        identity = self._get_identity_index()
+        first_id = len(self.shows)
+        unique = []
+        replacements = {}
+        for show in new_shows:
+            key = (show.title, show.year)
+            show_id = identity.get(key)
+            if show_id is None:
+                identity[key] = first_id + len(unique)
+                unique.append(show)
+            elif replace:
+                if show_id >= first_id:
+                    unique[show_id - first_id] = show
+                else:
+                    replacements[show_id] = show
+        if replacements:
+            self._replace_shows(replacements)
+        return unique
+
+    def _replace_shows(self, replacements):
+        """This puts new shows in place of shows in the collection. replacements maps a show id to
+        the new show.
+        """
+        self._rewrite_rows(replacements, len(self.shows))
+
+    @staticmethod
+    def _index_entries(rows):
+        """This returns the entries that (show_id, show) rows have in each index, as lists of
+        (key, show_id) pairs: genre, language, year, rating order, episodes and year range.
+        """
+        genres, languages, years, ratings, episodes, year_range = [], [], [], [], [], []
+        for show_id, show in rows:
+            genres.extend((genre, show_id) for genre in set(show.lowercase_genres))
+            languages.append((show.lowercase_language, show_id))
+            years.append((show.year, show_id))
+            ratings.append((-show.avg_rating, show_id))
+            episodes.append((show.num_episodes, show_id))
+            if show.year is not None:
+                year_range.append((show.year, show_id))
+        return genres, languages, years, ratings, episodes, year_range
+
+    def _rewrite_rows(self, changes, size):
+        """This changes the collection in place: changes maps a show id below size to the show that
+        is stored there from now on, and every show from size on is dropped. Only the entries of
+        those shows are taken out of the indexes, the column store, the similarity features, the
+        title and identity indexes and the running statistics, and the new ones are put in, so the
+        work grows with the number of changed shows instead of the size of the collection.
+        """
+        old_rows = [(show_id, self.shows[show_id]) for show_id in changes]
+        old_rows.extend((show_id, self.shows[show_id]) for show_id in range(size, len(self.shows)))
+        new_rows = list(changes.items())
+
+        if self._sql is not None:
+            self._sql.rewrite(changes, size)
+        else:
+            old_entries = self._index_entries(old_rows)
+            new_entries = self._index_entries(new_rows)
+            inverted = (self._genre_index, self._language_index, self._year_index)
+            for index, removed, added in zip(inverted, old_entries[:3], new_entries[:3]):
+                index.remove_many(removed)
+                index.insert_many(added)
+            ranges = (self._rating_order, self._episode_index, self._year_range_index)
+            for index, removed, added in zip(ranges, old_entries[3:], new_entries[3:]):
+                index.remove_many(removed)
+                index.add_many(added)
+            for _, show in old_rows:
+                self._stats.remove(show)
+            for _, show in new_rows:
+                self._stats.add(show)
+
+        if self._identity is not None:
+            for show_id, show in old_rows:
+                key = (show.title, show.year)
+                if self._identity.get(key) == show_id:
+                    del self._identity[key]
+            for show_id, show in new_rows:
+                self._identity.setdefault((show.title, show.year), show_id)
+        if self._title_index is not None:
+            self._title_index.rewrite({show_id: show.title for show_id, show in new_rows}, size)
+
+        if self._sql is None:
+            for show_id, show in new_rows:
+                self.shows[show_id] = show
+            del self.shows[size:]
+        if self._store is not None:
+            self._store.set_rows(list(changes), list(changes.values()))
+            self._store.truncate(size)
+        if self._similarity is not None:
+            self._similarity.truncate(size)
+            rows = [(show_id, show) for show_id, show in new_rows if show_id < len(self._similarity)]
+            self._similarity.set_rows([show_id for show_id, _ in rows], [show for _, show in rows])
+        self._version += 1
+
+    def _add_validated(self, new_shows, columns=None):
+        """This adds a list of shows that are known to be valid TVShow objects. columns can hold the
+        same shows as columns (see add_shows_from_dataframe()), which lets the indexes, the column
+        store and the running statistics be filled per distinct value instead of per show.
+        """
+        first_id = len(self.shows)
+        if self._sql is not None:
+            self._sql.insert(new_shows)
+            if self._title_index is not None:
+                for show_id, show in enumerate(new_shows, first_id):
+                    self._title_index.add(show_id, show.title)
+        else:
+            self._index_new_shows(first_id, new_shows, columns)
+            self.shows.extend(new_shows)
+        if self._identity is not None:
+            for show_id, show in enumerate(new_shows, first_id):
+                self._identity.setdefault((show.title, show.year), show_id)
+        self._version += 1
+
+    def _index_new_shows(self, first_id, new_shows, columns=None):
+        """This adds shows that will be stored from position first_id to the indexes, the column
+        store and the running statistics (see _add_validated()).
+        """
+        if columns is not None:
+            self._index_columns(first_id, new_shows, columns)
+        else:
+            for show_id, show in enumerate(new_shows, first_id):
+                self._index_show(show_id, show)
+            self._rating_order.add_many(
+                (-show.avg_rating, show_id) for show_id, show in enumerate(new_shows, first_id)
+            )
+            self._episode_index.add_many(
+                (show.num_episodes, show_id) for show_id, show in enumerate(new_shows, first_id)
+            )
+            self._year_range_index.add_many(
+                (show.year, show_id)
+                for show_id, show in enumerate(new_shows, first_id)
+                if show.year is not None
+            )
+        if self._store is not None:
+            # copy the whole batch into the columns at once
+            if columns is not None:
+                self._store.extend_columns(
+                    columns["ratings"],
+                    columns["episodes"],
+                    columns["years"],
+                    columns["languages"],
+                    columns["genres"],
+                )
+            else:
+                self._store.extend(new_shows)
+        if columns is not None:
+            self._stats.add_columns(
+                columns["ratings"],
+                columns["episodes"],
+                columns["year_values"],
+                columns["languages"],
+                columns["genres"],
+            )
+        else:
+            for show in new_shows:
+                self._stats.add(show)
+
+    def _index_columns(self, first_id, new_shows, columns):
+        """This adds shows given as columns to every index. The rows are grouped by language, year
+        and genre tuple with NumPy, so each posting list is extended once per distinct value.
+        """
+        # every index refers to the same int object for a show id instead of its own copy
+        id_objects = list(range(first_id, first_id + len(new_shows)))
+
+        def ids_of(rows):
+            return list(map(id_objects.__getitem__, rows.tolist()))
+
+        def index_groups(index, values, normalize):
+            # rows are grouped by their distinct values first; values that normalize to the same
+            # key (like "EN" and "en") are merged back into collection order before indexing
+            distinct, codes = _factorize(values)
+            key_rows = {}
+            for code, rows in _group_rows(codes):
+                for key in normalize(distinct[code]):
+                    key_rows.setdefault(key, []).append(rows)
+            for key, parts in key_rows.items():
+                rows = parts[0] if len(parts) == 1 else np.sort(np.concatenate(parts))
+                index.extend(key, ids_of(rows))
+
+        index_groups(self._language_index, columns["languages"], lambda language: (language.lower(),))
+        index_groups(self._year_index, columns["year_values"], lambda year: (year,))
+        index_groups(
+            self._genre_index,
+            columns["genres"],
+            lambda genres: {genre.lower() for genre in genres if isinstance(genre, str)},
+        )
+
+        if self._title_index is not None:
+            for show_id, show in enumerate(new_shows, first_id):
+                self._title_index.add(show_id, show.title)
+
+        # NumPy sorts the new entries (ties by id), so the sorted indexes only have to merge them
+        for index, keys in (
+            (self._rating_order, -columns["ratings"]),
+            (self._episode_index, columns["episodes"]),
+        ):
+            order = np.argsort(keys, kind="stable")
+            index.add_sorted(keys[order].tolist(), ids_of(order))
+        rows = (columns["years"] != MISSING_YEAR).nonzero()[0]
+        order = rows[np.argsort(columns["years"][rows], kind="stable")]
+        self._year_range_index.add_sorted(columns["years"][order].tolist(), ids_of(order))
+
+    @classmethod
+    def from_dataframe(cls, df, columns=None, columnar=False, cache_size=128):
+        """This makes a ShowRecommender from a pandas DataFrame in one bulk step (see
+        add_shows_from_dataframe()). Invalid rows are skipped.
+        """
+        recommender = cls(columnar=columnar, cache_size=cache_size)
+        recommender.add_shows_from_dataframe(df, columns=columns)
+        return recommender
+
+    @classmethod
+    def from_snapshot(cls, snapshot_path, cache_size=128):
+        """This makes a lazy ShowRecommender over a dataset snapshot (see
+        data_processor.build_tmdb_snapshot()). The snapshot columns are memory-mapped and the
+        indexes are built from them, but TVShow objects are only created for the shows a query
+        returns: get_recommendations(limit=10) builds at most 10 of them. The recommender uses the
+        columnar backend so filters never need the show objects. Shows can still be added later.
+        similar_to() and methods that return every show build all of them.
+        """
+        recommender = cls(columnar=True, cache_size=cache_size)
+        shows = LazyShowList(snapshot_path)
+        recommender._index_new_shows(0, shows, shows.row_columns())
+        recommender.shows = shows
+        recommender._version += 1
+        return recommender
+
+    @profiled
+    def add_shows_from_dataframe(self, df, columns=None):
+        """This adds every valid row of a pandas DataFrame as a TV show. It replaces building the
+        shows one by one in a df.iterrows() loop: ratings and episode counts are converted and
+        range-checked with vectorized operations on whole columns, the genres column is parsed in
+        one pass (each distinct value only once), and the checked rows become TVShow objects without
+        running the per-show checks again.
+
+        columns maps TVShow fields to DataFrame columns and defaults to DATAFRAME_COLUMNS (the TMDB
+        names). Genres can be lists or comma-separated strings. When there is no year column the year
+        is taken from the first four characters of "first_air_date". The vote count column is
+        optional; a missing, non-numeric or negative vote count leaves it unknown. Rows with a
+        missing or non-numeric rating or episode count, a rating outside 0-10 or a negative episode
+        count are skipped, like the CSV loaders do. This returns the number of skipped rows.
+        """
+        import pandas as pd
+
+        started = time.perf_counter()
+        columns = {**DATAFRAME_COLUMNS, **(columns or {})}
+        ratings = pd.to_numeric(df[columns["avg_rating"]], errors="coerce").to_numpy(dtype=np.float64)
+        episodes = pd.to_numeric(df[columns["num_episodes"]], errors="coerce").to_numpy(dtype=np.float64)
+        if columns["year"] in df:
+            years = pd.to_numeric(df[columns["year"]], errors="coerce")
+        elif "first_air_date" in df:
+            years = pd.to_numeric(df["first_air_date"].astype("string").str[:4], errors="coerce")
+        else:
+            years = pd.Series(np.nan, index=df.index)
+        years = years.to_numpy(dtype=np.float64)
+        if columns["vote_count"] in df:
+            votes = pd.to_numeric(df[columns["vote_count"]], errors="coerce").to_numpy(dtype=np.float64)
+        else:
+            votes = np.full(len(df), np.nan)
+
+        # the same checks as TVShow.__init__(), on whole columns at once (NaN fails every comparison)
+        valid = (ratings >= 0) & (ratings <= 10) & (episodes >= 0)
+        skipped = int(len(valid) - valid.sum())
+        rows = valid.nonzero()[0]
+        profile = PROFILER.enabled
+        if profile:
+            reasons = self._dataframe_skip_reasons(ratings, episodes) if skipped else {}
+        if len(rows) == 0:
+            if profile:
+                PROFILER.record_load(
+                    "ShowRecommender.add_shows_from_dataframe", time.perf_counter() - started, skipped, 0, reasons
+                )
+            return skipped
+
+        ratings = ratings[rows]
+        episodes = episodes[rows].astype(np.int64)
+        years = years[rows]
+        # NaN fails the comparison, so missing vote counts become None too
+        vote_values = [int(count) if count >= 0 else None for count in votes[rows].tolist()]
+        has_year = ~np.isnan(years)
+        year_column = np.where(has_year, years, 0).astype(np.int64)
+
+        titles = df[columns["title"]].iloc[rows].fillna("").astype(str).str.strip().tolist()
+        languages = df[columns["language"]].iloc[rows].fillna("").astype(str).str.strip().tolist()
+        # intern the languages so every show in the same language shares one string
+        languages = [sys.intern(language) for language in languages]
+
+        # each distinct genres cell is parsed once; equal genre tuples share one shared pair
+        parsed = {}
+        genre_pairs = []
+        for value in df[columns["genre"]].iloc[rows].tolist():
+            key = tuple(value) if isinstance(value, list) else value
+            try:
+                pair = parsed.get(key)
+            except TypeError:
+                # unhashable cells are parsed every time
+                pair = None
+                key = None
+            if pair is None:
+                pair = _shared_genres(_parse_genre_value(value))
+                if key is not None:
+                    parsed[key] = pair
+            genre_pairs.append(pair)
+
+        year_values = [
+            year if present else None
+            for year, present in zip(year_column.tolist(), has_year.tolist())
+        ]
+        new_shows = [
+            TVShow._trusted(title, pair, num_episodes, avg_rating, language, year, vote_count)
+            for title, pair, num_episodes, avg_rating, language, year, vote_count in zip(
+                titles, genre_pairs, episodes.tolist(), ratings.tolist(), languages, year_values, vote_values
+            )
+        ]
+        self._add_validated(
+            new_shows,
+            columns={
+                "ratings": ratings,
+                "episodes": episodes,
+                "years": np.where(has_year, year_column, MISSING_YEAR),
+                "year_values": year_values,
+                "languages": languages,
+                "genres": [pair[0] for pair in genre_pairs],
+            },
+        )
+        if profile:
+            PROFILER.record_load(
+                "ShowRecommender.add_shows_from_dataframe",
+                time.perf_counter() - started,
+                len(valid),
+                len(rows),
+                reasons,
+            )
+        return skipped
+
+    @staticmethod
+    def _dataframe_skip_reasons(ratings, episodes):
+        """This counts why add_shows_from_dataframe() skipped rows, for the profiler. Every row is
+        counted once, under the first check it failed (in the order of the CSV loaders).
+        """
+        bad_rating = np.isnan(ratings)
+        out_of_range = ~bad_rating & ((ratings < 0) | (ratings > 10))
+        rating_ok = ~(bad_rating | out_of_range)
+        reasons = {
+            "invalid avg_rating": int(bad_rating.sum()),
+            "avg_rating out of range": int(out_of_range.sum()),
+            "invalid num_episodes": int((rating_ok & np.isnan(episodes)).sum()),
+            "negative num_episodes": int((rating_ok & (episodes < 0)).sum()),
+        }
+        return {reason: count for reason, count in reasons.items() if count}
+
+    @profiled
+    def refresh(self, new_shows, key=None):
+        """This brings the collection up to date with a newer export of the dataset without building
+        a new recommender. new_shows is the full new export (any iterable of TVShow objects, like
+        data_processor.iter_tv_shows_from_tmdb_csv()). Shows are matched by a stable key, by default
+        (title, year); key can be a function that returns another key for a show. Matched shows
+        whose values changed are updated in place, shows that are not in the export any more are
+        deleted and new shows are added at the end. Only the changed shows touch the indexes and
+        statistics. A deleted show's position is filled with one of the last shows, so the order of
+        the collection is not kept. If the export has a key twice, the last show wins.
+
+        This returns a dictionary with the number of shows inserted, updated, deleted and unchanged.
+        """
+        shows = self.shows
+        if self._sql is not None:
+            # compare against shows read in one pass instead of one query per show
+            shows = list(shows)
+        total = len(shows)
+        if key is None:
+            identity = self._get_identity_index()
+        else:
+            keys = [key(show) for show in shows]
+            identity = dict(zip(reversed(keys), range(total - 1, -1, -1)))
+
+        # diff the export against the collection: one dictionary lookup per show
+        matched = bytearray(total)
+        updates = {}
+        inserts = {}
+        for show in new_shows:
+            self._check_show(show)
+            show_key = (show.title, show.year) if key is None else key(show)
+            show_id = identity.get(show_key)
+            if show_id is None:
+                inserts[show_key] = show
+                continue
+            matched[show_id] = 1
+            old = shows[show_id]
+            if old is show or (
+                old.avg_rating == show.avg_rating
+                and old.num_episodes == show.num_episodes
+                and old.genre == show.genre
+                and old.language == show.language
+                and old.title == show.title
+                and old.year == show.year
+                and old.vote_count == show.vote_count
+            ):
+                updates.pop(show_id, None)
+            else:
+                updates[show_id] = show
+
+        # every deleted show below the new size gets one of the kept shows from the end
+        matched = np.frombuffer(bytes(matched), dtype=np.uint8).astype(bool)
+        deleted = np.flatnonzero(~matched)
+        size = total - len(deleted)
+        holes = deleted[deleted < size].tolist()
+        movers = (np.flatnonzero(matched[size:]) + size).tolist()
+        changes = {show_id: show for show_id, show in updates.items() if show_id < size}
+        for hole, mover in zip(holes, movers):
+            changes[hole] = updates.get(mover) or shows[mover]
+        if changes or size < total:
+            self._rewrite_rows(changes, size)
+        if inserts:
+            self._add_validated(list(inserts.values()))
+        return {
+            "inserted": len(inserts),
+            "updated": len(updates),
+            "deleted": len(deleted),
+            "unchanged": total - len(deleted) - len(updates),
+        }
+
+    def find_show(self, title, year=None):
+        """This returns the show with exactly this title and year (the first one if the collection
+        has duplicates), or None. It is a dictionary lookup in the identity index.
+        """
+        show_id = self.find_show_id(title, year)
+        return None if show_id is None else self.shows[show_id]
+
+    def find_show_id(self, title, year=None):
+        """This returns the id (position in shows) of the show with exactly this title and year (the
+        first one if the collection has duplicates), or None. This is the show that a duplicates
+        policy of "skip" or "replace" compares new shows with.
+        """
+        return self._get_identity_index().get((title, year))
 
     def get_total_shows(self):
         """This returns the total number of shows that are in the collection. This is good for
@@ -44,47 +767,57 @@ class ShowRecommender:
         """
         return len(self.shows)
 
+    @profiled
     def filter_by_genre(self, genre):
-        """This filters the shows by a specific genre by using filter() with a lambda expression. It
+        """This filters the shows by a specific genre by looking it up in the genre index. It
         returns a list of TVShow objects that match the genre.
         """
-        # use filters and lambda to find matching shows
-        # lambda function calls each shows' matches_genre()
-        return list(filter(lambda show: show.matches_genre(genre), self.shows))
+        if self._sql is not None:
+            return self._sql.find(genre=genre)
+        # the genre index gives the matching ids directly, in collection order
+        return [self.shows[i] for i in self._genre_ids(genre)]
 
+    @profiled
     def filter_by_rating(self, min_rating):
         """This uses list comprehension to filter shows and it only returns shows with ratings
         that are the same or above the minimum threshold.
         """
-        # uses list comprehension to filter the shows
-        # checks each shows' avg_rating against the min
-        return [show for show in self.shows if show.avg_rating >= min_rating]
+        if self._sql is not None:
+            return self._sql.find(min_rating=min_rating)
+        if self._store is not None:
+            return self._shows_from_mask(self._store.rating_mask(min_rating))
+        # the rating index finds the matching shows with a binary search;
+        # sorting the ids puts them back in collection order
+        return [self.shows[i] for i in sorted(self._rating_order.ids_between(high=-min_rating))]
 
+    @profiled
     def filter_by_episodes(self, min_episodes=None, max_episodes=None):
         """This filters TV shows by their number of episodes by minimum, maximum, or both. This is
         useful when users what to find a shorter show or a longer show depending on their preferences.
         This returns a list of TV show objects that are within the episode range.
         """
-        # start with all shows
-        filtered_shows = self.shows
-        # apply the minimum episode filter if prompted
-        if min_episodes is not None:
-            # list comprehension to keep only shows with enough episodes
-            filtered_shows = [show for show in filtered_shows if show.num_episodes >= min_episodes]
-        # apply maximum episode filter if prompted
-        if max_episodes is not None:
-            # list comprehension to keep only shows within the limit of episodes
-            filtered_shows = [show for show in filtered_shows if show.num_episodes <= max_episodes]
-
-        return filtered_shows
+        if self._sql is not None:
+            return self._sql.find(min_episodes=min_episodes, max_episodes=max_episodes)
+        if self._store is not None:
+            return self._shows_from_mask(self._store.episode_mask(min_episodes, max_episodes))
+        if min_episodes is None and max_episodes is None:
+            # no bounds, so every show matches
+            return list(self.shows)
+        # the episode index finds the range with two binary searches (either bound can be missing)
+        show_ids = self._episode_index.ids_between(min_episodes, max_episodes)
+        return [self.shows[i] for i in sorted(show_ids)]
 
+    @profiled
     def filter_by_language(self, language):
         """This filters the shows by language. This returns the list of TVShow objects in the specific
         language.
         """
-        # uses list comprehension with that is case-insensitive
-        return [show for show in self.shows if show.language.lower() == language.lower()]
+        if self._sql is not None:
+            return self._sql.find(language=language)
+        # the language index is keyed on the lowercase language, so this is case-insensitive
+        return [self.shows[i] for i in self._language_index.get(language.lower())]
 
+    @profiled
     def get_recommendations(
         self,
         genre=None,
@@ -93,102 +826,497 @@ class ShowRecommender:
         max_episodes=None,
         language=None,
         limit=10,
+        scoring=None,
     ):
         """This gets show recommendations based on multiple criteria. It returns a list of recommended
         TVShow objects that are sorted by the rating. This is the main aspect of recommending shows.
         This method will be the main part in returning recommendations to the user in the main file.
+        Results are cached, so repeating the same query is cheap until the collection changes.
+        scoring ranks the matches with a ScoringModel (or a dictionary of its weights) instead of the
+        plain rating, for example {"bayesian_rating": 1.0, "votes": 0.2}. Ties stay in collection order.
         """
+        if isinstance(scoring, dict):
+            scoring = ScoringModel(scoring)
+        # genre and language are case-insensitive, so the cache key uses the lowercase forms
+        key = (
+            "recommendations",
+            genre.lower() if genre else None,
+            min_rating,
+            min_episodes,
+            max_episodes,
+            language.lower() if language else None,
+            limit,
+            None if scoring is None else scoring.key(),
+        )
+        result = self._query_cache.get_or_compute(
+            key,
+            self._version,
+            lambda: self._compute_recommendations(
+                genre, min_rating, min_episodes, max_episodes, language, limit, scoring
+            ),
+        )
+        # hand out a copy so callers can change their list without changing the cache
+        return list(result)
 
-        # start with all show options
-        recommendations = self.shows
+    @profiled
+    def get_recommendations_batch(self, profiles, limit=10, workers=None):
+        """This gets recommendations for many user preference profiles in one call. Each profile is a
+        dictionary with any of the get_recommendations() filters (genre, min_rating, min_episodes,
+        max_episodes, language). Identical profiles are computed once and profiles that share a genre or
+        language reuse the same lookup. Large batches are spread across worker processes (workers=1
+        keeps everything in this process). This returns one list of TVShow objects per profile, in the
+        same order as profiles, each equal to what get_recommendations() would return.
+        """
+        if self._sql is not None:
+            # each distinct profile is one SQL query; repeats come from the query cache
+            return [
+                self.get_recommendations(*normalize_profile(profile), limit=limit) for profile in profiles
+            ]
+        results = evaluate_batch(self, profiles, limit=limit, workers=workers)
+        return [[self.shows[show_id] for show_id in show_ids] for show_ids in results]
 
-        # apply genre filter if the user specified this
-        if genre:
-            # keep only shows that match the specified genre
-            recommendations = [show for show in recommendations if show.matches_genre(genre)]
+    def get_cache_stats(self):
+        """This returns a dictionary with the query cache hit and miss counters, how many results are
+        cached, the cache limit and the current collection version.
+        """
+        stats = self._query_cache.get_stats()
+        stats["version"] = self._version
+        return stats
 
-        # apply min rating filter if the user specified
-        if min_rating is not None:
-            # keep only shows that are rated at or above the minimum criteria
-            recommendations = [show for show in recommendations if show.avg_rating >= min_rating]
-        # apply min episode filter if specified
-        if min_episodes is not None:
-            # keep only the shows that have enough episodes
-            recommendations = [show for show in recommendations if show.num_episodes >= min_episodes]
-        # apply max episode filter if specified
-        if max_episodes is not None:
-            # keep only shows that are within the episode limits
-            recommendations = [show for show in recommendations if show.num_episodes <= max_episodes]
-        # apply language filter if specified
-        if language:
-            # keep shows only in specified language
-            recommendations = [
-                show for show in recommendations if show.language.lower() == language.lower()
-            ]
+    def _compute_recommendations(
+        self, genre, min_rating, min_episodes, max_episodes, language, limit, scoring=None
+    ):
+        """This does the actual work of get_recommendations() when the result is not cached."""
+        if scoring is not None:
+            return self._score_recommendations(
+                genre, min_rating, min_episodes, max_episodes, language, limit, scoring
+            )
+        if self._sql is not None:
+            # the filters, the rating order and the limit all run inside SQLite; SQLite reads a
+            # negative LIMIT as no limit, so a negative limit is applied to the full result here
+            # an empty genre or language means no filter here, like on the other backends
+            shows = self._sql.find(
+                genre or None, min_rating, min_episodes, max_episodes, language or None, by_rating=True,
+                limit=limit if limit is None or limit >= 0 else None,
+            )
+            return shows if limit is None or limit >= 0 else shows[:limit]
+        numeric_filters = (min_rating, min_episodes, max_episodes)
+        if not (genre or language) and all(value is None for value in numeric_filters):
+            # no filters at all, so the answer is the start of the precomputed rating order
+            return self._top_rated_shows(limit)
+
+        # the planner picks the most selective way to find candidates and the order of the checks
+        plan = self._planner.plan(genre, min_rating, min_episodes, max_episodes, language, limit)
+        if not PROFILER.enabled:
+            return self._planner.execute(plan)
+        result = self._planner.execute(plan, trace=True)
+        PROFILER.record_scan("ShowRecommender.get_recommendations", plan.scanned)
+        return result
+
+    def _score_recommendations(self, genre, min_rating, min_episodes, max_episodes, language, limit, scoring):
+        """This ranks the shows that pass the filters with a ScoringModel. The matches are found with
+        a mask over the feature arrays, every match is scored in one vectorized pass and only the
+        best limit are sorted. This works the same way on every backend.
+        """
+        features = self._get_features()
+        ids = features.match_ids(genre, min_rating, min_episodes, max_episodes, language)
+        best = top_k(ids, scoring.scores(features, ids), limit)
+        if PROFILER.enabled:
+            # the filter masks look at every show
+            PROFILER.record_scan("ShowRecommender.get_recommendations", len(features))
+        return [self.shows[show_id] for show_id in best.tolist()]
+
+    def _get_features(self):
+        """This returns the SimilarityEngine with the feature arrays of every show. It is built the
+        first time and afterwards only the shows that are new since last time are added.
+        """
+        if self._similarity is None:
+            self._similarity = SimilarityEngine()
+        if len(self._similarity) < len(self.shows):
+            self._similarity.extend(self.shows[len(self._similarity):])
+        return self._similarity
+
+    def explain(
+        self,
+        genre=None,
+        min_rating=None,
+        min_episodes=None,
+        max_episodes=None,
+        language=None,
+        limit=10,
+    ):
+        """This shows how get_recommendations() runs a query with these filters. It returns a
+        dictionary with the backend, the plan steps in order (each with the estimated number of shows
+        and the number that were actually left after it), the filters that were dropped because every
+        show passes them and how many shows were returned. The query is run but not cached. With a
+        database, the steps are SQLite's query plan and "sql" holds the query.
+        """
+        if self._sql is not None:
+            sql, details = self._sql.explain(
+                genre or None, min_rating, min_episodes, max_episodes, language or None, limit
+            )
+            result = self._compute_recommendations(genre, min_rating, min_episodes, max_episodes, language, limit)
+            return {
+                "backend": "sqlite",
+                "total_shows": len(self.shows),
+                "sql": sql,
+                "steps": [{"step": detail, "estimated_rows": None, "rows": None} for detail in details],
+                "skipped": [],
+                "returned": len(result),
+            }
+        return self._planner.explain(genre, min_rating, min_episodes, max_episodes, language, limit)
+
+    @profiled
+    def similar_to(self, show, k=10):
+        """This finds the k shows that are most like the given show ("more like this"). Shows are
+        compared on their genres (how many they share), rating, number of episodes, year and language,
+        all at once with NumPy. The show itself (same title and year) is left out. This returns a list
+        of up to k TVShow objects, most similar first.
+        """
+        if not isinstance(show, TVShow):
+            raise TypeError("similar_to() needs a TVShow object.")
+
+        features = self._get_features()
 
-        # sort the ratings from highest to lowest and return a limited number of results
-        # uses __lt__ from TVShow Class
-        recommendations.sort(reverse=True)
-        # returns the top limit number of recommendations
-        return recommendations[:limit]
+        # shows equal to the query have the same year, so only that year's shows are checked
+        if self._sql is not None:
+            same_show = self._sql.ids_of(show.title, show.year)
+        else:
+            same_show = [i for i in self._year_index.get(show.year) if self.shows[i] == show]
+        matches = features.top_k(show, k, exclude=same_show)
+        if PROFILER.enabled:
+            # every show is scored
+            PROFILER.record_scan("ShowRecommender.similar_to", len(features))
+        return [self.shows[show_id] for show_id, _ in matches]
 
+    @profiled
     def get_top_rated_shows(self, n=10):
         """This gets the top N highest rated shows. The number of shows to return defaults to 10. This will return a list of the top N highest
         rated TVShow objects.
         """
-        # short shows by highest rating first using the TVShow's comparison operator
-        sorted_shows = sorted(self.shows, reverse=True)
-        # return only top N shows
-        return sorted_shows[:n]
+        return self._top_rated_shows(n)
 
+    def _top_rated_shows(self, n):
+        """This does the work of get_top_rated_shows(). It is not profiled, so get_recommendations()
+        can use it without the profiler counting a get_top_rated_shows() call as well.
+        """
+        if self._sql is not None:
+            return self._sql.find(by_rating=True, limit=_sql_limit(n, len(self.shows)))
+        # the rating order is kept sorted as shows are added, so the top N is just a slice
+        return [self.shows[i] for i in self._rating_order.first_ids(n)]
+
+    @profiled
     def get_all_genres(self):
         """This gets a list of all the genres. It returns a sorted list of genre strings. This helps show users what genre options are
-        available.
-        """
-        # this uses a set to handle duplicates
-        all_genres = set()
-        # this loops through each show in the collection
-        for show in self.shows:
-            # each show can have multiple genres so loop through and check them
-            for genre in show.genre:
-                # add each genre to our set, ignoring duplicates
-                all_genres.add(genre)
-        # convert the set to a sorted list
-        return sorted(list(all_genres))
+        available. The list is cached until the collection changes.
+        """
+        result = self._query_cache.get_or_compute(
+            ("all_genres",), self._version, self._compute_all_genres
+        )
+        return list(result)
 
+    def _compute_all_genres(self):
+        """This does the actual work of get_all_genres() when the result is not cached."""
+        if self._sql is not None:
+            return self._sql.genre_names()
+        # the running genre counts already hold every distinct genre, so no show is visited
+        return sorted(self._stats.genre_counts)
+
+    @profiled
     def get_shows_by_year(self, year):
         """This gets all of the shows that aired in a specific year. The specific year is an int. This returns a list of TVShow objects from
         that year.
         """
-        # uses list comprehension to find all shows from the selected year
-        return [show for show in self.shows if show.year == year]
+        if self._sql is not None:
+            return self._sql.shows_by_year(year)
+        # the year index gives the shows from the selected year directly
+        return [self.shows[i] for i in self._year_index.get(year)]
 
+    @profiled
+    def get_shows_between_years(self, start_year=None, end_year=None):
+        """This gets all of the shows that first aired from start_year to end_year (both included).
+        Either year can be None for an open range. Shows without a year are not included. This
+        returns a list of TVShow objects in collection order.
+        """
+        if self._sql is not None:
+            return self._sql.shows_between_years(start_year, end_year)
+        show_ids = self._year_range_index.ids_between(start_year, end_year)
+        return [self.shows[i] for i in sorted(show_ids)]
+
+    @profiled
     def search_by_title(self, search_term):
         """This looks for shows based on their title. This is case-insensitive. search_term searches in titles. This returns a list of
         TVShow objects with the same titles.
         """
-        # convert the search to lowercase for case-insensitive matching
-        search_term = search_term.lower()
-        # uses list comprehension to find shows with matching titles; uses 'in' for shows that partially match
-        return [show for show in self.shows if search_term in show.title.lower()]
+        if self._sql is not None:
+            return self._sql.search_title(search_term)
+        # the title index stores lowercase titles and only checks shows that share the term's trigrams;
+        # it still uses 'in' on each candidate so shows that partially match are found
+        return [self.shows[i] for i in self._get_title_index().search(search_term)]
+
+    @profiled
+    def fuzzy_search_by_title(self, search_term, limit=10, min_score=0.3):
+        """This looks for shows with titles similar to search_term, so typos like "breking bad" still
+        find "Breaking Bad". Titles are ranked by how many three-letter pieces they share with the
+        search. This returns a list of up to limit TVShow objects, most similar first.
+        """
+        matches = self._get_title_index().fuzzy_search(search_term, limit, min_score)
+        return [self.shows[show_id] for _, show_id in matches]
+
+    def _match_ids(self, filters, start=0):
+        """This yields the ids of the shows that a paged query (see PAGE_QUERIES) matches, in
+        collection order, from show id start on. The matches are found as the caller reads them, so
+        stopping early skips the rest of the work.
+        """
+        if "genre" in filters:
+            target = filters["genre"].lower()
+            postings = [self._genre_index.get(key) for key in self._genre_index.keys() if target in key]
+            previous = None
+            # a show can be under several matching genre keys, so repeats are dropped
+            for show_id in heapq.merge(*(_ids_from(ids, start) for ids in postings)):
+                if show_id != previous:
+                    previous = show_id
+                    yield show_id
+            return
+        if "language" in filters:
+            yield from _ids_from(self._language_index.get(filters["language"].lower()), start)
+            return
+        if "title" in filters:
+            yield from self._get_title_index().iter_search(filters["title"], start)
+            return
+
+        # rating or episode range
+        min_rating = filters.get("min_rating")
+        min_episodes = filters.get("min_episodes")
+        max_episodes = filters.get("max_episodes")
+        if self._store is not None:
+            mask = self._match_mask(filters)
+            for chunk in range(start, len(mask), _MASK_CHUNK_SIZE):
+                yield from (np.flatnonzero(mask[chunk:chunk + _MASK_CHUNK_SIZE]) + chunk).tolist()
+            return
+        if min_rating is not None:
+            index, low, high = self._rating_order, None, -min_rating
+        else:
+            index, low, high = self._episode_index, min_episodes, max_episodes
+        shows = self.shows
+        if index.count_between(low, high) * _SCAN_RATIO < len(shows):
+            # few shows match, so the index finds them all and they are sorted by id
+            yield from _ids_from(sorted(index.ids_between(low, high)), start)
+        elif min_rating is not None:
+            yield from (i for i in range(start, len(shows)) if shows[i].avg_rating >= min_rating)
+        else:
+            for i in range(start, len(shows)):
+                num_episodes = shows[i].num_episodes
+                if (min_episodes is None or num_episodes >= min_episodes) and (
+                    max_episodes is None or num_episodes <= max_episodes
+                ):
+                    yield i
+
+    def _match_mask(self, filters):
+        """This returns the column store mask of the shows a paged query matches."""
+        store = self._store
+        if "genre" in filters:
+            return store.genre_mask(filters["genre"])
+        if "language" in filters:
+            return store.language_mask(filters["language"])
+        if "title" in filters:
+            mask = np.zeros(len(store), dtype=bool)
+            mask[self._get_title_index().search(filters["title"])] = True
+            return mask
+        if "min_rating" in filters:
+            return store.rating_mask(filters["min_rating"])
+        return store.episode_mask(filters.get("min_episodes"), filters.get("max_episodes"))
+
+    def _match_estimate(self, filters):
+        """This returns about how many shows a paged query matches on the list backend (an upper
+        bound for genres, 0 for title searches, whose matches are found by the title index).
+        """
+        if "genre" in filters:
+            target = filters["genre"].lower()
+            return sum(len(self._genre_index.get(key)) for key in self._genre_index.keys() if target in key)
+        if "language" in filters:
+            return len(self._language_index.get(filters["language"].lower()))
+        if "title" in filters:
+            return 0
+        if "min_rating" in filters:
+            return self._rating_order.count_between(high=-filters["min_rating"])
+        return self._episode_index.count_between(filters.get("min_episodes"), filters.get("max_episodes"))
+
+    def _match_check(self, filters):
+        """This returns a function that tells if the show with an id matches a paged query (not
+        used for title searches).
+        """
+        shows = self.shows
+        if "genre" in filters:
+            genre = filters["genre"]
+            return lambda i: shows[i].matches_genre(genre)
+        if "language" in filters:
+            language = filters["language"].lower()
+            return lambda i: shows[i].lowercase_language == language
+        if "min_rating" in filters:
+            min_rating = filters["min_rating"]
+            return lambda i: shows[i].avg_rating >= min_rating
+        low = filters.get("min_episodes")
+        high = filters.get("max_episodes")
+        return lambda i: (low is None or shows[i].num_episodes >= low) and (
+            high is None or shows[i].num_episodes <= high
+        )
+
+    def _iter_query(self, filters):
+        """This yields the shows of a paged query in collection order, building each one only when
+        it is read.
+        """
+        if self._sql is not None:
+            return self._sql.iter_find(**filters)
+        return (self.shows[i] for i in self._match_ids(filters))
+
+    def iter_filter_by_genre(self, genre):
+        """This is like filter_by_genre() but returns an iterator. Shows are looked up as they are
+        read, so taking the first few of a large genre does not build the whole list. The collection
+        should not be changed while the iterator is in use.
+        """
+        return self._iter_query({"genre": genre})
+
+    def iter_filter_by_rating(self, min_rating):
+        """This is like filter_by_rating() but returns an iterator (see iter_filter_by_genre())."""
+        return self._iter_query({"min_rating": min_rating})
+
+    def iter_filter_by_episodes(self, min_episodes=None, max_episodes=None):
+        """This is like filter_by_episodes() but returns an iterator (see iter_filter_by_genre())."""
+        return self._iter_query({"min_episodes": min_episodes, "max_episodes": max_episodes})
+
+    def iter_filter_by_language(self, language):
+        """This is like filter_by_language() but returns an iterator (see iter_filter_by_genre())."""
+        return self._iter_query({"language": language})
+
+    def iter_search_by_title(self, search_term):
+        """This is like search_by_title() but returns an iterator (see iter_filter_by_genre())."""
+        return self._iter_query({"title": search_term})
 
+    @profiled
+    def get_page(self, query, *args, limit=10, offset=0, cursor=None, order="collection"):
+        """This returns one page of a filter or title search as a Page. query is "genre", "rating",
+        "episodes", "language" or "title" and args are the arguments of filter_by_genre(),
+        filter_by_rating(), filter_by_episodes(), filter_by_language() or search_by_title(). The
+        page skips offset matches and holds at most limit shows. order is "collection" (the order of
+        those methods) or "rating" (highest first, ties in collection order).
+
+        page.next_cursor is passed back as cursor to get the next page; it continues where the page
+        stopped instead of skipping the earlier matches again. In collection order, matching stops
+        as soon as the page is full; in rating order, only the best offset + limit matches are
+        sorted. A ValueError is raised for a cursor from another query or from before the collection
+        changed.
+        """
+        names = PAGE_QUERIES.get(query)
+        if names is None:
+            raise ValueError(f"query must be one of {', '.join(PAGE_QUERIES)}.")
+        if order not in PAGE_ORDERS:
+            raise ValueError(f"order must be one of {', '.join(PAGE_ORDERS)}.")
+        if len(args) > len(names):
+            raise TypeError(f"The {query} query takes at most {len(names)} arguments.")
+        if limit < 1 or offset < 0:
+            raise ValueError("limit must be at least 1 and offset cannot be negative.")
+        filters = dict(zip(names, args))
+        skipped, position = 0, None
+        if cursor is not None:
+            skipped, position = decode_cursor(cursor, query, args, order, self._version)
+        by_rating = order == "rating"
+
+        # one show more than the page is looked for, to know whether there is a next page
+        wanted = offset + limit + 1
+        if self._sql is not None:
+            ids, shows = self._sql.find_page(by_rating, limit + 1, offset, position, **filters)
+        else:
+            if not by_rating:
+                ids = list(islice(self._match_ids(filters, position or 0), offset, wanted))
+            elif self._store is not None:
+                ids = np.flatnonzero(self._match_mask(filters))
+                if position is not None:
+                    ratings = self._store.ratings[ids]
+                    rating, last_id = position
+                    ids = ids[(ratings < rating) | ((ratings == rating) & (ids > last_id))]
+                # argpartition finds the best wanted matches, then only they are sorted
+                ids = self._store.top_k(ids, wanted)[offset:].tolist()
+            elif self._match_estimate(filters) * _SCAN_RATIO >= len(self.shows):
+                # many shows match, so walking the rating order best first fills the page quickly
+                start = (None, None) if position is None else (-position[0], position[1])
+                ordered = self._rating_order.iter_after(*start)
+                ids = list(islice(filter(self._match_check(filters), ordered), offset, wanted))
+            else:
+                shows = self.shows
+                ids = self._match_ids(filters)
+                if position is not None:
+                    rating, last_id = position
+                    ids = (
+                        i for i in ids
+                        if shows[i].avg_rating < rating or (shows[i].avg_rating == rating and i > last_id)
+                    )
+                # the ids are in collection order, so nlargest keeps ties in collection order
+                ids = heapq.nlargest(wanted, ids, key=lambda i: shows[i].avg_rating)[offset:]
+            shows = [self.shows[i] for i in ids[:limit]]
+
+        next_cursor = None
+        if len(ids) > limit:
+            ids, shows = ids[:limit], shows[:limit]
+            last = [shows[-1].avg_rating, ids[-1]] if by_rating else ids[-1] + 1
+            next_cursor = encode_cursor(query, args, order, self._version, skipped + offset + limit, last)
+        return Page(shows, next_cursor, skipped + offset)
+
+    @profiled
     def get_statistic(self):
-        """This gets the statistics about the show collection. This returns a dictionary with the statistics."""
-        # handles edge case of empty collection
-        if not self.shows:
-            # returns 0s for empty collections
-            return {"total_shows": 0, "avg_rating": 0, "total_episodes": 0, "total_genres": 0}
-        # find total episodes across all shows using sum() and generator
-        total_episodes = sum(show.num_episodes for show in self.shows)
-        # find avg rating across all shows
-        avg_rating = sum(show.avg_rating for show in self.shows) / len(self.shows)
-        # return a dict with all of the statistics
-        return {
-            "total_shows": len(self.shows),
-            "avg_rating": round(avg_rating, 2),
-            "total_episodes": total_episodes,
-            "total_genres": len(self.get_all_genres()),
-        }
+        """This gets the statistics about the show collection. This returns a dictionary with the statistics.
+        The statistics are cached until the collection changes.
+        """
+        result = self._query_cache.get_or_compute(
+            ("statistic",), self._version, self._compute_statistic
+        )
+        return dict(result)
+
+    def _compute_statistic(self):
+        """This does the actual work of get_statistic() when the result is not cached."""
+        if self._sql is not None:
+            return self._sql.statistic()
+        # the totals are kept up to date by add_show(), so this is O(1) however many shows there are
+        return self._stats.summary()
+
+    def get_running_stats(self):
+        """This returns the RunningStats with the running totals of the list and columnar backends
+        (counts and rating sums per genre, language and year, and the rating histogram). Totals of
+        several recommenders can be added up with RunningStats.merge(). It should not be changed.
+        """
+        return self._stats
+
+    def get_genre_breakdown(self):
+        """This gets how many shows each genre has and their average rating. It returns a dictionary
+        {genre: {"count": int, "avg_rating": float}} with the most common genres first.
+        """
+        if self._sql is not None:
+            return self._sql.genre_breakdown()
+        return self._stats.genre_breakdown()
+
+    def get_language_breakdown(self):
+        """This gets how many shows each (lowercase) language has and their average rating. It returns a
+        dictionary {language: {"count": int, "avg_rating": float}} with the most common languages first.
+        """
+        if self._sql is not None:
+            return self._sql.language_breakdown()
+        return self._stats.language_breakdown()
+
+    def get_rating_histogram(self):
+        """This gets the rating histogram in half-point buckets. It returns (bucket_edges, counts), so
+        it can be drawn with plt.stairs(counts, bucket_edges) or plt.bar().
+        """
+        if self._sql is not None:
+            return self._sql.histogram()
+        return self._stats.histogram()
+
+    def get_year_counts(self):
+        """This gets how many shows first aired in each year. It returns a dictionary {year: count}
+        sorted by year (shows without a year are not included).
+        """
+        if self._sql is not None:
+            return self._sql.year_counts()
+        return self._stats.years()
 
     def __str__(self):
         """Return a user-friendly string representation of the recommender."""
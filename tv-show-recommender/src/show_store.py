@@ -0,0 +1,341 @@
+"""EE551- Engineering Programming: Python. Fall 2025. Columnar show store module.
+This module defines the ColumnarShowStore class. It keeps the numeric fields of every
+TVShow in NumPy arrays (and language/genre as integer codes) so the ShowRecommender can
+answer filters with vectorized boolean masks instead of Python loops.
+"""
+
+import numpy as np
+
+# sentinel stored in the year column for shows that have no year
+MISSING_YEAR = np.iinfo(np.int64).min
+
+# genre code of (owner, code) entries that belong to a row's old genres after it was overwritten
+_DEAD_GENRE = -1
+
+
+class ColumnarShowStore:
+    """This class stores TV show attributes column by column. Row i of every column
+    belongs to the show with id i (its position in ShowRecommender.shows). Ratings,
+    episodes and years are NumPy arrays, languages are integer codes into a vocabulary
+    of lowercased language strings, and genres are stored as a flat array of genre
+    codes plus a parallel array with the id of the show each code belongs to.
+    """
+
+    def __init__(self, capacity=1024):
+        """This makes an empty store. The arrays grow by doubling so appending one
+        show at a time stays cheap (amortized O(1)).
+        """
+        self._size = 0
+        self._ratings = np.empty(capacity, dtype=np.float64)
+        self._episodes = np.empty(capacity, dtype=np.int64)
+        self._years = np.empty(capacity, dtype=np.int64)
+        self._languages = np.empty(capacity, dtype=np.int32)
+
+        # genre codes are variable length per show, so they are kept as (owner, code) pairs
+        self._genre_size = 0
+        self._genre_owners = np.empty(capacity, dtype=np.int64)
+        self._genre_codes = np.empty(capacity, dtype=np.int32)
+        # number of entries marked _DEAD_GENRE; they are removed once they are half of all entries
+        self._dead_genres = 0
+
+        # vocabularies that map strings to integer codes
+        self.language_codes = {}
+        self.genre_codes = {}
+
+    def __len__(self):
+        """This returns the number of shows in the store."""
+        return self._size
+
+    @property
+    def ratings(self):
+        """This returns the rating column (a view, do not modify it)."""
+        return self._ratings[: self._size]
+
+    @property
+    def episodes(self):
+        """This returns the episode count column (a view, do not modify it)."""
+        return self._episodes[: self._size]
+
+    @property
+    def years(self):
+        """This returns the year column. Missing years hold MISSING_YEAR."""
+        return self._years[: self._size]
+
+    @property
+    def languages(self):
+        """This returns the language code column."""
+        return self._languages[: self._size]
+
+    def _language_code(self, language):
+        """This returns the code for a language, adding it to the vocabulary if needed.
+        Languages are compared case-insensitively so the code is based on the lowercase form (None
+        for a language that is not a string, which no language filter matches).
+        """
+        key = language.lower() if isinstance(language, str) else None
+        code = self.language_codes.get(key)
+        if code is None:
+            code = len(self.language_codes)
+            self.language_codes[key] = code
+        return code
+
+    def _genre_code(self, genre):
+        """This returns the code for a genre string, adding it to the vocabulary if needed."""
+        code = self.genre_codes.get(genre)
+        if code is None:
+            code = len(self.genre_codes)
+            self.genre_codes[genre] = code
+        return code
+
+    @staticmethod
+    def _grow(array, needed):
+        """This returns a copy of the array with room for at least needed items."""
+        capacity = max(needed, 2 * len(array), 16)
+        grown = np.empty(capacity, dtype=array.dtype)
+        grown[: len(array)] = array
+        return grown
+
+    def _reserve(self, shows_needed, genres_needed):
+        """This makes sure the show and genre arrays can hold the requested sizes."""
+        if shows_needed > len(self._ratings):
+            self._ratings = self._grow(self._ratings, shows_needed)
+            self._episodes = self._grow(self._episodes, shows_needed)
+            self._years = self._grow(self._years, shows_needed)
+            self._languages = self._grow(self._languages, shows_needed)
+        if genres_needed > len(self._genre_codes):
+            self._genre_owners = self._grow(self._genre_owners, genres_needed)
+            self._genre_codes = self._grow(self._genre_codes, genres_needed)
+
+    def append(self, show):
+        """This adds one TVShow to the end of every column."""
+        self.extend([show])
+
+    def extend(self, shows):
+        """This adds a list of TVShow objects to the end of every column. The new values
+        are collected into Python lists first and copied into the arrays in one step.
+        """
+        shows = list(shows)
+        if not shows:
+            return
+
+        start = self._size
+        ratings = [show.avg_rating for show in shows]
+        episodes = [show.num_episodes for show in shows]
+        years = [MISSING_YEAR if show.year is None else show.year for show in shows]
+        languages = [self._language_code(show.language) for show in shows]
+
+        genre_owners = []
+        genre_codes = []
+        for offset, show in enumerate(shows):
+            for genre in show.genre:
+                genre_owners.append(start + offset)
+                genre_codes.append(self._genre_code(genre))
+
+        end = start + len(shows)
+        genre_start = self._genre_size
+        genre_end = genre_start + len(genre_codes)
+        self._reserve(end, genre_end)
+
+        self._ratings[start:end] = ratings
+        self._episodes[start:end] = episodes
+        self._years[start:end] = years
+        self._languages[start:end] = languages
+        self._genre_owners[genre_start:genre_end] = genre_owners
+        self._genre_codes[genre_start:genre_end] = genre_codes
+
+        self._size = end
+        self._genre_size = genre_end
+
+    def extend_columns(self, ratings, episodes, years, languages, genres):
+        """This adds many shows from columns instead of TVShow objects. ratings, episodes and years
+        are NumPy arrays (years hold MISSING_YEAR for shows without a year), languages is an array
+        of language strings and genres is a list with one tuple of genre strings per show. Only the
+        distinct languages and genre tuples are looked up in the vocabularies.
+        """
+        count = len(ratings)
+        if count == 0:
+            return
+
+        start = self._size
+        end = start + count
+
+        # look every distinct language up once; the other rows reuse its code
+        codes_by_language = {
+            language: self._language_code(language) for language in dict.fromkeys(languages)
+        }
+        language_codes = [codes_by_language[language] for language in languages]
+
+        # same for the genre tuples: most shows share one of a few hundred combinations
+        codes_by_tuple = {}
+        genre_lengths = np.empty(count, dtype=np.int64)
+        flat_codes = []
+        for row, genre_tuple in enumerate(genres):
+            codes = codes_by_tuple.get(genre_tuple)
+            if codes is None:
+                codes = [self._genre_code(genre) for genre in genre_tuple]
+                codes_by_tuple[genre_tuple] = codes
+            genre_lengths[row] = len(codes)
+            flat_codes.extend(codes)
+
+        genre_start = self._genre_size
+        genre_end = genre_start + len(flat_codes)
+        self._reserve(end, genre_end)
+
+        self._ratings[start:end] = ratings
+        self._episodes[start:end] = episodes
+        self._years[start:end] = years
+        self._languages[start:end] = language_codes
+        self._genre_owners[genre_start:genre_end] = np.repeat(np.arange(start, end), genre_lengths)
+        self._genre_codes[genre_start:genre_end] = flat_codes
+
+        self._size = end
+        self._genre_size = genre_end
+
+    def _genre_entries(self, rows, shows):
+        """This returns the (owners, codes) arrays of the genre entries for shows stored at rows."""
+        owners = [row for row, show in zip(rows, shows) for _ in show.genre]
+        codes = [self._genre_code(genre) for show in shows for genre in show.genre]
+        return np.array(owners, dtype=np.int64), np.array(codes, dtype=np.int32)
+
+    def set_rows(self, rows, shows):
+        """This overwrites the given rows with the values of new shows (for example when a show is
+        replaced by a newer version of it). The old genre entries of the rows are marked dead and
+        the new ones are added at the end, so only the changed rows are touched.
+        """
+        if len(rows) == 0:
+            return
+        rows = np.asarray(rows, dtype=np.int64)
+        self._ratings[rows] = [show.avg_rating for show in shows]
+        self._episodes[rows] = [show.num_episodes for show in shows]
+        self._years[rows] = [MISSING_YEAR if show.year is None else show.year for show in shows]
+        self._languages[rows] = [self._language_code(show.language) for show in shows]
+
+        size = self._genre_size
+        dead = np.isin(self._genre_owners[:size], rows)
+        dead &= self._genre_codes[:size] != _DEAD_GENRE
+        self._genre_codes[:size][dead] = _DEAD_GENRE
+        self._dead_genres += int(np.count_nonzero(dead))
+        owners, codes = self._genre_entries(rows.tolist(), shows)
+        self._reserve(self._size, size + len(codes))
+        self._genre_owners[size:size + len(codes)] = owners
+        self._genre_codes[size:size + len(codes)] = codes
+        self._genre_size = size + len(codes)
+        if self._dead_genres * 2 > self._genre_size:
+            self._drop_dead_genres()
+
+    def truncate(self, size):
+        """This drops every row from size on (for example after the last shows were moved into the
+        rows of deleted shows). Their genre entries are marked dead.
+        """
+        if size >= self._size:
+            return
+        genre_size = self._genre_size
+        dead = self._genre_owners[:genre_size] >= size
+        dead &= self._genre_codes[:genre_size] != _DEAD_GENRE
+        self._genre_codes[:genre_size][dead] = _DEAD_GENRE
+        self._dead_genres += int(np.count_nonzero(dead))
+        self._size = size
+        if self._dead_genres * 2 > self._genre_size:
+            self._drop_dead_genres()
+
+    def _drop_dead_genres(self):
+        """This removes the genre entries that were marked dead."""
+        size = self._genre_size
+        alive = self._genre_codes[:size] != _DEAD_GENRE
+        kept = int(np.count_nonzero(alive))
+        self._genre_owners[:kept] = self._genre_owners[:size][alive]
+        self._genre_codes[:kept] = self._genre_codes[:size][alive]
+        self._genre_size = kept
+        self._dead_genres = 0
+
+    def all_mask(self):
+        """This returns a boolean mask that selects every show."""
+        return np.ones(self._size, dtype=bool)
+
+    def genre_mask(self, genre, ids=None):
+        """This returns a mask of shows with a genre that contains the target genre. It uses
+        the same case-insensitive substring rule as TVShow.matches_genre(). When ids (a sorted
+        array of show ids) is given, the mask only covers those shows.
+        """
+        target = genre.lower()
+        # only the (few) distinct genre names are checked with Python string operations
+        matching = [
+            code for name, code in self.genre_codes.items() if isinstance(name, str) and target in name.lower()
+        ]
+        mask = np.zeros(self._size, dtype=bool)
+        if matching:
+            # a lookup table over the genre codes is much faster than np.isin() on every row; its
+            # extra last slot is what dead entries (code -1) look up, and it stays False
+            table = np.zeros(len(self.genre_codes) + 1, dtype=bool)
+            table[matching] = True
+            rows = np.flatnonzero(table[self._genre_codes[: self._genre_size]])
+            mask[self._genre_owners[: self._genre_size].take(rows)] = True
+        return mask if ids is None else mask[ids]
+
+    def rating_mask(self, min_rating, ids=None):
+        """This returns a mask of shows rated at or above min_rating (only the shows in ids, if given)."""
+        ratings = self.ratings if ids is None else self.ratings[ids]
+        return ratings >= min_rating
+
+    def episode_mask(self, min_episodes=None, max_episodes=None, ids=None):
+        """This returns a mask of shows within the episode range. Either bound can be None.
+        When ids is given, the mask only covers those shows.
+        """
+        episodes = self.episodes if ids is None else self.episodes[ids]
+        mask = np.ones(len(episodes), dtype=bool)
+        if min_episodes is not None:
+            mask &= episodes >= min_episodes
+        if max_episodes is not None:
+            mask &= episodes <= max_episodes
+        return mask
+
+    def language_mask(self, language, ids=None):
+        """This returns a mask of shows in the language (case-insensitive), only covering the shows
+        in ids when it is given.
+        """
+        languages = self.languages if ids is None else self.languages[ids]
+        code = self.language_codes.get(language.lower())
+        if code is None:
+            return np.zeros(len(languages), dtype=bool)
+        return languages == code
+
+    def year_mask(self, year):
+        """This returns a mask of shows that first aired in the year."""
+        if year is None:
+            return self.years == MISSING_YEAR
+        return self.years == year
+
+    def rating_order(self, ids):
+        """This orders show ids from highest to lowest rating. The sort is stable, so shows
+        with the same rating keep their collection order like list.sort(reverse=True).
+        """
+        return ids[np.argsort(-self.ratings[ids], kind="stable")]
+
+    def top_k(self, ids, k):
+        """This returns the k highest rated ids, best first, in the same order as a stable sort by
+        rating would give. np.argpartition finds the k-th best rating in O(n), then only the ids
+        at or above it are sorted.
+        """
+        if k is None or k < 0 or len(ids) <= k:
+            return self.rating_order(ids)[:k]
+        if k == 0:
+            return ids[:0]
+        ratings = self.ratings[ids]
+        cutoff = ratings[np.argpartition(-ratings, k - 1)[k - 1]]
+        # everything above the cutoff is in, ties at the cutoff are taken in collection order
+        above = ids[ratings > cutoff]
+        tied = ids[ratings == cutoff][: k - len(above)]
+        return self.rating_order(np.sort(np.concatenate((above, tied))))
+
+    def total_episodes(self):
+        """This returns the sum of the episode column as an int."""
+        return int(self.episodes.sum())
+
+    def mean_rating(self):
+        """This returns the mean of the rating column as a float (0 when empty)."""
+        if self._size == 0:
+            return 0.0
+        return float(self.ratings.mean())
+
+    def genre_names(self):
+        """This returns every distinct genre string that has been stored."""
+        return list(self.genre_codes)
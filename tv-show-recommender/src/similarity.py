@@ -0,0 +1,289 @@
+"""EE551- Engineering Programming: Python. Fall 2025. Similarity module.
+This module defines the SimilarityEngine class which powers ShowRecommender.similar_to().
+Every show is turned into a feature row (a bit-packed set of genres plus rating, vote count,
+episode count, year and language), and a query scores all shows at once with NumPy. The same
+feature arrays are read by the scoring models in src/scoring.py.
+"""
+
+import numpy as np
+
+# default weight of each feature in the similarity score (they add up to 1)
+DEFAULT_WEIGHTS = {
+    "genre": 0.5,
+    "rating": 0.2,
+    "episodes": 0.1,
+    "year": 0.1,
+    "language": 0.1,
+}
+
+# number of set bits in every possible byte, used when np.bitwise_count is not available
+_BYTE_POPCOUNT = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def _popcount_rows(words):
+    """This returns the number of set bits in each row of a 2D uint64 array."""
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(words).sum(axis=1, dtype=np.int64)
+    as_bytes = words.view(np.uint8).reshape(len(words), -1)
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=1, dtype=np.int64)
+
+
+class SimilarityEngine:
+    """This class holds the feature arrays for a collection of shows and answers "more like this"
+    queries. Genres are stored as bits in rows of 64-bit words (bit g is set when the show has
+    genre code g), so the genre overlap of one show with every other show is a vectorized AND
+    plus a popcount. Row i belongs to the show with id i. Missing years and vote counts are NaN.
+    """
+
+    def __init__(self, weights=None):
+        """This makes an empty engine. weights can override any entry of DEFAULT_WEIGHTS."""
+        self.weights = dict(DEFAULT_WEIGHTS)
+        if weights:
+            unknown = set(weights) - set(DEFAULT_WEIGHTS)
+            if unknown:
+                raise ValueError(f"Unknown similarity features: {sorted(unknown)}")
+            self.weights.update(weights)
+
+        self.genre_codes = {}
+        self.language_codes = {}
+        self._genre_bits = np.zeros((0, 1), dtype=np.uint64)
+        self._genre_counts = np.zeros(0, dtype=np.int64)
+        self._ratings = np.zeros(0, dtype=np.float64)
+        self._votes = np.zeros(0, dtype=np.float64)
+        self._episodes = np.zeros(0, dtype=np.int64)
+        self._log_episodes = np.zeros(0, dtype=np.float64)
+        self._years = np.zeros(0, dtype=np.float64)
+        self._languages = np.zeros(0, dtype=np.int64)
+        # collection-wide numbers used to scale scoring features, computed when first needed
+        self._summary = None
+
+    def __len__(self):
+        """This returns the number of shows in the engine."""
+        return len(self._ratings)
+
+    @property
+    def ratings(self):
+        """This returns the rating of every show (do not modify it)."""
+        return self._ratings
+
+    @property
+    def votes(self):
+        """This returns the vote count of every show as floats, NaN when unknown (do not modify it)."""
+        return self._votes
+
+    @property
+    def log_episodes(self):
+        """This returns log(1 + number of episodes) of every show (do not modify it)."""
+        return self._log_episodes
+
+    @property
+    def years(self):
+        """This returns the year of every show as floats, NaN when unknown (do not modify it)."""
+        return self._years
+
+    def summary(self):
+        """This returns collection-wide numbers that scoring features are scaled with: the mean
+        rating and the 90th percentile vote count of the shows that have votes, the largest log vote
+        count and log episode count, and the first and last year (None without years). It is
+        computed once and kept until the shows change.
+        """
+        if self._summary is None:
+            votes = self._votes
+            voted = votes > 0
+            with_years = self._years[~np.isnan(self._years)]
+            # shows nobody voted on carry no information about the typical rating
+            ratings = self._ratings[voted] if voted.any() else self._ratings
+            self._summary = {
+                "mean_rating": float(ratings.mean()) if len(ratings) else 0.0,
+                "votes_p90": float(np.percentile(votes[voted], 90)) if voted.any() else 1.0,
+                "max_log_votes": float(np.log1p(votes[voted].max())) if voted.any() else 0.0,
+                "max_log_episodes": float(self._log_episodes.max()) if len(self) else 0.0,
+                "first_year": float(with_years.min()) if len(with_years) else None,
+                "last_year": float(with_years.max()) if len(with_years) else None,
+            }
+        return self._summary
+
+    def genre_matches(self, genre, ids):
+        """This returns a boolean array that says which shows in ids have a genre that contains
+        genre (case-insensitive, the same rule as TVShow.matches_genre()).
+        """
+        target = genre.lower()
+        codes = {code for name, code in self.genre_codes.items() if target in name}
+        if not codes:
+            return np.zeros(len(ids), dtype=bool)
+        query_bits = self._pack([codes], self._genre_bits.shape[1])
+        return (self._genre_bits[ids] & query_bits).any(axis=1)
+
+    def match_ids(self, genre=None, min_rating=None, min_episodes=None, max_episodes=None, language=None):
+        """This returns the sorted ids of the shows that pass get_recommendations() style filters,
+        found with one boolean mask over the feature arrays. The rules are the same as the filter
+        methods: genres match by substring and genre and language are case-insensitive.
+        """
+        mask = np.ones(len(self), dtype=bool)
+        if min_rating is not None:
+            mask &= self._ratings >= min_rating
+        if min_episodes is not None:
+            mask &= self._episodes >= min_episodes
+        if max_episodes is not None:
+            mask &= self._episodes <= max_episodes
+        if language:
+            code = self.language_codes.get(language.lower())
+            if code is None:
+                return np.zeros(0, dtype=np.int64)
+            mask &= self._languages == code
+        ids = np.flatnonzero(mask)
+        if genre:
+            # the genre bits are wider than the other columns, so they are only read for the rest
+            ids = ids[self.genre_matches(genre, ids)]
+        return ids
+
+    def _genre_set(self, show, add_new):
+        """This returns the set of genre codes of a show. Genres are matched case-insensitively. If
+        add_new is False, genres the engine has never seen are left out.
+        """
+        codes = set()
+        for key in show.lowercase_genres:
+            code = self.genre_codes.get(key)
+            if code is None:
+                if not add_new:
+                    continue
+                code = len(self.genre_codes)
+                self.genre_codes[key] = code
+            codes.add(code)
+        return codes
+
+    def _pack(self, code_sets, words):
+        """This packs a list of genre code sets into an array of 64-bit words."""
+        bits = np.zeros((len(code_sets), words), dtype=np.uint64)
+        rows = np.repeat(np.arange(len(code_sets)), [len(codes) for codes in code_sets])
+        codes = np.fromiter((code for codes in code_sets for code in codes), dtype=np.uint64)
+        # set every (row, code) bit in one vectorized call
+        np.bitwise_or.at(bits, (rows, codes // 64), np.left_shift(np.uint64(1), codes % 64))
+        return bits
+
+    def extend(self, shows):
+        """This adds the features of a list of shows to the end of the engine."""
+        shows = list(shows)
+        if not shows:
+            return
+
+        code_sets = [self._genre_set(show, add_new=True) for show in shows]
+        words = max(1, (len(self.genre_codes) + 63) // 64)
+        if words > self._genre_bits.shape[1]:
+            # new genres no longer fit, so every existing row gets an extra (empty) word
+            padding = np.zeros((len(self), words - self._genre_bits.shape[1]), dtype=np.uint64)
+            self._genre_bits = np.hstack((self._genre_bits, padding))
+
+        languages = []
+        for show in shows:
+            key = show.lowercase_language
+            languages.append(self.language_codes.setdefault(key, len(self.language_codes)))
+
+        self._genre_bits = np.vstack((self._genre_bits, self._pack(code_sets, words)))
+        self._genre_counts = np.concatenate(
+            (self._genre_counts, [len(codes) for codes in code_sets])
+        )
+        self._ratings = np.concatenate((self._ratings, [show.avg_rating for show in shows]))
+        self._votes = np.concatenate(
+            (self._votes, [np.nan if show.vote_count is None else show.vote_count for show in shows])
+        )
+        episodes = np.array([show.num_episodes for show in shows], dtype=np.int64)
+        self._episodes = np.concatenate((self._episodes, episodes))
+        self._log_episodes = np.concatenate((self._log_episodes, np.log1p(episodes)))
+        self._years = np.concatenate(
+            (self._years, [np.nan if show.year is None else show.year for show in shows])
+        )
+        self._languages = np.concatenate((self._languages, languages))
+        self._summary = None
+
+    def set_rows(self, rows, shows):
+        """This overwrites the features of the given rows with the features of new shows."""
+        if len(rows) == 0:
+            return
+        code_sets = [self._genre_set(show, add_new=True) for show in shows]
+        words = max(1, (len(self.genre_codes) + 63) // 64)
+        if words > self._genre_bits.shape[1]:
+            padding = np.zeros((len(self), words - self._genre_bits.shape[1]), dtype=np.uint64)
+            self._genre_bits = np.hstack((self._genre_bits, padding))
+        rows = np.asarray(rows, dtype=np.int64)
+        self._genre_bits[rows] = self._pack(code_sets, self._genre_bits.shape[1])
+        self._genre_counts[rows] = [len(codes) for codes in code_sets]
+        self._ratings[rows] = [show.avg_rating for show in shows]
+        self._votes[rows] = [np.nan if show.vote_count is None else show.vote_count for show in shows]
+        self._episodes[rows] = [show.num_episodes for show in shows]
+        self._log_episodes[rows] = np.log1p(self._episodes[rows])
+        self._years[rows] = [np.nan if show.year is None else show.year for show in shows]
+        self._languages[rows] = [
+            self.language_codes.setdefault(show.lowercase_language, len(self.language_codes))
+            for show in shows
+        ]
+        self._summary = None
+
+    def truncate(self, size):
+        """This drops the features of every row from size on."""
+        self._genre_bits = self._genre_bits[:size]
+        self._genre_counts = self._genre_counts[:size]
+        self._ratings = self._ratings[:size]
+        self._votes = self._votes[:size]
+        self._episodes = self._episodes[:size]
+        self._log_episodes = self._log_episodes[:size]
+        self._years = self._years[:size]
+        self._languages = self._languages[:size]
+        self._summary = None
+
+    def scores(self, show):
+        """This returns an array with the similarity (0 to 1) between show and every show in the
+        engine. The genre part is the Jaccard similarity of the genre sets; rating, episode count
+        and year are compared after scaling them to 0-1 over the collection; language is 1 for the
+        same language and 0 otherwise.
+        """
+        weights = self.weights
+
+        # genre Jaccard similarity: |A and B| / |A or B|
+        query_codes = self._genre_set(show, add_new=False)
+        query_bits = self._pack([query_codes], self._genre_bits.shape[1])
+        shared = _popcount_rows(self._genre_bits & query_bits)
+        # genres the collection has never seen still count towards the union
+        query_size = len(set(show.lowercase_genres))
+        union = self._genre_counts + query_size - shared
+        genre_score = np.divide(
+            shared, union, out=np.zeros(len(self), dtype=np.float64), where=union > 0
+        )
+        score = weights["genre"] * genre_score
+
+        score += weights["rating"] * (1 - np.abs(self._ratings - show.avg_rating) / 10)
+
+        max_log_episodes = max(float(self._log_episodes.max()), np.log1p(show.num_episodes), 1.0)
+        episode_gap = np.abs(self._log_episodes - np.log1p(show.num_episodes)) / max_log_episodes
+        score += weights["episodes"] * (1 - episode_gap)
+
+        if show.year is not None and not np.isnan(self._years).all():
+            first, last = np.nanmin(self._years), np.nanmax(self._years)
+            span = max(last, show.year) - min(first, show.year) or 1
+            year_score = 1 - np.abs(self._years - show.year) / span
+            # shows without a year get no credit for this feature
+            score += weights["year"] * np.nan_to_num(year_score, nan=0.0)
+
+        language = self.language_codes.get(show.lowercase_language)
+        if language is not None:
+            score += weights["language"] * (self._languages == language)
+
+        return score
+
+    def top_k(self, show, k, exclude=()):
+        """This returns up to k (show_id, score) pairs with the highest scores for show, best first.
+        Ids in exclude are skipped. Ties are broken by collection order.
+        """
+        if k <= 0 or len(self) == 0:
+            return []
+        score = self.scores(show)
+        if len(exclude):
+            score[np.asarray(list(exclude), dtype=np.int64)] = -np.inf
+        candidates = np.flatnonzero(np.isfinite(score))
+        if k < len(candidates):
+            # argpartition finds the k best in O(n); only those are sorted afterwards
+            cutoff = score[candidates][np.argpartition(-score[candidates], k - 1)[k - 1]]
+            candidates = candidates[score[candidates] >= cutoff]
+        order = np.lexsort((candidates, -score[candidates]))
+        best = candidates[order][:k]
+        return list(zip(best.tolist(), score[best].tolist()))
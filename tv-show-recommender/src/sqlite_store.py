@@ -0,0 +1,555 @@
+"""EE551- Engineering Programming: Python. Fall 2025. SQLite show store module.
+This module defines the SQLiteShowStore class, a storage engine for ShowRecommender that keeps
+the shows in a SQLite database (standard library sqlite3) instead of Python objects. The shows
+table has one row per show and the show_genre table links shows to the genres table. Filters,
+recommendations, title searches and statistics run as SQL on indexed columns, with the ORDER BY
+and LIMIT done by SQLite, and TVShow objects are only created for the rows a query returns.
+"""
+
+import numbers
+import sqlite3
+import threading
+from collections.abc import Sequence
+from contextlib import contextmanager
+
+from .tv_show import TVShow, _shared_genres
+
+# width of one rating histogram bucket, the same as RunningStats
+RATING_BUCKET_WIDTH = 0.5
+RATING_BUCKETS = int(10 / RATING_BUCKET_WIDTH)
+
+# the id of a show is its position in ShowRecommender.shows (0, 1, 2, ...). avg_rating has no
+# type, so SQLite keeps a rating as the int or float it was given (a REAL column turns 8 into 8.0)
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS shows (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    title_lower TEXT NOT NULL,
+    num_episodes INTEGER NOT NULL,
+    avg_rating NOT NULL,
+    language TEXT NOT NULL,
+    language_lower TEXT NOT NULL,
+    year INTEGER,
+    vote_count INTEGER
+);
+CREATE TABLE IF NOT EXISTS genres (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS show_genre (
+    show_id INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    genre_id INTEGER NOT NULL,
+    PRIMARY KEY (show_id, position)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS show_genre_by_genre ON show_genre (genre_id, show_id);
+CREATE INDEX IF NOT EXISTS shows_by_rating ON shows (avg_rating DESC, id);
+CREATE INDEX IF NOT EXISTS shows_by_episodes ON shows (num_episodes);
+CREATE INDEX IF NOT EXISTS shows_by_language ON shows (language_lower);
+CREATE INDEX IF NOT EXISTS shows_by_year ON shows (year);
+CREATE INDEX IF NOT EXISTS shows_by_title ON shows (title, year);
+"""
+
+# columns read to build a TVShow; the genre ids of a show come as one comma-separated string
+_SHOW_COLUMNS = (
+    "s.id, s.title, s.num_episodes, s.avg_rating, s.language, s.year, s.vote_count, (SELECT group_concat(genre_id)"
+    " FROM (SELECT genre_id FROM show_genre WHERE show_id = s.id ORDER BY position))"
+)
+
+# a query with ORDER BY rating and a LIMIT first looks for its matches among the best rated
+# _PROBE_FACTOR * limit shows (at least _MIN_PROBE), walking the rating index from the top
+_PROBE_FACTOR = 64
+_MIN_PROBE = 2048
+
+# order of recommendations: highest rating first, ties in collection order
+_RATING_ORDER = "s.avg_rating DESC, s.id"
+
+# rows fetched at a time when iterating over every show, and by the first query of iter_find()
+_FETCH_SIZE = 10000
+_FIRST_FETCH_SIZE = 64
+
+
+class SQLiteShowStore:
+    """This class stores TV shows in a SQLite database. Row id i of the shows table belongs to the
+    show with id i. Genre names are kept once in the genres table; the genre ids of each show are
+    in show_genre with their position, so a show's genres come back in the same order. The
+    connection can be used from several threads (the service runs queries on worker threads);
+    every statement runs under one lock.
+    """
+
+    def __init__(self, path=":memory:"):
+        """This opens (or creates) the database at path. An existing database is used as it is,
+        so a collection saved in a file can be opened again later.
+        """
+        self.path = path
+        # statements are committed explicitly (see transaction()), not by sqlite3 itself
+        self._connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._lock = threading.RLock()
+        # depth of nested transaction() blocks; the outermost one commits
+        self._depth = 0
+        with self._lock:
+            self._connection.executescript(SCHEMA)
+            columns = [row[1] for row in self._connection.execute("PRAGMA table_info(shows)")]
+            if "vote_count" not in columns:
+                # databases made before vote counts were stored get the column (unknown for every show)
+                self._connection.execute("ALTER TABLE shows ADD COLUMN vote_count INTEGER")
+        self._load_counts()
+
+    def _load_counts(self):
+        """This reads the number of shows and the genre vocabulary from the database."""
+        with self._lock:
+            self._size = self._connection.execute("SELECT COUNT(*) FROM shows").fetchone()[0]
+            # genre id -> name and name -> genre id, and the lowercase names for genre matching
+            self._genre_names = dict(self._connection.execute("SELECT id, name FROM genres"))
+        self._genre_ids = {name: genre_id for genre_id, name in self._genre_names.items()}
+        self._genre_lower = {genre_id: name.lower() for genre_id, name in self._genre_names.items()}
+        # comma-separated genre ids -> shared (genres, lowercase genres) pair
+        self._genre_pairs = {None: _shared_genres(())}
+
+    def __len__(self):
+        """This returns the number of shows in the store."""
+        return self._size
+
+    def close(self):
+        """This closes the database connection."""
+        with self._lock:
+            self._connection.close()
+
+    @contextmanager
+    def transaction(self):
+        """This runs the statements of a with block in one transaction. Blocks can be nested; the
+        outermost one commits. If SQLite fails, everything since the outermost block started is
+        rolled back. Other errors (like an invalid show found by the caller) still commit the
+        statements that already ran, so writes check their rows (see check_show()) before the first
+        statement.
+        """
+        with self._lock:
+            if self._depth == 0:
+                self._connection.execute("BEGIN")
+            self._depth += 1
+            try:
+                yield
+            except sqlite3.Error:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._connection.execute("ROLLBACK")
+                    self._load_counts()
+                raise
+            except BaseException:
+                self._depth -= 1
+                if self._depth == 0:
+                    self._connection.execute("COMMIT")
+                raise
+            self._depth -= 1
+            if self._depth == 0:
+                self._connection.execute("COMMIT")
+
+    def analyze(self):
+        """This updates the statistics SQLite uses to choose between indexes (run after a bulk load)."""
+        with self._lock:
+            self._connection.execute("ANALYZE")
+
+    def _genre_id(self, name):
+        """This returns the id of a genre name, adding it to the genres table if it is new."""
+        genre_id = self._genre_ids.get(name)
+        if genre_id is None:
+            genre_id = len(self._genre_names)
+            self._connection.execute("INSERT INTO genres (id, name) VALUES (?, ?)", (genre_id, name))
+            self._genre_names[genre_id] = name
+            self._genre_ids[name] = genre_id
+            self._genre_lower[genre_id] = name.lower()
+        return genre_id
+
+    @staticmethod
+    def check_show(show):
+        """This raises a ValueError if a show cannot be stored: the title, the language and every
+        genre must be strings (they are stored next to their lowercase forms) and the year must be
+        a whole number or None.
+        """
+        if not isinstance(show.title, str) or not isinstance(show.language, str):
+            raise ValueError("Titles and languages stored in SQLite must be strings.")
+        if not all(isinstance(genre, str) for genre in show.genre):
+            raise ValueError("Genres stored in SQLite must be strings.")
+        if show.year is not None and not isinstance(show.year, numbers.Integral):
+            raise ValueError("Years stored in SQLite must be whole numbers or None.")
+
+    def _write_rows(self, first_id, shows):
+        """This writes shows with ids from first_id on into both tables with executemany(). Every
+        show is checked with check_show() first, so an invalid show raises a ValueError before
+        anything is written (and nothing half-written can be committed).
+        """
+        for show in shows:
+            self.check_show(show)
+        self._connection.executemany(
+            "INSERT INTO shows (id, title, title_lower, num_episodes, avg_rating, language,"
+            " language_lower, year, vote_count) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                (show_id, show.title, show.title.lower(), show.num_episodes, show.avg_rating,
+                 show.language, show.language.lower(), None if show.year is None else int(show.year),
+                 show.vote_count)
+                for show_id, show in enumerate(shows, first_id)
+            ),
+        )
+        self._connection.executemany(
+            "INSERT INTO show_genre (show_id, position, genre_id) VALUES (?, ?, ?)",
+            [
+                (show_id, position, self._genre_id(genre))
+                for show_id, show in enumerate(shows, first_id)
+                for position, genre in enumerate(show.genre)
+            ],
+        )
+
+    def insert(self, shows):
+        """This adds a list of TVShow objects after the existing shows in one transaction (or in
+        the caller's transaction, if one is open).
+        """
+        shows = list(shows)
+        if not shows:
+            return
+        with self.transaction():
+            self._write_rows(self._size, shows)
+            self._size += len(shows)
+
+    def rewrite(self, changes, size):
+        """This changes the database in place: changes maps a show id below size to the show that
+        is stored there from now on, and every show from size on is deleted.
+        """
+        with self.transaction():
+            rows = [(show_id,) for show_id in changes]
+            self._connection.executemany("DELETE FROM shows WHERE id = ?", rows)
+            self._connection.executemany("DELETE FROM show_genre WHERE show_id = ?", rows)
+            self._connection.execute("DELETE FROM shows WHERE id >= ?", (size,))
+            self._connection.execute("DELETE FROM show_genre WHERE show_id >= ?", (size,))
+            for show_id, show in changes.items():
+                self._write_rows(show_id, [show])
+            self._size = size
+
+    def _shows_from_rows(self, rows):
+        """This turns query rows into TVShow objects. The rows were valid when they were stored, so
+        the TVShow checks are not run again. Shows with the same genres share one genre tuple.
+        """
+        pairs = self._genre_pairs
+        shows = []
+        for _, title, num_episodes, avg_rating, language, year, vote_count, genre_ids in rows:
+            pair = pairs.get(genre_ids)
+            if pair is None:
+                names = tuple(self._genre_names[int(genre_id)] for genre_id in genre_ids.split(","))
+                pair = pairs[genre_ids] = _shared_genres(names)
+            shows.append(TVShow._trusted(title, pair, num_episodes, avg_rating, language, year, vote_count))
+        return shows
+
+    def _select(self, where="", params=(), order="s.id", limit=None, source="shows s", offset=0):
+        """This returns the SQL (and its parameters) that reads the shows of source (the shows
+        table as s, possibly with an INDEXED BY) matching where, in the given order, skipping the
+        first offset matches and with at most limit shows (None means all).
+        """
+        sql = f"SELECT {_SHOW_COLUMNS} FROM {source} {where} ORDER BY {order} LIMIT ? OFFSET ?"
+        return sql, (*params, -1 if limit is None else limit, offset)
+
+    def _query(self, where="", params=(), order="s.id", limit=None):
+        """This runs _select() and returns the matching shows as TVShow objects."""
+        sql, params = self._select(where, params, order, limit)
+        with self._lock:
+            rows = self._connection.execute(sql, params).fetchall()
+        return self._shows_from_rows(rows)
+
+    def _filters(self, genre=None, min_rating=None, min_episodes=None, max_episodes=None, language=None,
+                 title=None, after=None, by_rating=False, per_row=False):
+        """This turns get_recommendations() style filters (plus a title search term) into a WHERE
+        clause and its parameters. It returns None if no show can match. Genres match when the
+        lowercase target is part of a lowercase genre name, like TVShow.matches_genre(), so the
+        matching genre ids are found in the (small) genre vocabulary first. With per_row, the genre
+        is checked with one primary key lookup per show instead of collecting every show of the
+        genre up front.
+
+        after continues a paged query: it is the first show id to return in collection order, or
+        the (rating, id) of the last show already returned if by_rating is True.
+        """
+        conditions = []
+        params = []
+        # an empty genre or language is still a filter, like in the filter_by_*() methods
+        if genre is not None:
+            target = genre.lower()
+            genre_ids = [genre_id for genre_id, name in self._genre_lower.items() if target in name]
+            if not genre_ids:
+                return None
+            marks = ", ".join("?" * len(genre_ids))
+            if per_row:
+                conditions.append(
+                    f"EXISTS (SELECT 1 FROM show_genre WHERE show_id = s.id AND genre_id IN ({marks}))"
+                )
+            else:
+                conditions.append(f"s.id IN (SELECT show_id FROM show_genre WHERE genre_id IN ({marks}))")
+            params.extend(genre_ids)
+        if min_rating is not None:
+            conditions.append("s.avg_rating >= ?")
+            params.append(min_rating)
+        if min_episodes is not None:
+            conditions.append("s.num_episodes >= ?")
+            params.append(min_episodes)
+        if max_episodes is not None:
+            conditions.append("s.num_episodes <= ?")
+            params.append(max_episodes)
+        if language is not None:
+            conditions.append("s.language_lower = ?")
+            params.append(language.lower())
+        if title is not None:
+            # the lowercase titles are stored by Python, so this is term.lower() in title.lower()
+            conditions.append("instr(s.title_lower, ?) > 0")
+            params.append(title.lower())
+        if after is not None and by_rating:
+            # rating order is highest first with ties by id; the first part can use the index
+            rating, show_id = after
+            conditions.append("s.avg_rating <= ? AND (s.avg_rating < ? OR s.id > ?)")
+            params.extend((rating, rating, show_id))
+        elif after is not None:
+            conditions.append("s.id >= ?")
+            params.append(after)
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return where, params
+
+    def _find_rows(self, genre=None, min_rating=None, min_episodes=None, max_episodes=None, language=None,
+                   title=None, by_rating=False, limit=None, offset=0, after=None):
+        """This runs the query of find() and returns the rows (the show id comes first)."""
+        filters = self._filters(genre, min_rating, min_episodes, max_episodes, language, title, after, by_rating)
+        if filters is None:
+            return []
+        order = _RATING_ORDER if by_rating else "s.id"
+        probe = None if limit is None else max((offset + limit) * _PROBE_FACTOR, _MIN_PROBE)
+        if by_rating and filters[0] and probe is not None and probe < self._size:
+            # SQLite does not know that walking the rating index stops after limit matches, so
+            # that plan is tried first on the best rated probe shows (every show rated at least as
+            # high as the probe-th one); the first limit matches there are the answer. Only when
+            # there are fewer does SQLite pick the plan.
+            with self._lock:
+                (cutoff,) = self._connection.execute(
+                    "SELECT avg_rating FROM shows INDEXED BY shows_by_rating"
+                    " ORDER BY avg_rating DESC, id LIMIT 1 OFFSET ?",
+                    (probe - 1,),
+                ).fetchone()
+                where, params = self._filters(genre, min_rating, min_episodes, max_episodes, language,
+                                              title, after, by_rating, per_row=True)
+                sql, params = self._select(f"{where} AND s.avg_rating >= ?", (*params, cutoff), order,
+                                           limit, "shows s INDEXED BY shows_by_rating", offset)
+                rows = self._connection.execute(sql, params).fetchall()
+            if len(rows) == limit:
+                return rows
+        if limit is not None and not by_rating:
+            # walking the ids in order stops once the page is full, which beats collecting every
+            # show of the genre first
+            filters = self._filters(genre, min_rating, min_episodes, max_episodes, language, title, after,
+                                    per_row=True)
+        sql, params = self._select(*filters, order=order, limit=limit, offset=offset)
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    def find(self, genre=None, min_rating=None, min_episodes=None, max_episodes=None, language=None,
+             title=None, by_rating=False, limit=None, offset=0, after=None):
+        """This returns the shows that pass every given filter (title is a search term). They are
+        in collection order, or from highest to lowest rating (ties in collection order) if
+        by_rating is True. The first offset matches are skipped and at most limit are returned;
+        after continues from an earlier page (see _filters()).
+        """
+        return self._shows_from_rows(
+            self._find_rows(genre, min_rating, min_episodes, max_episodes, language, title, by_rating,
+                            limit, offset, after)
+        )
+
+    def find_page(self, by_rating=False, limit=None, offset=0, after=None, **filters):
+        """This is like find() but returns (show ids, shows), so a page can say where it stopped."""
+        rows = self._find_rows(by_rating=by_rating, limit=limit, offset=offset, after=after, **filters)
+        return [row[0] for row in rows], self._shows_from_rows(rows)
+
+    def iter_find(self, **filters):
+        """This yields the shows find() would return in collection order. The first query reads a
+        few shows and each next one twice as many (up to _FETCH_SIZE), so a caller that stops
+        early does not read the rest.
+        """
+        after = 0
+        size = _FIRST_FETCH_SIZE
+        while True:
+            ids, shows = self.find_page(limit=size, after=after, **filters)
+            yield from shows
+            if len(shows) < size:
+                return
+            after = ids[-1] + 1
+            size = min(2 * size, _FETCH_SIZE)
+
+    def explain(self, genre=None, min_rating=None, min_episodes=None, max_episodes=None,
+                language=None, limit=10):
+        """This returns the SQL of a recommendation query and SQLite's query plan for it (one line
+        per step, from EXPLAIN QUERY PLAN).
+        """
+        filters = self._filters(genre, min_rating, min_episodes, max_episodes, language)
+        if filters is None:
+            return None, []
+        sql, params = self._select(*filters, order=_RATING_ORDER, limit=limit)
+        with self._lock:
+            plan = self._connection.execute("EXPLAIN QUERY PLAN " + sql, params).fetchall()
+        return sql, [detail for _, _, _, detail in plan]
+
+    def shows_by_year(self, year):
+        """This returns the shows from year (None finds shows without a year), in collection order."""
+        if year is None:
+            return self._query("WHERE s.year IS NULL")
+        return self._query("WHERE s.year = ?", (year,))
+
+    def shows_between_years(self, start_year=None, end_year=None):
+        """This returns the shows with a year from start_year to end_year, in collection order."""
+        conditions = ["s.year IS NOT NULL"]
+        params = []
+        if start_year is not None:
+            conditions.append("s.year >= ?")
+            params.append(start_year)
+        if end_year is not None:
+            conditions.append("s.year <= ?")
+            params.append(end_year)
+        return self._query("WHERE " + " AND ".join(conditions), params)
+
+    def search_title(self, term):
+        """This returns the shows whose lowercase title contains the lowercase term. The lowercase
+        titles are stored by Python, so the match is the same as term.lower() in title.lower().
+        """
+        return self.find(title=term)
+
+    def shows_between_ids(self, start, end):
+        """This returns the shows with ids from start up to (not including) end."""
+        return self._query("WHERE s.id >= ? AND s.id < ?", (start, end))
+
+    def show(self, show_id):
+        """This returns the show with show_id, or raises an IndexError."""
+        shows = self._query("WHERE s.id = ?", (show_id,))
+        if not shows:
+            raise IndexError("show index out of range")
+        return shows[0]
+
+    def ids_of(self, title, year):
+        """This returns the ids of the shows with exactly this title and year."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id FROM shows WHERE title = ? AND year IS ? ORDER BY id", (title, year)
+            ).fetchall()
+        return [show_id for show_id, in rows]
+
+    def keys(self):
+        """This returns the (title, year) of every show, in collection order."""
+        with self._lock:
+            return self._connection.execute("SELECT title, year FROM shows ORDER BY id").fetchall()
+
+    def iter_titles(self):
+        """This returns the title of every show, in collection order."""
+        with self._lock:
+            rows = self._connection.execute("SELECT title FROM shows ORDER BY id").fetchall()
+        return [title for title, in rows]
+
+    def statistic(self):
+        """This returns the get_statistic() dictionary, computed with SQL aggregates."""
+        with self._lock:
+            count, average, episodes = self._connection.execute(
+                "SELECT COUNT(*), AVG(avg_rating), SUM(num_episodes) FROM shows"
+            ).fetchone()
+            genres = self._connection.execute(
+                "SELECT COUNT(DISTINCT genre_id) FROM show_genre"
+            ).fetchone()[0]
+        if not count:
+            return {"total_shows": 0, "avg_rating": 0, "total_episodes": 0, "total_genres": 0}
+        return {
+            "total_shows": count,
+            "avg_rating": round(average, 2),
+            "total_episodes": episodes,
+            "total_genres": genres,
+        }
+
+    def genre_names(self):
+        """This returns the sorted names of the genres that some show has."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT name FROM genres WHERE id IN (SELECT genre_id FROM show_genre)"
+            ).fetchall()
+        return sorted(name for name, in rows)
+
+    @staticmethod
+    def _breakdown(rows):
+        """This turns (key, count, rating sum) rows into {key: {"count", "avg_rating"}}."""
+        return {
+            key: {"count": count, "avg_rating": round(rating_sum / count, 2)}
+            for key, count, rating_sum in rows
+        }
+
+    def genre_breakdown(self):
+        """This returns the number of shows and average rating per genre, most common first (ties by
+        name), like RunningStats. A show that lists a genre twice counts once.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT g.name, COUNT(*), SUM(s.avg_rating)"
+                " FROM (SELECT DISTINCT show_id, genre_id FROM show_genre) sg"
+                " JOIN shows s ON s.id = sg.show_id JOIN genres g ON g.id = sg.genre_id"
+                " GROUP BY sg.genre_id ORDER BY COUNT(*) DESC, g.name"
+            ).fetchall()
+        return self._breakdown(rows)
+
+    def language_breakdown(self):
+        """This returns the number of shows and average rating per lowercase language, most common
+        first (ties by name).
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT language_lower, COUNT(*), SUM(avg_rating) FROM shows"
+                " GROUP BY language_lower ORDER BY COUNT(*) DESC, language_lower"
+            ).fetchall()
+        return self._breakdown(rows)
+
+    def histogram(self):
+        """This returns (bucket_edges, counts) for the rating histogram, like RunningStats."""
+        counts = [0] * RATING_BUCKETS
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT MIN(CAST(avg_rating / ? AS INTEGER), ?), COUNT(*) FROM shows GROUP BY 1",
+                (RATING_BUCKET_WIDTH, RATING_BUCKETS - 1),
+            ).fetchall()
+        for bucket, count in rows:
+            counts[bucket] = count
+        edges = [i * RATING_BUCKET_WIDTH for i in range(RATING_BUCKETS + 1)]
+        return edges, counts
+
+    def year_counts(self):
+        """This returns the number of shows per year, sorted by year (shows without a year are left out)."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT year, COUNT(*) FROM shows WHERE year IS NOT NULL GROUP BY year ORDER BY year"
+            ).fetchall()
+        return dict(rows)
+
+
+class SQLiteShowList(Sequence):
+    """This class is a read-only list view of the shows in a SQLiteShowStore, used as
+    ShowRecommender.shows. Reading a show (or a slice) runs a query and builds new TVShow objects;
+    nothing is kept in memory.
+    """
+
+    def __init__(self, store):
+        """This makes a view of the shows in store."""
+        self._store = store
+
+    def __len__(self):
+        """This returns the number of shows."""
+        return len(self._store)
+
+    def __getitem__(self, index):
+        """This returns the show at index, or a list of shows for a slice."""
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step == 1:
+                return self._store.shows_between_ids(start, stop) if start < stop else []
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("show index out of range")
+        return self._store.show(index)
+
+    def __iter__(self):
+        """This iterates over every show, reading _FETCH_SIZE shows per query."""
+        for start in range(0, len(self), _FETCH_SIZE):
+            yield from self._store.shows_between_ids(start, start + _FETCH_SIZE)
@@ -0,0 +1,172 @@
+"""EE551- Engineering Programming: Python. Fall 2025. Title index module.
+This module defines the TitleIndex class. It keeps every title in lowercase and maps each
+three-character piece of a title (a trigram) to the shows that contain it, so title searches
+only have to check a few candidate shows instead of the whole collection.
+"""
+
+import bisect
+import heapq
+from collections import defaultdict
+
+from src.show_index import merge_sorted, remove_sorted
+
+# a posting list that gets or loses fewer than this many ids is changed in place one id at a time;
+# for more, it is copied once (see merge_sorted() and remove_sorted())
+_SLICE_THRESHOLD = 8
+
+
+def _trigrams(text):
+    """This returns the set of all three-character substrings of text."""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def _normalize(title):
+    """This returns the lowercase form of a title. A title that is not a string is indexed as an
+    empty title, so only an empty search term finds it.
+    """
+    return title.lower() if isinstance(title, str) else ""
+
+
+class TitleIndex:
+    """This class is a trigram index over show titles. Titles are padded with one space on each
+    side before they are split into trigrams, so the start and end of a title get their own
+    trigrams (this helps fuzzy matching). Show ids are added in increasing order, so every
+    posting list is sorted.
+    """
+
+    def __init__(self):
+        """This makes an empty title index."""
+        # lowercase title for every show id
+        self._titles = []
+        # trigram -> list of show ids whose padded lowercase title contains it
+        self._postings = {}
+        # number of distinct trigrams in each padded title (used for fuzzy scores)
+        self._trigram_counts = []
+
+    def __len__(self):
+        """This returns the number of indexed titles."""
+        return len(self._titles)
+
+    def add(self, show_id, title):
+        """This adds the title of the show with show_id. Ids must be added in order 0, 1, 2, ..."""
+        normalized = _normalize(title)
+        trigrams = _trigrams(f" {normalized} ")
+        self._titles.append(normalized)
+        self._trigram_counts.append(len(trigrams))
+        for trigram in trigrams:
+            postings = self._postings.get(trigram)
+            if postings is None:
+                self._postings[trigram] = [show_id]
+            else:
+                postings.append(show_id)
+
+    def rewrite(self, titles, size):
+        """This changes the titles of some shows and drops every show from size on. titles maps a
+        show id below size to its new title. Only the posting lists of the old and new trigrams of
+        those shows are touched.
+        """
+        removed = defaultdict(set)
+        for show_id in list(titles) + list(range(size, len(self._titles))):
+            for trigram in _trigrams(f" {self._titles[show_id]} "):
+                removed[trigram].add(show_id)
+        for trigram, show_ids in removed.items():
+            postings = self._postings[trigram]
+            if len(show_ids) < _SLICE_THRESHOLD:
+                for show_id in show_ids:
+                    del postings[bisect.bisect_left(postings, show_id)]
+            else:
+                postings = self._postings[trigram] = remove_sorted(postings, sorted(show_ids))
+            if not postings:
+                del self._postings[trigram]
+
+        del self._titles[size:]
+        del self._trigram_counts[size:]
+        added = defaultdict(list)
+        for show_id, title in titles.items():
+            normalized = _normalize(title)
+            trigrams = _trigrams(f" {normalized} ")
+            self._titles[show_id] = normalized
+            self._trigram_counts[show_id] = len(trigrams)
+            for trigram in trigrams:
+                added[trigram].append(show_id)
+        for trigram, show_ids in added.items():
+            postings = self._postings.setdefault(trigram, [])
+            if len(show_ids) < _SLICE_THRESHOLD:
+                for show_id in show_ids:
+                    bisect.insort(postings, show_id)
+            else:
+                self._postings[trigram] = merge_sorted(postings, sorted(show_ids))
+
+    def _candidates(self, term):
+        """This returns the sorted ids of shows whose title has every trigram of the lowercase term
+        (at least 3 characters long). They still have to be checked with 'in'.
+        """
+        posting_lists = []
+        for trigram in _trigrams(term):
+            postings = self._postings.get(trigram)
+            if postings is None:
+                # a trigram of the term that no title has means nothing can match
+                return []
+            posting_lists.append(postings)
+
+        # every matching title has all trigrams of the term, so intersect from the smallest list
+        posting_lists.sort(key=len)
+        candidates = posting_lists[0]
+        for postings in posting_lists[1:]:
+            if len(candidates) < 64 or len(postings) > 4 * len(candidates):
+                # checking the remaining candidates directly is cheaper than another intersection
+                break
+            other_ids = set(postings)
+            candidates = [show_id for show_id in candidates if show_id in other_ids]
+        return candidates
+
+    def search(self, term):
+        """This returns the sorted ids of shows whose lowercase title contains the lowercase term.
+        This gives exactly the same shows as checking term.lower() in title.lower() for every show.
+        """
+        term = term.lower()
+        titles = self._titles
+        if len(term) < 3:
+            # too short for a trigram, so check the stored lowercase titles directly
+            return [show_id for show_id, title in enumerate(titles) if term in title]
+        # having the trigrams does not mean they are in the right order, so check each candidate
+        return [show_id for show_id in self._candidates(term) if term in titles[show_id]]
+
+    def iter_search(self, term, start=0):
+        """This is like search() but yields the ids one at a time, starting from show id start, so a
+        caller that stops after a few matches does not check the rest of the candidates.
+        """
+        term = term.lower()
+        titles = self._titles
+        if len(term) < 3:
+            candidates = range(start, len(titles))
+        else:
+            matches = self._candidates(term)
+            candidates = (matches[i] for i in range(bisect.bisect_left(matches, start), len(matches)))
+        for show_id in candidates:
+            if term in titles[show_id]:
+                yield show_id
+
+    def fuzzy_search(self, term, limit=10, min_score=0.3):
+        """This ranks titles by how similar they are to the term, so small typos still match. The
+        score is the Jaccard similarity of the two trigram sets (shared trigrams divided by all
+        distinct trigrams). It returns up to limit (score, show_id) pairs, best first.
+        """
+        query = _trigrams(f" {term.lower()} ")
+        if not query:
+            return []
+
+        # count how many query trigrams each title shares
+        shared = {}
+        for trigram in query:
+            for show_id in self._postings.get(trigram, ()):
+                shared[show_id] = shared.get(show_id, 0) + 1
+
+        scored = []
+        for show_id, count in shared.items():
+            score = count / (len(query) + self._trigram_counts[show_id] - count)
+            if score >= min_score:
+                scored.append((score, -show_id))
+        # ties on the score are broken by collection order
+        best = heapq.nlargest(limit, scored)
+        return [(score, -negative_id) for score, negative_id in best]
@@ -2,6 +2,37 @@
 Module defines the TVShow class. This represents a single TV show with attributes
 including the title, genre, rating, and number of episodes.
 """
+import sys
+
+# cache of genre tuples so shows with the same genres share one tuple (and one lowercase copy)
+_genre_tuples = {}
+
+# most genre tuples the cache keeps; a real catalog has a few thousand distinct ones, so the cache
+# is only emptied when genres are made up per show (and then shows stop sharing, nothing else)
+_GENRE_CACHE_SIZE = 16384
+
+
+def _shared_genres(genres):
+    """This returns the shared (genres, lowercase genres) pair for a tuple of genres. The genre
+    strings are interned, so every show with the same genres points at the same objects. Genres
+    that are not strings (such as None or NaN from a data file) are kept as they are but have no
+    lowercase form, so no genre filter matches them.
+    """
+    shared = _genre_tuples.get(genres)
+    if shared is None:
+        interned = tuple(sys.intern(g) if type(g) is str else g for g in genres)
+        shared = (interned, tuple(g.lower() for g in interned if isinstance(g, str)))
+        if len(_genre_tuples) >= _GENRE_CACHE_SIZE:
+            _genre_tuples.clear()
+        _genre_tuples[interned] = shared
+    return shared
+
+
+def _unpickle_show(cls, title, genres, num_episodes, avg_rating, language, year, vote_count):
+    """This rebuilds a pickled show (see TVShow.__reduce__()). The genres go through
+    _shared_genres() again, so unpickled shows share genre tuples like loaded ones do.
+    """
+    return cls._trusted(title, _shared_genres(genres), num_episodes, avg_rating, language, year, vote_count)
 
 
 class TVShow:
@@ -9,17 +40,26 @@ class TVShow:
     the title of the show (which is a string), the genre or genres of the show (which
     is a string or a list), the number of episodes (which is an int), the average user
     rating from 0-10 (which is a float), the language of the show (which can be a
-    string), and the year the show first aired (which can be an int).
+    string), the year the show first aired (which can be an int) and the number of votes its
+    rating is based on (which can be an int, or None when it is not known).
+
+    The class uses __slots__ so there is no per-show __dict__, and the genres are stored as a
+    shared tuple, which keeps 150K loaded shows small in memory.
     """
 
-    def __init__(self, title, genre, num_episodes, avg_rating, language="en", year=None):
+    __slots__ = (
+        "title", "_genre", "_genre_lower", "num_episodes", "avg_rating", "language", "year", "vote_count"
+    )
+
+    def __init__(self, title, genre, num_episodes, avg_rating, language="en", year=None, vote_count=None):
         """This makes the TVShow object. This includes the show title (title), genre or
         genres (genre), the number of episodes (num_episodes), the average user rating
-        (avg_rating), the language of the show which defaults to English (language), and
-        the year the show came out which defaults to None.
+        (avg_rating), the language of the show which defaults to English (language), the
+        year the show came out which defaults to None, and the number of votes behind the
+        rating (vote_count) which defaults to None (unknown).
 
         This raises a ValueError if the rating is not between 0 and 10. A ValueError is
-        also raised if the number of episodes is a negative number.
+        also raised if the number of episodes or the number of votes is a negative number.
         """
 
         # validate inputs
@@ -27,13 +67,71 @@ class TVShow:
             raise ValueError("Rating must be between 0 and 10.")
         if num_episodes < 0:
             raise ValueError("Number of episodes cannot be a negative number.")
+        if vote_count is not None and vote_count < 0:
+            raise ValueError("Number of votes cannot be a negative number.")
 
         self.title = title
-        self.genre = genre if isinstance(genre, list) else [genre]
+        self.genre = genre
         self.num_episodes = num_episodes
         self.avg_rating = avg_rating
         self.language = language
         self.year = year
+        self.vote_count = vote_count
+
+    @classmethod
+    def _trusted(cls, title, genres, num_episodes, avg_rating, language, year, vote_count=None):
+        """This makes a TVShow from values that were already checked (for example by the vectorized
+        checks in ShowRecommender.add_shows_from_dataframe()). genres is the (genres, lowercase
+        genres) pair from _shared_genres(). The range checks and the genre setter are skipped.
+        """
+        show = cls.__new__(cls)
+        show.title = title
+        show._genre, show._genre_lower = genres
+        show.num_episodes = num_episodes
+        show.avg_rating = avg_rating
+        show.language = language
+        show.year = year
+        show.vote_count = vote_count
+        return show
+
+    def __reduce__(self):
+        """This tells pickle to rebuild the show with _unpickle_show() from a plain tuple of its
+        values. That is smaller and faster than the default for __slots__ classes, which matters
+        when shows are sent to worker processes.
+        """
+        return (
+            _unpickle_show,
+            (type(self), self.title, self._genre, self.num_episodes, self.avg_rating, self.language,
+             self.year, self.vote_count),
+        )
+
+    @property
+    def genre(self):
+        """This returns the genres of the show as a tuple."""
+        return self._genre
+
+    @genre.setter
+    def genre(self, genre):
+        """This sets the genre or genres of the show. A list (or tuple) of genres is stored as a
+        tuple and a single genre string is wrapped in one. The lowercase form of each genre is saved
+        as well so matches_genre() does not have to lowercase every genre on every call.
+        """
+        genres = tuple(genre) if isinstance(genre, (list, tuple)) else (genre,)
+        self._genre, self._genre_lower = _shared_genres(genres)
+
+    @property
+    def lowercase_genres(self):
+        """This returns the lowercase form of every genre string of the show as a tuple. Genres that
+        are not strings are left out, so they never match a genre filter.
+        """
+        return self._genre_lower
+
+    @property
+    def lowercase_language(self):
+        """This returns the lowercase form of the language. A language that is not a string (such as
+        None or NaN from a data file) gives None, so it never matches a language filter.
+        """
+        return self.language.lower() if isinstance(self.language, str) else None
 
     def __str__(self):
         """This function returns a user-friendly string representation of the TV show."""
@@ -52,7 +150,7 @@ class TVShow:
         """This returns a string representation for debugging."""
 
         return (
-            f"TVShow(title='{self.title}', genre={self.genre}, "
+            f"TVShow(title='{self.title}', genre={list(self.genre)}, "
             f"num_episodes={self.num_episodes}, avg_rating={self.avg_rating}, "
             f"language='{self.language}', year={self.year})"
         )
@@ -66,6 +164,14 @@ class TVShow:
             return False
         return self.title == other.title and self.year == other.year
 
+    def __hash__(self):
+        """This returns a hash that agrees with __eq__ (it uses the title and year), so shows can be
+        put in sets and used as dictionary keys. A show's title and year should not be changed while
+        it is in a set or dictionary.
+        """
+
+        return hash((self.title, self.year))
+
     def __lt__(self, other):
         """This compares TV Shows based on their rating for sorting. This returns a boolean value-
         true if the show has a lower rating than others.
@@ -108,8 +214,9 @@ class TVShow:
         booleran value- true if the show hs a targe genre, and false elsewise.
         """
 
-        # case-insensitive for genres
-        return any(target_genre.lower() in g.lower() for g in self.genre)
+        # case-insensitive for genres (the show's genres are already lowercased)
+        target_genre = target_genre.lower()
+        return any(target_genre in g for g in self._genre_lower)
 
     def is_highly_rated(self, threshold=7.0):
         """This checks if the TV show is highly rated. If the show is a 7.0 or higher,
@@ -118,13 +225,18 @@ class TVShow:
 
         return self.avg_rating >= threshold
 
-    def get_info_dict(self):
-        """This returns the show information as a dictionary."""
-        return {
+    def get_info_dict(self, include_votes=False):
+        """This returns the show information as a dictionary. The number of votes is only added
+        (as "vote_count") when include_votes is True.
+        """
+        info = {
             "title": self.title,
-            "genre": self.genre,
+            "genre": list(self.genre),
             "num_episodes": self.num_episodes,
             "avg_rating": self.avg_rating,
             "language": self.language,
             "year": self.year,
         }
+        if include_votes:
+            info["vote_count"] = self.vote_count
+        return info
@@ -0,0 +1,189 @@
+"""
+This module contains pytest unit tests for the data_processor loaders. A small
+TMDB-shaped CSV file is written to a temporary directory so the tests do not
+depend on the (large, uncommitted) Kaggle dataset.
+"""
+import csv
+
+import pytest
+
+from benchmarks.synthetic_tmdb import generate_tmdb_csv
+from src.data_processor import (
+    build_tmdb_snapshot,
+    iter_tv_show_batches_from_tmdb_csv,
+    iter_tv_shows_from_tmdb_csv,
+    load_tv_shows_from_tmdb_csv,
+    load_tv_shows_from_tmdb_csv_cached,
+    load_tv_shows_from_tmdb_csv_parallel,
+)
+from src.dataset_snapshot import default_snapshot_path, is_snapshot_valid
+from src.show_recommender import ShowRecommender
+from src.tv_show import TVShow
+
+TMDB_COLUMNS = [
+    "id", "name", "number_of_episodes", "vote_average", "first_air_date",
+    "genres", "original_language", "overview",
+]
+
+
+@pytest.fixture
+def tmdb_csv(tmp_path):
+    """
+    This fixture writes a TMDB-shaped CSV with a mix of valid rows, rows with bad
+    numbers, missing fields and a multi-line quoted overview, and returns its path.
+    """
+    rows = [
+        [1, "Breaking Bad", 62, 8.9, "2008-01-20", "Drama, Crime", "en", "A chemistry teacher."],
+        [2, "Dark", 26, 8.4, "2017-12-01", "Sci-Fi & Fantasy, Drama", "de", "Line one\nline two"],
+        [3, "Broken Rating", 10, "n/a", "2001-01-01", "Drama", "en", ""],
+        [4, "Too High", 10, 11.5, "2001-01-01", "Drama", "en", ""],
+        [5, "No Date", "", "", "", "", "ja", "Missing numbers become 0."],
+        [6, "Friends", 236, 8.5, "1994-09-22", "Comedy", "en", "Six friends, \"one\" couch."],
+        [7, "Negative", -3, 5.0, "2010-05-05", "Comedy", "en", ""],
+        [8, "Money Heist", 41, 8.3, "2017-05-02", "Crime, Drama", "es", ""],
+    ]
+    path = tmp_path / "tmdb.csv"
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        writer = csv.writer(csv_file)
+        writer.writerow(TMDB_COLUMNS)
+        writer.writerows(rows)
+    return str(path)
+
+
+def test_load_skips_invalid_rows(tmdb_csv):
+    """
+    Test that rows with bad numbers or out-of-range values are skipped.
+    """
+    shows = load_tv_shows_from_tmdb_csv(tmdb_csv, limit=None)
+    assert [show.title for show in shows] == [
+        "Breaking Bad", "Dark", "No Date", "Friends", "Money Heist"
+    ]
+    assert shows[1].genre == ("Sci-Fi & Fantasy", "Drama")
+    assert shows[2].year is None
+
+
+def test_streaming_loader_matches_list_loader(tmdb_csv):
+    """
+    Test that the generator and batch loaders yield the same shows as the list loader.
+    """
+    expected = load_tv_shows_from_tmdb_csv(tmdb_csv, limit=None)
+    assert list(iter_tv_shows_from_tmdb_csv(tmdb_csv)) == expected
+
+    batches = list(iter_tv_show_batches_from_tmdb_csv(tmdb_csv, batch_size=2))
+    assert [len(batch) for batch in batches] == [2, 2, 1]
+    assert [show for batch in batches for show in batch] == expected
+
+    assert list(iter_tv_shows_from_tmdb_csv(tmdb_csv, limit=3)) == expected[:3]
+
+
+def test_recommender_consumes_stream(tmdb_csv):
+    """
+    Test that add_shows_from_list accepts a generator directly.
+    """
+    recommender = ShowRecommender()
+    recommender.add_shows_from_list(iter_tv_shows_from_tmdb_csv(tmdb_csv))
+    assert recommender.get_total_shows() == 5
+    assert [show.title for show in recommender.filter_by_genre("crime")] == [
+        "Breaking Bad", "Money Heist"
+    ]
+
+
+def test_missing_file_raises(tmp_path):
+    """
+    Test that a missing CSV raises a clear FileNotFoundError.
+    """
+    with pytest.raises(FileNotFoundError):
+        load_tv_shows_from_tmdb_csv(str(tmp_path / "missing.csv"))
+
+
+def test_snapshot_cache_round_trip_and_invalidation(tmdb_csv):
+    """
+    Test that the cached loader writes a snapshot, reads back identical shows from it,
+    and ignores it once the source CSV changes or a different limit is requested.
+    """
+    expected = load_tv_shows_from_tmdb_csv(tmdb_csv, limit=None)
+    snapshot_path = default_snapshot_path(tmdb_csv)
+
+    first = load_tv_shows_from_tmdb_csv_cached(tmdb_csv, limit=None)
+    assert is_snapshot_valid(snapshot_path, tmdb_csv, limit=None)
+    assert not is_snapshot_valid(snapshot_path, tmdb_csv, limit=2)
+
+    cached = load_tv_shows_from_tmdb_csv_cached(tmdb_csv, limit=None)
+    assert [s.get_info_dict(include_votes=True) for s in cached] == [
+        s.get_info_dict(include_votes=True) for s in expected
+    ]
+    assert [s.get_info_dict(include_votes=True) for s in first] == [
+        s.get_info_dict(include_votes=True) for s in expected
+    ]
+
+    # appending a row changes the size and mtime, so the snapshot must be rebuilt
+    with open(tmdb_csv, "a", newline="", encoding="utf-8") as csv_file:
+        csv.writer(csv_file).writerow([9, "Dark Matter", 39, 7.1, "2015-06-12", "Sci-Fi", "en", ""])
+    assert not is_snapshot_valid(snapshot_path, tmdb_csv, limit=None)
+    refreshed = load_tv_shows_from_tmdb_csv_cached(tmdb_csv, limit=None)
+    assert refreshed[-1].title == "Dark Matter"
+    assert is_snapshot_valid(snapshot_path, tmdb_csv, limit=None)
+
+
+@pytest.mark.parametrize("chunk_bytes", [1, 40, 1 << 20])
+@pytest.mark.parametrize("limit", [None, 3])
+def test_parallel_loader_matches_serial_loader(tmdb_csv, chunk_bytes, limit):
+    """
+    Test that the multi-process loader returns exactly the same shows as the serial
+    loader, including when ranges would otherwise split a quoted multi-line field.
+    """
+    expected = load_tv_shows_from_tmdb_csv(tmdb_csv, limit=limit)
+    parallel = load_tv_shows_from_tmdb_csv_parallel(
+        tmdb_csv, limit=limit, workers=2, chunk_bytes=chunk_bytes
+    )
+    assert [s.get_info_dict(include_votes=True) for s in parallel] == [
+        s.get_info_dict(include_votes=True) for s in expected
+    ]
+
+
+def test_synthetic_tmdb_generator_is_seeded_and_loadable(tmp_path):
+    """
+    Test that the synthetic dataset generator is repeatable for a seed and that the
+    loader reads it, skipping the rows with bad numeric values.
+    """
+    first = generate_tmdb_csv(str(tmp_path / "a.csv"), 500, seed=7, dirty_fraction=0.1)
+    second = generate_tmdb_csv(str(tmp_path / "b.csv"), 500, seed=7, dirty_fraction=0.1)
+    with open(first, encoding="utf-8") as a, open(second, encoding="utf-8") as b:
+        assert a.read() == b.read()
+
+    shows = load_tv_shows_from_tmdb_csv(first, limit=None)
+    assert 0 < len(shows) < 500
+    assert all(0 <= show.avg_rating <= 10 and show.num_episodes >= 0 for show in shows)
+
+
+def test_lazy_recommender_over_snapshot_builds_only_returned_shows(tmp_path):
+    """
+    Test that a recommender opened lazily from a snapshot gives the same answers as one
+    built from the parsed shows, while only creating TVShow objects for returned rows.
+    """
+    csv_path = generate_tmdb_csv(str(tmp_path / "synthetic.csv"), 400, seed=16)
+    eager = ShowRecommender(columnar=True)
+    eager.add_shows_from_list(load_tv_shows_from_tmdb_csv(csv_path, limit=None))
+
+    lazy = ShowRecommender.from_snapshot(build_tmdb_snapshot(csv_path, limit=None))
+    assert lazy.get_total_shows() == eager.get_total_shows()
+    assert lazy.get_statistic() == eager.get_statistic()
+    assert lazy.shows.materialized == 0
+
+    top = lazy.get_recommendations(genre="drama", min_rating=6, limit=10)
+    assert [s.get_info_dict() for s in top] == [
+        s.get_info_dict() for s in eager.get_recommendations(genre="drama", min_rating=6, limit=10)
+    ]
+    assert lazy.shows.materialized == 10
+
+    # title search reads the titles from the snapshot and only builds the matches
+    matches = lazy.search_by_title("dark")
+    assert [s.title for s in matches] == [s.title for s in eager.search_by_title("dark")]
+    assert lazy.shows.materialized <= 10 + len(matches)
+    assert lazy.get_shows_by_year(2000) == eager.get_shows_by_year(2000)
+
+    # shows added later are kept after the snapshot rows
+    extra = TVShow("Brand New", ["Drama"], 3, 9.9, "en", 2024)
+    lazy.add_show(extra)
+    assert lazy.search_by_title("brand new") == [extra]
+    assert lazy.shows[-1] is extra
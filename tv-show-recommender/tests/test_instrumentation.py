@@ -0,0 +1,100 @@
+"""
+This module contains pytest unit tests for the opt-in profiler in src/instrumentation.py.
+The profiler is shared, so every test resets and disables it again when it is done.
+"""
+import csv
+import json
+
+import pytest
+
+from src.data_processor import load_tv_shows_from_tmdb_csv
+from src.instrumentation import PROFILER
+from src.show_recommender import ShowRecommender
+
+
+@pytest.fixture
+def profiler():
+    """This fixture turns the profiler on with no recorded numbers and off again afterwards."""
+    PROFILER.reset()
+    PROFILER.enable()
+    yield PROFILER
+    PROFILER.disable()
+    PROFILER.reset()
+
+
+def _write_tmdb_csv(path):
+    """Write a TMDB-shaped CSV with three valid rows and one row per skip reason."""
+    rows = [
+        ["name", "number_of_episodes", "vote_average", "first_air_date", "genres", "original_language"],
+        ["Breaking Bad", 62, 8.9, "2008-01-20", "Drama, Crime", "en"],
+        ["Dark", 26, 8.4, "2017-12-01", "Drama", "de"],
+        ["Friends", 236, 8.5, "1994-09-22", "Comedy", "en"],
+        ["Broken Rating", 10, "n/a", "2001-01-01", "Drama", "en"],
+        ["Broken Episodes", "many", 5.0, "2001-01-01", "Drama", "en"],
+        ["Too High", 10, 11.5, "2001-01-01", "Drama", "en"],
+        ["Negative", -3, 5.0, "2010-05-05", "Comedy", "en"],
+    ]
+    with open(path, "w", newline="", encoding="utf-8") as csv_file:
+        csv.writer(csv_file).writerows(rows)
+    return str(path)
+
+
+def test_profiler_records_loaders_and_methods(tmp_path, profiler):
+    """
+    Test that loading and querying with the profiler on records rows read, loaded and
+    skipped per reason, and calls, rows scanned and rows returned per method.
+    """
+    shows = load_tv_shows_from_tmdb_csv(_write_tmdb_csv(tmp_path / "tmdb.csv"), limit=None)
+    recommender = ShowRecommender(cache_size=0)
+    recommender.add_shows_from_list(shows)
+    recommender.get_recommendations(genre="drama", limit=1)
+    recommender.get_recommendations(language="en", limit=5)
+    recommender.search_by_title("dark")
+
+    snapshot = profiler.snapshot()
+    loader = snapshot["loaders"]["iter_tv_shows_from_tmdb_csv"]
+    assert (loader["rows_read"], loader["rows_loaded"], loader["rows_skipped"]) == (7, 3, 4)
+    assert loader["skip_reasons"] == {
+        "invalid avg_rating": 1,
+        "invalid num_episodes": 1,
+        "avg_rating out of range": 1,
+        "negative num_episodes": 1,
+    }
+    assert snapshot["loaders"]["ShowRecommender.add_shows_from_list"]["rows_loaded"] == 3
+
+    recommendations = snapshot["methods"]["ShowRecommender.get_recommendations"]
+    assert recommendations["calls"] == 2
+    assert recommendations["rows_returned"] == 1 + 2
+    assert recommendations["rows_scanned"] >= recommendations["rows_returned"]
+    assert sum(recommendations["latency_histogram"]["counts"]) == 2
+    assert snapshot["methods"]["ShowRecommender.search_by_title"]["rows_returned"] == 1
+    assert json.loads(profiler.to_json()) == profiler.snapshot()
+    assert "iter_tv_shows_from_tmdb_csv" in profiler.report()
+
+
+def test_profiler_counts_unfiltered_recommendations_once(tmp_path, profiler):
+    """
+    Test that get_recommendations() without filters is recorded as one call of its own and
+    not also as a call of get_top_rated_shows(), which it uses for the answer.
+    """
+    recommender = ShowRecommender(cache_size=0)
+    recommender.add_shows_from_list(load_tv_shows_from_tmdb_csv(_write_tmdb_csv(tmp_path / "tmdb.csv")))
+    assert len(recommender.get_recommendations(limit=2)) == 2
+    recommender.get_top_rated_shows(1)
+
+    methods = profiler.snapshot()["methods"]
+    assert methods["ShowRecommender.get_recommendations"]["calls"] == 1
+    assert methods["ShowRecommender.get_top_rated_shows"]["calls"] == 1
+    assert methods["ShowRecommender.get_top_rated_shows"]["rows_returned"] == 1
+
+
+def test_profiler_records_nothing_when_disabled(tmp_path):
+    """
+    Test that nothing is recorded while the profiler is off (the default).
+    """
+    PROFILER.reset()
+    assert not PROFILER.enabled
+    recommender = ShowRecommender()
+    recommender.add_shows_from_list(load_tv_shows_from_tmdb_csv(_write_tmdb_csv(tmp_path / "tmdb.csv")))
+    recommender.get_recommendations(genre="drama")
+    assert PROFILER.snapshot() == {"enabled": False, "methods": {}, "loaders": {}}
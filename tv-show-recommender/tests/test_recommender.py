@@ -7,11 +7,21 @@ filtering and recommendation logic behaves as expected.
 """
 import sys
 import os
+import random
+import numpy as np
+
 import pytest
 
 
+from benchmarks.synthetic_tmdb import generate_tmdb_csv
+from src.data_processor import build_tmdb_snapshot, load_tv_shows_from_tmdb_csv, load_tv_shows_into_sqlite
+from src import tv_show
 from src.tv_show import TVShow
 from src.show_recommender import ShowRecommender
+from src.scoring import ScoringModel
+from src.sharding import ShardedShowRecommender
+from src.running_stats import RunningStats
+from src.sqlite_store import SQLiteShowStore
 
 
 @pytest.fixture
@@ -85,3 +95,961 @@ def test_statistics(sample_recommender):
     assert stats["total_shows"] == 3
     assert stats["total_episodes"] > 0
     assert stats["avg_rating"] > 0
+
+
+def _build_recommender(shows, columnar):
+    """
+    Helper that loads the same shows into a list backed or column backed recommender.
+    """
+    recommender = ShowRecommender(columnar=columnar)
+    recommender.add_shows_from_list(shows)
+    return recommender
+
+
+@pytest.fixture
+def mixed_shows():
+    """
+    This fixture returns a small collection with repeated ratings, mixed-case
+    languages and a show without a year, to exercise the edge cases of both backends.
+    """
+    return [
+        TVShow("Breaking Bad", ["Drama", "Crime"], 62, 9.5, "en", 2008),
+        TVShow("Friends", ["Comedy"], 236, 8.9, "en", 1994),
+        TVShow("Dark", ["Sci-Fi", "Drama"], 26, 8.8, "de", 2017),
+        TVShow("Babylon Berlin", ["Crime", "Drama"], 40, 8.8, "DE", 2017),
+        TVShow("Money Heist", ["Action & Adventure", "Crime"], 41, 8.3, "es", None),
+        TVShow("The Office", ["Comedy"], 201, 8.9, "en", 2005),
+    ]
+
+
+def test_columnar_backend_matches_list_backend(mixed_shows):
+    """
+    Test that the NumPy column store returns exactly the same results as the list backend.
+    """
+    plain = _build_recommender(mixed_shows, columnar=False)
+    columnar = _build_recommender(mixed_shows, columnar=True)
+
+    assert columnar.filter_by_genre("dram") == plain.filter_by_genre("dram")
+    assert columnar.filter_by_rating(8.8) == plain.filter_by_rating(8.8)
+    assert columnar.filter_by_episodes(30, 100) == plain.filter_by_episodes(30, 100)
+    assert columnar.filter_by_language("de") == plain.filter_by_language("de")
+    assert columnar.get_shows_by_year(None) == plain.get_shows_by_year(None)
+    assert columnar.get_all_genres() == plain.get_all_genres()
+    assert columnar.get_statistic() == plain.get_statistic()
+    assert columnar.get_recommendations(genre="crime", min_episodes=30, limit=5) == (
+        plain.get_recommendations(genre="crime", min_episodes=30, limit=5)
+    )
+    assert columnar.get_recommendations(limit=4) == plain.get_recommendations(limit=4)
+
+
+def test_inverted_indexes_follow_add_show(mixed_shows):
+    """
+    Test that genre, language and year lookups see shows added one at a time and in bulk,
+    and that multi-criteria recommendations intersect the indexes correctly.
+    """
+    recommender = ShowRecommender()
+    recommender.add_show(mixed_shows[0])
+    recommender.add_shows_from_list(mixed_shows[1:])
+
+    assert [s.title for s in recommender.filter_by_genre("CRIME")] == [
+        "Breaking Bad", "Babylon Berlin", "Money Heist"
+    ]
+    assert [s.title for s in recommender.filter_by_language("De")] == ["Dark", "Babylon Berlin"]
+    assert [s.title for s in recommender.get_shows_by_year(2017)] == ["Dark", "Babylon Berlin"]
+    assert [s.title for s in recommender.get_recommendations(genre="drama", language="de")] == [
+        "Dark", "Babylon Berlin"
+    ]
+
+
+def test_matches_genre_after_genre_is_reassigned():
+    """
+    Test that the cached lowercase genres stay in sync when the genre attribute changes.
+    """
+    show = TVShow("Dark", ["Sci-Fi"], 26, 8.8, "de", 2017)
+    show.genre = "Thriller"
+    assert show.genre == ("Thriller",)
+    assert show.matches_genre("thrill")
+    assert not show.matches_genre("sci-fi")
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_genres_that_are_not_strings_are_kept_but_never_match(columnar, tmp_path, monkeypatch):
+    """
+    Test that None and NaN genres (missing values from a data file) are stored as they are, are
+    skipped by genre filters, and that the shared genre cache stays bounded.
+    """
+    nan = float("nan")
+    shows = [
+        TVShow("Dark", [None, "Drama"], 26, 8.8, "de", 2017),
+        TVShow("Unknown", nan, 10, 6.0, "en", 2020),
+        TVShow("Ozark", ["Drama"], 44, 8.5, "en", 2017),
+    ]
+    assert shows[0].genre == (None, "Drama") and shows[0].lowercase_genres == ("drama",)
+    assert shows[1].genre[0] is nan and not shows[1].matches_genre("")
+
+    recommender = _build_recommender(shows, columnar)
+    assert [show.title for show in recommender.filter_by_genre("drama")] == ["Dark", "Ozark"]
+    assert [show.title for show in recommender.get_recommendations(genre="dra")] == ["Dark", "Ozark"]
+    assert recommender.get_genre_breakdown()[None] == {"count": 1, "avg_rating": 8.8}
+    assert recommender.similar_to(shows[2], k=1) == [shows[0]]
+
+    with pytest.raises(ValueError):
+        ShowRecommender(database=str(tmp_path / "shows.db")).add_shows_from_list(shows)
+
+    monkeypatch.setattr(tv_show, "_genre_tuples", {})
+    monkeypatch.setattr(tv_show, "_GENRE_CACHE_SIZE", 5)
+    for i in range(20):
+        TVShow(f"Show {i}", [f"Genre {i}"], 1, 5.0)
+    assert len(tv_show._genre_tuples) <= 5
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_languages_and_titles_that_are_not_strings_are_indexed_safely(columnar):
+    """
+    Test that a show with a None or NaN language (or title) is added to every index, never
+    matches a language filter, and leaves the indexes in step with the stored shows.
+    """
+    recommender = ShowRecommender(columnar=columnar)
+    recommender.search_by_title("build the title index")
+    recommender.add_show(TVShow("A", ["Drama"], 3, 7.0, None, 2000))
+    recommender.add_show(TVShow("B", ["Comedy"], 5, 8.0, "EN", 2001))
+    recommender.add_shows_from_list([
+        TVShow("C", ["Drama"], 4, 6.0, float("nan"), 2002),
+        TVShow(None, ["Drama"], 2, 5.0, "de", 2003),
+    ])
+    assert [show.title for show in recommender.filter_by_genre("drama")] == ["A", "C", None]
+    assert [show.title for show in recommender.filter_by_genre("comedy")] == ["B"]
+    assert [show.title for show in recommender.filter_by_language("en")] == ["B"]
+    assert [show.title for show in recommender.get_recommendations(language="de")] == [None]
+    assert [show.title for show in recommender.search_by_title("a")] == ["A"]
+    assert recommender.get_language_breakdown()[None] == {"count": 2, "avg_rating": 6.5}
+    assert recommender.find_show("A", 2000).language is None
+    assert len(recommender.similar_to(recommender.shows[0], k=3)) == 3
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_top_k_matches_full_sort_and_keeps_collection_order(columnar):
+    """
+    Test that top-k selection returns the same shows as a full stable sort (ties included)
+    and that neither method reorders the stored collection.
+    """
+    shows = [
+        TVShow(f"Show {i}", ["Drama" if i % 2 else "Comedy"], i % 7, float(i % 5), "en", 2000)
+        for i in range(40)
+    ]
+    recommender = ShowRecommender(columnar=columnar)
+    recommender.add_show(shows[0])
+    recommender.add_shows_from_list(shows[1:])
+
+    expected = sorted(shows, reverse=True)
+    assert recommender.get_recommendations(limit=7) == expected[:7]
+    assert recommender.get_top_rated_shows(12) == expected[:12]
+    drama = [show for show in expected if show.matches_genre("drama")]
+    assert recommender.get_recommendations(genre="drama", limit=5) == drama[:5]
+    assert recommender.get_recommendations(min_episodes=3, limit=50) == [
+        show for show in expected if show.num_episodes >= 3
+    ]
+    assert recommender.shows == shows
+
+
+def test_title_index_matches_substring_scan(mixed_shows):
+    """
+    Test that indexed title search gives the same shows as a plain substring scan,
+    for short and long terms, before and after new shows are added.
+    """
+    recommender = ShowRecommender()
+    recommender.add_shows_from_list(mixed_shows[:4])
+    assert [s.title for s in recommender.search_by_title("BA")] == ["Breaking Bad", "Babylon Berlin"]
+
+    recommender.add_shows_from_list(mixed_shows[4:])
+    for term in ["", "e", "ar", "the", "ERL", "money heist", "an B", "zzz", "ffi"]:
+        expected = [s for s in recommender.shows if term.lower() in s.title.lower()]
+        assert recommender.search_by_title(term) == expected
+
+
+def test_fuzzy_search_by_title_handles_typos(mixed_shows):
+    """
+    Test that the fuzzy search ranks the intended show first despite a typo.
+    """
+    recommender = ShowRecommender()
+    recommender.add_shows_from_list(mixed_shows)
+    assert recommender.fuzzy_search_by_title("breking bad")[0].title == "Breaking Bad"
+    assert recommender.fuzzy_search_by_title("the ofice", limit=1)[0].title == "The Office"
+
+
+def test_similar_to_prefers_shared_genres(mixed_shows):
+    """
+    Test that similar_to leaves out the show itself and ranks shows with the same
+    genres and language first.
+    """
+    recommender = ShowRecommender()
+    recommender.add_shows_from_list(mixed_shows)
+    dark = mixed_shows[2]
+
+    similar = recommender.similar_to(dark, k=3)
+    assert dark not in similar
+    assert similar[0].title == "Babylon Berlin"
+    assert len(similar) == 3
+
+    recommender.add_show(TVShow("1899", ["Sci-Fi", "Drama", "Mystery"], 8, 7.3, "de", 2022))
+    assert recommender.similar_to(dark, k=1)[0].title == "1899"
+    assert [s.title for s in recommender.similar_to(mixed_shows[1], k=1)] == ["The Office"]
+
+
+def test_query_cache_hits_and_invalidation(sample_recommender):
+    """
+    Test that repeated queries are served from the cache (case-insensitive keys), that
+    adding a show invalidates cached results, and that returned lists are copies.
+    """
+    first = sample_recommender.get_recommendations(genre="Drama", limit=5)
+    first.clear()
+    again = sample_recommender.get_recommendations(genre="drama", limit=5)
+    assert [s.title for s in again] == ["Breaking Bad", "Dark"]
+    stats = sample_recommender.get_cache_stats()
+    assert (stats["hits"], stats["misses"]) == (1, 1)
+
+    assert sample_recommender.get_statistic()["total_shows"] == 3
+    sample_recommender.add_show(TVShow("The Crown", ["Drama"], 60, 8.6, "en", 2016))
+    assert sample_recommender.get_statistic()["total_shows"] == 4
+    assert len(sample_recommender.get_recommendations(genre="drama", limit=5)) == 3
+    assert "Drama" in sample_recommender.get_all_genres()
+    assert sample_recommender.get_cache_stats()["version"] == 4
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_recommendations_batch_matches_single_queries(mixed_shows, columnar, workers):
+    """
+    Test that the batch API returns, in input order, the same results as one
+    get_recommendations call per profile, both in-process and with worker processes.
+    """
+    recommender = _build_recommender(mixed_shows, columnar)
+    profiles = [
+        {"genre": "Drama", "language": "DE"},
+        {"min_rating": 8.8},
+        {},
+        {"genre": "crime", "min_episodes": 30, "max_episodes": 100},
+        {"genre": "drama", "language": "de"},
+        {"language": "en", "min_rating": 9.0},
+    ]
+    batch = recommender.get_recommendations_batch(profiles, limit=3, workers=workers)
+    assert batch == [recommender.get_recommendations(limit=3, **profile) for profile in profiles]
+
+    with pytest.raises(ValueError):
+        recommender.get_recommendations_batch([{"rating": 9}])
+
+
+def test_range_indexes_match_linear_scans():
+    """
+    Test that rating, episode and year range lookups (and recommendations that start from
+    them) match plain linear scans while shows are added one by one and in bulk.
+    """
+    rng = random.Random(551)
+    shows = [
+        TVShow(
+            f"Show {i}",
+            rng.sample(["Drama", "Comedy", "Crime"], rng.randint(1, 2)),
+            rng.randint(0, 60),
+            rng.choice([0, 5.5, 7.0, 7.5, 8.0, 9.25, 10]),
+            rng.choice(["en", "de"]),
+            rng.choice([None, 1999, 2005, 2010, 2020]),
+        )
+        for i in range(300)
+    ]
+    recommender = ShowRecommender(cache_size=0)
+    recommender.add_shows_from_list(shows[:200])
+    for show in shows[200:]:
+        recommender.add_show(show)
+
+    def ranked(matches, limit):
+        return sorted(matches, key=lambda s: s.avg_rating, reverse=True)[:limit]
+
+    assert recommender.filter_by_rating(7.5) == [s for s in shows if s.avg_rating >= 7.5]
+    assert recommender.filter_by_episodes(10, 20) == [s for s in shows if 10 <= s.num_episodes <= 20]
+    assert recommender.filter_by_episodes(max_episodes=3) == [s for s in shows if s.num_episodes <= 3]
+    assert recommender.get_shows_between_years(2005, 2010) == [
+        s for s in shows if s.year is not None and 2005 <= s.year <= 2010
+    ]
+    assert recommender.get_recommendations(min_rating=9.25, language="de", limit=5) == ranked(
+        [s for s in shows if s.avg_rating >= 9.25 and s.language == "de"], 5
+    )
+    assert recommender.get_recommendations(genre="drama", min_episodes=58, limit=5) == ranked(
+        [s for s in shows if s.matches_genre("drama") and s.num_episodes >= 58], 5
+    )
+
+
+@pytest.mark.parametrize("backend", ["list", "columnar", "sqlite"])
+def test_years_that_are_not_whole_numbers_are_refused(tmp_path, backend):
+    """
+    Test that every backend refuses a year like "2002" before any index is changed, so the
+    shows added before and after it are answered normally.
+    """
+    if backend == "sqlite":
+        recommender = ShowRecommender(database=str(tmp_path / "shows.db"))
+    else:
+        recommender = ShowRecommender(columnar=backend == "columnar")
+    recommender.add_show(TVShow("Old", ["Drama"], 10, 7.0, "en", 2001))
+    with pytest.raises(ValueError):
+        recommender.add_show(TVShow("Text Year", ["Drama"], 10, 9.0, "en", "2002"))
+    with pytest.raises(ValueError):
+        recommender.add_shows_from_list([TVShow("Float Year", ["Drama"], 10, 9.0, "en", 2002.0)])
+    recommender.add_show(TVShow("New", ["Drama"], 10, 8.0, "en", np.int64(2003)))
+
+    assert recommender.get_total_shows() == 2
+    assert [show.title for show in recommender.get_top_rated_shows()] == ["New", "Old"]
+    assert [show.title for show in recommender.filter_by_genre("drama")] == ["Old", "New"]
+    assert [show.title for show in recommender.filter_by_language("en")] == ["Old", "New"]
+    assert [show.title for show in recommender.get_shows_between_years(2000, 2010)] == ["Old", "New"]
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_running_statistics_match_full_scans(columnar):
+    """
+    Test that the running statistics kept while shows are added match a full pass over
+    the shows, and that they are updated by later additions.
+    """
+    rng = random.Random(14)
+    shows = [
+        TVShow(
+            f"Show {i}",
+            rng.sample(["Drama", "Comedy", "Crime"], rng.randint(1, 2)),
+            rng.randint(0, 60),
+            round(rng.uniform(0, 10), 1),
+            rng.choice(["en", "EN", "de"]),
+            rng.choice([None, 2005, 2020]),
+        )
+        for i in range(120)
+    ]
+    recommender = ShowRecommender(columnar=columnar)
+    recommender.add_shows_from_list(shows[:100])
+    assert recommender.get_statistic()["total_shows"] == 100
+    for show in shows[100:]:
+        recommender.add_show(show)
+
+    assert recommender.get_statistic() == {
+        "total_shows": 120,
+        "avg_rating": round(sum(s.avg_rating for s in shows) / 120, 2),
+        "total_episodes": sum(s.num_episodes for s in shows),
+        "total_genres": 3,
+    }
+    assert recommender.get_all_genres() == ["Comedy", "Crime", "Drama"]
+
+    drama = [s for s in shows if "Drama" in s.genre]
+    assert recommender.get_genre_breakdown()["Drama"] == {
+        "count": len(drama),
+        "avg_rating": round(sum(s.avg_rating for s in drama) / len(drama), 2),
+    }
+    languages = recommender.get_language_breakdown()
+    assert set(languages) == {"en", "de"}
+    assert languages["en"]["count"] == sum(1 for s in shows if s.language.lower() == "en")
+
+    edges, counts = recommender.get_rating_histogram()
+    expected_counts, _ = np.histogram([s.avg_rating for s in shows], bins=edges)
+    assert counts == expected_counts.tolist()
+    assert recommender.get_year_counts() == {
+        2005: sum(1 for s in shows if s.year == 2005),
+        2020: sum(1 for s in shows if s.year == 2020),
+    }
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_from_dataframe_matches_row_by_row_loading(columnar):
+    """
+    Test that bulk DataFrame ingestion skips the same invalid rows and builds the same
+    shows (and query results) as creating each TVShow in an iterrows() loop.
+    """
+    pd = pytest.importorskip("pandas")
+    df = pd.DataFrame({
+        "name": [" Dark ", "Friends", "Broken", None, "Narcos", "Too Good", "Bluey"],
+        "genres": [["Sci-Fi", "Drama"], "Comedy, Romance", ["Drama"], [], "Crime, Drama", [], "Kids"],
+        "number_of_episodes": [26, 236, -1, 10, "30", 5, None],
+        "vote_average": [8.8, 8.9, 7.0, 6.5, "8.8", 11.0, 9.0],
+        "original_language": ["de", "en", "en", None, "ES", "en", "en"],
+        "first_air_date": ["2017-12-01", "1994-09-22", "2000-01-01", "", None, "2001-01-01", "2018"],
+    })
+
+    recommender = ShowRecommender(columnar=columnar)
+    skipped = recommender.add_shows_from_dataframe(df)
+
+    # negative episodes, a rating above 10 and a missing episode count are skipped
+    assert skipped == 3
+    assert [show.get_info_dict() for show in recommender.shows] == [
+        TVShow("Dark", ["Sci-Fi", "Drama"], 26, 8.8, "de", 2017).get_info_dict(),
+        TVShow("Friends", ["Comedy", "Romance"], 236, 8.9, "en", 1994).get_info_dict(),
+        TVShow("", [], 10, 6.5, "", None).get_info_dict(),
+        TVShow("Narcos", ["Crime", "Drama"], 30, 8.8, "ES", None).get_info_dict(),
+    ]
+    assert recommender.filter_by_genre("drama") == [recommender.shows[0], recommender.shows[3]]
+    assert recommender.filter_by_language("es") == [recommender.shows[3]]
+    assert recommender.get_recommendations(genre="drama", min_episodes=27) == [recommender.shows[3]]
+    assert recommender.get_statistic()["total_episodes"] == 302
+
+    built = ShowRecommender.from_dataframe(df, columnar=columnar)
+    assert built.shows == recommender.shows
+
+    # the bulk index and statistics updates match adding the same shows one list at a time
+    listed = ShowRecommender(columnar=columnar)
+    listed.add_shows_from_list(list(recommender.shows))
+    assert recommender.get_genre_breakdown() == listed.get_genre_breakdown()
+    assert recommender.get_language_breakdown() == listed.get_language_breakdown()
+    assert recommender.get_year_counts() == listed.get_year_counts()
+    assert recommender.get_rating_histogram() == listed.get_rating_histogram()
+    assert recommender.get_shows_by_year(None) == listed.get_shows_by_year(None)
+    assert recommender.get_top_rated_shows(4) == listed.get_top_rated_shows(4)
+
+    # adding the DataFrame again merges into the existing indexes
+    listed.add_shows_from_list(list(recommender.shows))
+    recommender.add_shows_from_dataframe(df)
+    assert recommender.get_top_rated_shows(None) == listed.get_top_rated_shows(None)
+    assert recommender.filter_by_episodes(20, 240) == listed.filter_by_episodes(20, 240)
+    assert recommender.filter_by_genre("drama") == listed.filter_by_genre("drama")
+    assert recommender.get_statistic() == listed.get_statistic()
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_query_planner_matches_brute_force_and_explains_plan(columnar):
+    """
+    Test that planned get_recommendations() queries return the same shows, in the same
+    order, as filtering every show and sorting by rating, and that explain() starts from
+    the most selective filter.
+    """
+    rng = random.Random(18)
+    shows = [
+        TVShow(
+            f"Show {i}",
+            rng.sample(["Drama", "Comedy", "Crime", "Sci-Fi"], rng.randint(1, 2)),
+            rng.randint(1, 300),
+            round(rng.uniform(0, 10), 1),
+            rng.choices(["en", "ja", "de"], weights=[20, 5, 1])[0],
+            2000,
+        )
+        for i in range(600)
+    ]
+    recommender = _build_recommender(shows, columnar)
+
+    for _ in range(200):
+        genre = rng.choice([None, "drama", "sci", "Western"])
+        min_rating = rng.choice([None, 0, 5.5, 9.5, 11])
+        min_episodes = rng.choice([None, 1, 100])
+        max_episodes = rng.choice([None, 20, 300])
+        language = rng.choice([None, "EN", "de", "fr"])
+        limit = rng.choice([1, 10, None])
+        expected = sorted(
+            (
+                s
+                for s in shows
+                if (not genre or s.matches_genre(genre))
+                and (min_rating is None or s.avg_rating >= min_rating)
+                and (min_episodes is None or s.num_episodes >= min_episodes)
+                and (max_episodes is None or s.num_episodes <= max_episodes)
+                and (not language or s.language.lower() == language.lower())
+            ),
+            key=lambda s: s.avg_rating,
+            reverse=True,
+        )[:limit]
+        assert recommender.get_recommendations(
+            genre, min_rating, min_episodes, max_episodes, language, limit
+        ) == expected
+
+    plan = recommender.explain(genre="drama", min_rating=0, language="de", limit=5)
+    german_drama = [s for s in shows if s.language == "de" and s.matches_genre("drama")]
+    assert plan["backend"] == ("columnar" if columnar else "list")
+    assert plan["skipped"] == ["rating >= 0"]
+    assert plan["steps"][0]["step"].endswith("language = 'de'")
+    assert plan["steps"][0]["rows"] == sum(1 for s in shows if s.language == "de")
+    assert plan["steps"][-1]["rows"] == len(german_drama)
+    assert plan["returned"] == min(5, len(german_drama))
+    if not columnar:
+        # a common genre without a minimum rating is cheapest to find by walking the rating order
+        walk = recommender.explain(genre="drama", limit=1)["steps"]
+        assert walk[0]["step"] == "index lookup: all shows, best rated first"
+        assert walk[0]["rows"] < 10
+    assert recommender.explain(language="fr")["steps"] == [
+        {"step": "no show can match", "estimated_rows": 0, "rows": 0}
+    ]
+
+
+def test_tv_show_hash_agrees_with_eq():
+    """
+    Test that equal shows (same title and year) hash the same, so sets and dicts deduplicate them.
+    """
+    first = TVShow("Dark", ["Drama"], 26, 8.8, "de", 2017)
+    again = TVShow("Dark", ["Sci-Fi"], 10, 7.0, "en", 2017)
+    remake = TVShow("Dark", ["Drama"], 26, 8.8, "de", 2030)
+
+    assert first == again and hash(first) == hash(again)
+    assert len({first, again, remake}) == 2
+    assert {first: "kept"}[again] == "kept"
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_duplicate_policies_on_add(mixed_shows, columnar):
+    """
+    Test the keep, skip and replace duplicate policies for single and bulk adds, and that
+    after replacing shows every index, the column store and the statistics match a fresh build.
+    """
+    updated_dark = TVShow("Dark", ["Mystery"], 30, 9.6, "en", 2017)
+    updated_office = TVShow("The Office", ["Comedy", "Drama"], 188, 7.1, "EN", 2005)
+    new_show = TVShow("Severance", ["Drama", "Sci-Fi"], 19, 8.7, "en", 2022)
+
+    kept = _build_recommender(mixed_shows, columnar)
+    kept.add_shows_from_list([updated_dark, updated_dark])
+    assert kept.get_total_shows() == len(mixed_shows) + 2
+
+    skipped = _build_recommender(mixed_shows, columnar)
+    skipped.add_show(updated_dark, duplicates="skip")
+    skipped.add_shows_from_list([updated_office, new_show, new_show], duplicates="skip")
+    assert skipped.get_total_shows() == len(mixed_shows) + 1
+    assert skipped.find_show("Dark", 2017).avg_rating == 8.8
+    assert skipped.find_show("Money Heist") is mixed_shows[4]
+    assert skipped.find_show("Dark", 2016) is None
+
+    replaced = _build_recommender(mixed_shows, columnar)
+    assert replaced.get_statistic()["total_shows"] == len(mixed_shows)
+    replaced.add_show(updated_dark, duplicates="replace")
+    replaced.add_shows_from_list([new_show, updated_office, new_show], duplicates="replace")
+    expected = [updated_dark if s.title == "Dark" else s for s in mixed_shows]
+    expected = [updated_office if s.title == "The Office" else s for s in expected] + [new_show]
+    fresh = _build_recommender(expected, columnar)
+
+    assert replaced.shows == expected
+    assert replaced.find_show("Dark", 2017) is updated_dark
+    for query in ("drama", "mystery", "comedy", "crime"):
+        assert replaced.filter_by_genre(query) == fresh.filter_by_genre(query)
+    assert replaced.filter_by_language("en") == fresh.filter_by_language("en")
+    assert replaced.filter_by_language("de") == fresh.filter_by_language("de")
+    assert replaced.filter_by_rating(8.7) == fresh.filter_by_rating(8.7)
+    assert replaced.filter_by_episodes(25, 200) == fresh.filter_by_episodes(25, 200)
+    assert replaced.get_shows_between_years(2000, 2020) == fresh.get_shows_between_years(2000, 2020)
+    assert replaced.get_recommendations(genre="drama", language="en") == (
+        fresh.get_recommendations(genre="drama", language="en")
+    )
+    assert replaced.get_statistic() == fresh.get_statistic()
+    assert replaced.get_all_genres() == fresh.get_all_genres()
+    assert list(replaced.get_genre_breakdown().items()) == list(fresh.get_genre_breakdown().items())
+    assert list(replaced.get_language_breakdown().items()) == list(fresh.get_language_breakdown().items())
+    assert replaced.get_rating_histogram() == fresh.get_rating_histogram()
+    assert replaced.search_by_title("dark") == [updated_dark]
+
+    with pytest.raises(ValueError):
+        replaced.add_show(new_show, duplicates="merge")
+
+
+@pytest.mark.parametrize("columnar", [False, True])
+def test_running_stats_match_a_rebuild_after_replacements(columnar):
+    """
+    Test that replacing shows many times leaves the statistics and breakdowns (values and order)
+    exactly as in a recommender built from the final shows.
+    """
+    rng = random.Random(11)
+    genres = ["Drama", "Comedy", "Crime", "Sci-Fi"]
+    languages = ["en", "de", "ja", "ko"]
+
+    def random_show(i):
+        return TVShow(
+            f"Show {i}", rng.sample(genres, 2), rng.randint(1, 50), round(rng.uniform(0, 10), 2),
+            rng.choice(languages), 2000 + i,
+        )
+
+    recommender = _build_recommender([random_show(i) for i in range(200)], columnar)
+    for _ in range(20):
+        recommender.add_shows_from_list(
+            [random_show(i) for i in rng.sample(range(200), 50)], duplicates="replace"
+        )
+    fresh = _build_recommender(list(recommender.shows), columnar)
+
+    assert recommender.get_statistic() == fresh.get_statistic()
+    assert list(recommender.get_genre_breakdown().items()) == list(fresh.get_genre_breakdown().items())
+    assert list(recommender.get_language_breakdown().items()) == (
+        list(fresh.get_language_breakdown().items())
+    )
+    assert recommender.get_running_stats().rating_sum == fresh.get_running_stats().rating_sum
+
+
+@pytest.mark.parametrize("backend", ["list", "columnar", "sqlite"])
+def test_average_ratings_match_sum_over_len(tmp_path, backend):
+    """
+    Test that the average ratings of the statistics and breakdowns are sum() / len() of the
+    ratings rounded to 2 places, for ratings with many decimals, and that every backend gives
+    back integer ratings as ints.
+    """
+    rng = random.Random(20)
+    shows = [
+        TVShow(
+            f"Show {i}", rng.sample(["Drama", "Comedy", "Crime"], 2), 1,
+            rng.randint(0, 10) if i % 5 == 0 else rng.uniform(0, 10), rng.choice(["en", "de"]),
+        )
+        for i in range(400)
+    ]
+    # the mean of these is just above 6.475; rounding each rating to millionths makes it 6.475
+    shows += [TVShow(f"French {i}", ["Drama"], 1, 6.4750004, "fr") for i in range(2)]
+    if backend == "sqlite":
+        recommender = ShowRecommender(database=str(tmp_path / "shows.db"))
+        recommender.add_shows_from_list(shows)
+    else:
+        recommender = _build_recommender(shows, columnar=backend == "columnar")
+
+    def average(group):
+        return round(sum(s.avg_rating for s in group) / len(group), 2)
+
+    assert recommender.get_statistic()["avg_rating"] == average(shows)
+    for genre, entry in recommender.get_genre_breakdown().items():
+        assert entry["avg_rating"] == average([s for s in shows if genre in s.genre])
+    for language, entry in recommender.get_language_breakdown().items():
+        assert entry["avg_rating"] == average([s for s in shows if s.language == language])
+    assert [type(s.avg_rating) for s in recommender.shows] == [type(s.avg_rating) for s in shows]
+
+    # adding the shows as columns sums the ratings exactly like adding them one at a time
+    stats = RunningStats()
+    stats.add_columns(
+        np.array([s.avg_rating for s in shows], dtype=np.float64), np.ones(len(shows), dtype=np.int64),
+        [None] * len(shows), [s.language for s in shows], [s.genre for s in shows],
+    )
+    one_by_one = RunningStats()
+    for show in shows:
+        one_by_one.add(show)
+    assert stats.rating_sum == one_by_one.rating_sum
+    assert stats.genre_rating_sums == one_by_one.genre_rating_sums
+    assert stats.language_rating_sums == one_by_one.language_rating_sums
+
+
+@pytest.mark.parametrize("backend", ["list", "columnar", "lazy"])
+def test_refresh_applies_inserts_updates_and_deletes(tmp_path, backend):
+    """
+    Test that refreshing from a newer export leaves the recommender answering exactly like
+    one built from scratch, with the title, identity and similarity indexes kept current.
+    """
+    csv_path = generate_tmdb_csv(str(tmp_path / "synthetic.csv"), 500, seed=21)
+    shows = load_tv_shows_from_tmdb_csv(csv_path, limit=None)
+    if backend == "lazy":
+        recommender = ShowRecommender.from_snapshot(build_tmdb_snapshot(csv_path, limit=None))
+    else:
+        recommender = _build_recommender(shows, backend == "columnar")
+    # build the lazily created indexes so the refresh has to keep them current
+    recommender.search_by_title("the")
+    recommender.similar_to(shows[0])
+
+    rng = random.Random(3)
+    export = {}
+    for show in shows:
+        export.setdefault((show.title, show.year), show)
+    for key in rng.sample(sorted(export, key=str), 40):
+        del export[key]
+    for key in rng.sample(sorted(export, key=str), 30):
+        old = export[key]
+        export[key] = TVShow(old.title, ["Mystery"], old.num_episodes + 1, 9.9, "ko", old.year)
+    for i in range(25):
+        new_show = TVShow(f"Fresh Show {i}", ["Drama", "Thriller"], i, round(rng.uniform(0, 10), 1), "en", 2030)
+        export[(new_show.title, new_show.year)] = new_show
+
+    counts = recommender.refresh(list(export.values()))
+    assert counts["inserted"] == 25 and counts["updated"] == 30
+    assert counts["deleted"] == len(shows) - len(export) + 25
+    assert sorted(map(repr, recommender.shows)) == sorted(map(repr, export.values()))
+
+    fresh = _build_recommender(list(recommender.shows), columnar=backend != "list")
+    for genre in ("drama", "mystery", "thriller", "comedy"):
+        assert recommender.filter_by_genre(genre) == fresh.filter_by_genre(genre)
+    assert recommender.filter_by_language("ko") == fresh.filter_by_language("ko")
+    assert recommender.filter_by_rating(7.5) == fresh.filter_by_rating(7.5)
+    assert recommender.filter_by_episodes(10, 40) == fresh.filter_by_episodes(10, 40)
+    assert recommender.get_shows_between_years(2000, 2030) == fresh.get_shows_between_years(2000, 2030)
+    assert recommender.get_recommendations(genre="drama", language="en", limit=20) == (
+        fresh.get_recommendations(genre="drama", language="en", limit=20)
+    )
+    assert recommender.get_statistic() == fresh.get_statistic()
+    assert list(recommender.get_genre_breakdown().items()) == list(fresh.get_genre_breakdown().items())
+    assert list(recommender.get_language_breakdown().items()) == list(fresh.get_language_breakdown().items())
+    assert recommender.get_rating_histogram() == fresh.get_rating_histogram()
+    assert recommender.get_year_counts() == fresh.get_year_counts()
+    assert recommender.search_by_title("fresh show") == fresh.search_by_title("fresh show")
+    assert recommender.search_by_title("the") == fresh.search_by_title("the")
+    assert recommender.similar_to(shows[1], k=5) == fresh.similar_to(shows[1], k=5)
+    assert recommender.find_show("Fresh Show 3", 2030) is export[("Fresh Show 3", 2030)]
+
+    # refreshing again with the same export changes nothing
+    assert recommender.refresh(recommender.shows[::-1]) == {
+        "inserted": 0, "updated": 0, "deleted": 0, "unchanged": len(export)
+    }
+
+
+def test_sqlite_backend_matches_list_backend(tmp_path, monkeypatch):
+    """
+    Test that a recommender stored in SQLite answers like the list backend, that the rating
+    index probe and its fallback agree, and that the database keeps the shows after reopening.
+    """
+    # small probes so both the rating index walk and the fallback plan are used
+    monkeypatch.setattr("src.sqlite_store._MIN_PROBE", 40)
+    monkeypatch.setattr("src.sqlite_store._PROBE_FACTOR", 2)
+    csv_path = generate_tmdb_csv(str(tmp_path / "synthetic.csv"), 600, seed=22)
+    shows = load_tv_shows_from_tmdb_csv(csv_path, limit=None)
+    database = str(tmp_path / "shows.db")
+    assert load_tv_shows_into_sqlite(csv_path, database, batch_size=128) == len(shows)
+    in_memory = _build_recommender(shows, columnar=False)
+    on_disk = ShowRecommender(database=database, cache_size=0)
+
+    def same(first, second):
+        assert [s.get_info_dict(include_votes=True) for s in first] == [
+            s.get_info_dict(include_votes=True) for s in second
+        ]
+
+    same(on_disk.shows, in_memory.shows)
+    same(on_disk.shows[100:140], in_memory.shows[100:140])
+    for genre in ("drama", "DRAMA", "sci", "action & adventure", "nope", ""):
+        same(on_disk.filter_by_genre(genre), in_memory.filter_by_genre(genre))
+    same(on_disk.filter_by_rating(7.5), in_memory.filter_by_rating(7.5))
+    same(on_disk.filter_by_episodes(10, 40), in_memory.filter_by_episodes(10, 40))
+    for language in ("JA", ""):
+        same(on_disk.filter_by_language(language), in_memory.filter_by_language(language))
+    for profile in ({"genre": "drama", "min_rating": 7.0}, {"language": "de", "max_episodes": 50},
+                    {"genre": "comedy", "language": "ko", "min_episodes": 5}, {},
+                    {"genre": "", "language": ""}):
+        for limit in (1, 10, None, -1, -5):
+            same(on_disk.get_recommendations(**profile, limit=limit),
+                 in_memory.get_recommendations(**profile, limit=limit))
+    same(on_disk.get_top_rated_shows(15), in_memory.get_top_rated_shows(15))
+    same(on_disk.get_top_rated_shows(-3), in_memory.get_top_rated_shows(-3))
+    same(on_disk.search_by_title("the"), in_memory.search_by_title("the"))
+    same(on_disk.get_shows_between_years(1990, 2010), in_memory.get_shows_between_years(1990, 2010))
+    assert on_disk.get_statistic() == pytest.approx(in_memory.get_statistic())
+    assert on_disk.get_all_genres() == in_memory.get_all_genres()
+    assert list(on_disk.get_genre_breakdown().items()) == list(in_memory.get_genre_breakdown().items())
+    assert list(on_disk.get_language_breakdown().items()) == list(in_memory.get_language_breakdown().items())
+    assert on_disk.get_rating_histogram() == in_memory.get_rating_histogram()
+    assert on_disk.get_year_counts() == in_memory.get_year_counts()
+    assert on_disk.explain(genre="drama", limit=10)["backend"] == "sqlite"
+
+    # changes are written to the database and survive reopening it
+    added = TVShow("Stored Show", ["Mystery"], 8, 9.9, "en", 2031)
+    on_disk.add_show(added)
+    on_disk.add_show(TVShow(shows[0].title, ["Mystery"], 1, 1.0, "en", shows[0].year), duplicates="replace")
+    reopened = ShowRecommender(database=database)
+    assert reopened.get_total_shows() == len(shows) + 1
+    assert reopened.find_show("Stored Show", 2031).get_info_dict() == added.get_info_dict()
+    assert reopened.shows[0].avg_rating == 1.0
+    assert reopened.get_recommendations(genre="mystery", limit=1)[0].title == "Stored Show"
+
+
+def test_sqlite_refuses_invalid_shows_before_writing(tmp_path):
+    """
+    Test that a show SQLite cannot store (here a None language) is refused before anything is
+    written, so no partial batch is committed and the file database keeps working after reopening.
+    """
+    database = str(tmp_path / "shows.db")
+    store = SQLiteShowStore(database)
+    with pytest.raises(ValueError):
+        store.insert([TVShow("A", ["Drama"], 3, 7.0, "en", 2000), TVShow("B", ["Drama"], 3, 7.0, None, 2000)])
+    assert len(store) == 0
+    store.insert([TVShow("C", ["Drama"], 3, 7.0, "en", 2000)])
+    store.close()
+
+    recommender = ShowRecommender(database=database)
+    with pytest.raises(ValueError):
+        recommender.add_shows_from_list(
+            [TVShow("D", ["Comedy"], 3, 8.0, "en", 2001), TVShow("E", ["Comedy"], 3, 8.0, None, 2001)],
+            duplicates="skip",
+        )
+    with pytest.raises(ValueError):
+        recommender.add_show(TVShow(None, ["Comedy"], 3, 8.0, "en", 2001))
+    recommender.add_show(TVShow("F", ["Comedy"], 3, 6.0, "en", 2002), duplicates="skip")
+    reopened = ShowRecommender(database=database)
+    assert [show.title for show in reopened.shows] == ["C", "F"]
+    assert reopened.find_show("D", 2001) is None
+
+
+@pytest.mark.parametrize("backend", ["list", "columnar", "lazy", "sqlite"])
+def test_pages_and_iterators_match_full_results(tmp_path, backend):
+    """
+    Test that iterators and pages (offset/limit and cursors, in collection and rating order)
+    return the same shows as the list-returning filters, and that stale cursors are refused.
+    """
+    csv_path = generate_tmdb_csv(str(tmp_path / "synthetic.csv"), 800, seed=23)
+    shows = load_tv_shows_from_tmdb_csv(csv_path, limit=None)
+    if backend == "lazy":
+        recommender = ShowRecommender.from_snapshot(build_tmdb_snapshot(csv_path, limit=None))
+    elif backend == "sqlite":
+        recommender = ShowRecommender(database=str(tmp_path / "shows.db"))
+        recommender.add_shows_from_list(shows)
+    else:
+        recommender = _build_recommender(shows, backend == "columnar")
+
+    queries = [
+        ("genre", ("drama",), "filter_by_genre"),
+        ("genre", ("western",), "filter_by_genre"),
+        ("rating", (7.5,), "filter_by_rating"),
+        ("episodes", (10, 40), "filter_by_episodes"),
+        ("language", ("JA",), "filter_by_language"),
+        ("title", ("dark",), "search_by_title"),
+        ("title", ("is",), "search_by_title"),
+    ]
+    for query, args, method in queries:
+        expected = [show.get_info_dict() for show in getattr(recommender, method)(*args)]
+        iterated = getattr(recommender, "iter_" + method)(*args)
+        assert [show.get_info_dict() for show in iterated] == expected
+        by_rating = sorted(expected, key=lambda info: -info["avg_rating"])
+        for order, ordered in (("collection", expected), ("rating", by_rating)):
+            page = recommender.get_page(query, *args, limit=7, offset=3, order=order)
+            assert [show.get_info_dict() for show in page] == ordered[3:10]
+            paged, cursor = [], None
+            while True:
+                page = recommender.get_page(query, *args, limit=25, cursor=cursor, order=order)
+                assert page.offset == len(paged)
+                paged.extend(show.get_info_dict() for show in page)
+                cursor = page.next_cursor
+                if cursor is None:
+                    break
+            assert paged == ordered
+
+    cursor = recommender.get_page("genre", "drama", limit=5).next_cursor
+    with pytest.raises(ValueError):
+        recommender.get_page("genre", "comedy", cursor=cursor)
+    with pytest.raises(ValueError):
+        recommender.get_page("genre", "drama", cursor="not a cursor")
+    recommender.add_show(TVShow("Paged Show", ["Drama"], 3, 5.0, "en", 2032))
+    with pytest.raises(ValueError):
+        recommender.get_page("genre", "drama", cursor=cursor)
+
+
+@pytest.mark.parametrize("backend", ["list", "columnar", "sqlite"])
+def test_scoring_models_rank_by_weighted_features(tmp_path, backend):
+    """
+    Test that scored recommendations match a brute-force ranking (ties in collection order),
+    that the Bayesian rating ranks a perfect score from a few votes below a well-voted show and
+    that invalid weights are refused.
+    """
+    csv_path = generate_tmdb_csv(str(tmp_path / "synthetic.csv"), 600, seed=29)
+    shows = load_tv_shows_from_tmdb_csv(csv_path, limit=None)
+    assert any(show.vote_count for show in shows)
+    shows.append(TVShow("Three Votes", ["Drama"], 8, 10.0, "en", 2020, vote_count=3))
+    shows.append(TVShow("Many Votes", ["Drama"], 8, 9.0, "en", 2020, vote_count=50000))
+    # the vote count is only in the info dictionary when asked for
+    assert "vote_count" not in shows[-1].get_info_dict()
+    assert shows[-1].get_info_dict(include_votes=True)["vote_count"] == 50000
+    if backend == "sqlite":
+        recommender = ShowRecommender(database=str(tmp_path / "shows.db"))
+        recommender.add_shows_from_list(shows)
+    else:
+        recommender = _build_recommender(shows, backend == "columnar")
+
+    plain = recommender.get_recommendations(genre="drama", limit=None)
+    assert plain.index(shows[-2]) < plain.index(shows[-1])
+    scored = recommender.get_recommendations(genre="drama", limit=None, scoring={"bayesian_rating": 1.0})
+    assert scored.index(shows[-1]) < scored.index(shows[-2])
+
+    votes = [show.vote_count for show in shows if show.vote_count]
+    prior_rating = sum(show.avg_rating for show in shows if show.vote_count) / len(votes)
+    prior_votes = float(np.percentile(votes, 90))
+    years = [show.year for show in shows if show.year is not None]
+
+    def brute_force_score(show):
+        count = show.vote_count or 0
+        bayesian = (count * show.avg_rating + prior_votes * prior_rating) / (count + prior_votes) / 10
+        recency = 0.0 if show.year is None else (show.year - min(years)) / (max(years) - min(years))
+        return bayesian + 0.5 * recency + 2.0 * show.matches_genre("comedy")
+
+    weights = {"bayesian_rating": 1.0, "recency": 0.5, "genre_match": 2.0}
+    model = ScoringModel(weights, genres=["Comedy"])
+    cases = [
+        ({}, lambda show: True),
+        ({"min_rating": 7.0}, lambda show: show.avg_rating >= 7.0),
+        ({"language": "en", "min_episodes": 10}, lambda show: show.language == "en" and show.num_episodes >= 10),
+    ]
+    for filters, passes in cases:
+        matches = [i for i, show in enumerate(shows) if passes(show)]
+        expected = sorted(matches, key=lambda i: -brute_force_score(shows[i]))
+        result = recommender.get_recommendations(**filters, limit=15, scoring=model)
+        assert [show.get_info_dict(include_votes=True) for show in result] == [
+            shows[i].get_info_dict(include_votes=True) for i in expected[:15]
+        ]
+    # equal scores keep collection order
+    tied = recommender.get_recommendations(limit=None, scoring=ScoringModel({"genre_match": 1.0}, genres=["western"]))
+    expected = sorted(shows, key=lambda show: not show.matches_genre("western"))
+    assert [show.get_info_dict() for show in tied] == [show.get_info_dict() for show in expected]
+
+    for weights in ({"popularity": 1.0}, {"rating": float("nan")}, {"genre_match": 1.0}):
+        with pytest.raises(ValueError):
+            recommender.get_recommendations(scoring=weights)
+
+
+@pytest.mark.parametrize("partition", ["hash", "language"])
+def test_sharded_recommender_matches_single_process(tmp_path, partition):
+    """
+    Test that a ShardedShowRecommender returns the same shows (ties in collection order included)
+    and the same statistics as one ShowRecommender with the same shows.
+    """
+    csv_path = generate_tmdb_csv(str(tmp_path / "synthetic.csv"), 1500, seed=31)
+    shows = load_tv_shows_from_tmdb_csv(csv_path, limit=None)
+    single = _build_recommender(shows, columnar=False)
+    with ShardedShowRecommender(shards=3, partition=partition) as sharded:
+        sharded.add_shows_from_list(shows)
+
+        def same(method, *args, **kwargs):
+            expected = getattr(single, method)(*args, **kwargs)
+            result = getattr(sharded, method)(*args, **kwargs)
+            assert [show.get_info_dict() for show in result] == [show.get_info_dict() for show in expected]
+
+        same("get_recommendations", genre="drama", min_rating=6.0, limit=25)
+        same("get_recommendations", language="EN", min_episodes=10, limit=None)
+        same("get_recommendations", limit=-3)
+        same("get_top_rated_shows", 40)
+        same("search_by_title", "dark")
+        same("filter_by_language", "ja")
+        same("filter_by_episodes", 5, 20)
+        profiles = [{"genre": "comedy"}, {"language": "de", "min_rating": 5.0}, {}]
+        batch = sharded.get_recommendations_batch(profiles, limit=8)
+        assert batch == single.get_recommendations_batch(profiles, limit=8)
+        assert sharded.get_total_shows() == single.get_total_shows()
+        # only the shards keep the shows; this process keeps counts
+        assert not any(isinstance(value, list) and value and isinstance(value[0], TVShow)
+                       for value in vars(sharded).values())
+        assert sharded.get_statistic() == single.get_statistic()
+        assert sharded.get_genre_breakdown() == single.get_genre_breakdown()
+        assert sharded.get_rating_histogram() == single.get_rating_histogram()
+        assert sharded.get_all_genres() == single.get_all_genres()
+
+        with pytest.raises(TypeError):
+            sharded.add_show("not a show")
+        with pytest.raises(ValueError):
+            sharded.get_recommendations("drama", scoring={"votes": 1.0})
+        if partition == "language":
+            with pytest.raises(ValueError):
+                sharded.add_shows_from_list(shows[:5], duplicates="skip")
+
+
+def test_sharded_recommender_duplicate_policies(mixed_shows):
+    """
+    Test that duplicate policies give the same collection order with shards as without them.
+    """
+    single = ShowRecommender()
+    with ShardedShowRecommender(shards=2) as sharded:
+        late_show = TVShow("Late Show", ["News"], 4, 8.0)
+        remake = TVShow(mixed_shows[1].title, ["Drama"], 9, 9.9, "fr", mixed_shows[1].year)
+        for recommender in (single, sharded):
+            recommender.add_shows_from_list(mixed_shows)
+            recommender.add_shows_from_list(mixed_shows[2:] + [late_show], duplicates="skip")
+            recommender.add_show(remake, duplicates="replace")
+        assert single.find_show_id(remake.title, remake.year) == 1
+        assert single.find_show_id("Not A Show") is None
+        expected = single.get_recommendations(limit=None)
+        assert [show.get_info_dict() for show in sharded.get_recommendations(limit=None)] == [
+            show.get_info_dict() for show in expected
+        ]
+        assert sharded.get_statistic() == single.get_statistic()
+def test_sharded_recommender_counts_stay_right_when_a_shard_fails(mixed_shows):
+    """
+    Test that a batch a shard refuses leaves the total and the per-shard counts equal to what the
+    shards hold, and that later shows keep the collection order.
+    """
+    with ShardedShowRecommender(shards=2) as sharded:
+        bad = TVShow("Text Year", ["Drama"], 3, 7.0, "en", "2002")
+        with pytest.raises(ValueError):
+            sharded.add_shows_from_list(mixed_shows + [bad])
+        held = sharded.get_recommendations(limit=None)
+        assert sharded.get_total_shows() == len(held) < len(mixed_shows)
+        assert sharded.get_statistic()["total_shows"] == len(held)
+        late = TVShow("Late Show", ["Drama"], 3, 7.0, "en", 2030)
+        sharded.add_show(late)
+        assert sharded.get_total_shows() == len(held) + 1
+        assert sharded.filter_by_genre("drama")[-1] == late
+
+
@@ -0,0 +1,97 @@
+"""
+This module contains pytest unit tests for the recommendation HTTP service. The service
+is started on a free local port inside asyncio.run(), so no extra test plugins are needed.
+"""
+import asyncio
+import json
+import threading
+
+from src.service import RecommendationService
+from src.show_recommender import ShowRecommender
+from src.tv_show import TVShow
+
+
+def _recommender():
+    """Return a recommender with a few shows."""
+    recommender = ShowRecommender()
+    recommender.add_shows_from_list([
+        TVShow("Breaking Bad", ["Drama", "Crime"], 62, 9.5, "en", 2008),
+        TVShow("Dark", ["Sci-Fi", "Drama"], 26, 8.8, "de", 2017),
+        TVShow("Friends", ["Comedy"], 236, 8.9, "en", 1994),
+    ])
+    return recommender
+
+
+async def _get(port, path):
+    """Send one GET request and return (status, decoded JSON body)."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: test\r\nConnection: close\r\n\r\n".encode())
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(body)
+
+
+def test_service_routes_and_errors():
+    """
+    Test that every route returns the same shows as the recommender methods and that bad
+    requests get 400 and 404 responses.
+    """
+    recommender = _recommender()
+
+    async def scenario():
+        service = RecommendationService(recommender)
+        _, port = await service.start(port=0)
+        try:
+            return await asyncio.gather(
+                _get(port, "/recommendations?genre=Drama&limit=1"),
+                _get(port, "/search?q=dar"),
+                _get(port, "/top?n=2"),
+                _get(port, "/recommendations?min_rating=eleven"),
+                _get(port, "/nowhere"),
+            )
+        finally:
+            await service.close()
+
+    recommended, search, top, bad, missing = asyncio.run(scenario())
+    assert recommended == (200, [recommender.get_recommendations(genre="Drama", limit=1)[0].get_info_dict()])
+    assert search[1][0]["title"] == "Dark"
+    assert [show["title"] for show in top[1]] == ["Breaking Bad", "Friends"]
+    assert bad[0] == 400
+    assert missing[0] == 404
+
+
+def test_service_coalesces_identical_concurrent_requests():
+    """
+    Test that identical requests arriving while the first one is still running share its
+    result, so the recommender is only called once.
+    """
+    release = threading.Event()
+    calls = []
+
+    class SlowRecommender(ShowRecommender):
+        def get_top_rated_shows(self, n=10):
+            calls.append(n)
+            release.wait(5)
+            return super().get_top_rated_shows(n)
+
+    recommender = SlowRecommender()
+    recommender.add_show(TVShow("Dark", ["Drama"], 26, 8.8, "de", 2017))
+
+    async def scenario():
+        service = RecommendationService(recommender)
+        _, port = await service.start(port=0)
+        try:
+            requests = [asyncio.ensure_future(_get(port, "/top?n=1")) for _ in range(5)]
+            # wait until every request has reached the service before the query may finish
+            while service.requests < 5:
+                await asyncio.sleep(0.01)
+            release.set()
+            return await asyncio.gather(*requests), service
+        finally:
+            await service.close()
+
+    responses, service = asyncio.run(scenario())
+    assert all(status == 200 and body[0]["title"] == "Dark" for status, body in responses)
+    assert calls == [1]
+    assert (service.computed, service.coalesced) == (1, 4)